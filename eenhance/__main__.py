@@ -1,5 +1,7 @@
 from eenhance.main import graph
 from eenhance.ui.utils import ConsoleUI
+from eenhance.utils.llm import llm_factory
+import os
 import time
 import logging
 
@@ -22,10 +24,22 @@ def initialize_system(ui):
     time.sleep(2)
 
 
+def parse_sources(text):
+    """解析输入的文章地址, 多个地址时返回列表"""
+    text = text.strip()
+    # 含空格的本地文件路径按单个来源处理
+    if os.path.exists(text):
+        return text
+    sources = text.split()
+    return sources if len(sources) > 1 else text
+
+
 def fetch_article_content(ui):
     """获取文章内容"""
     ui.print_step(1, TOTAL_STEPS, "获取文章内容")
-    source = ui.get_input("请输入需要分析的文章地址: ")
+    source = parse_sources(
+        ui.get_input("请输入需要分析的文章地址(多个地址用空格分隔): ")
+    )
     input_data = {"source": source, "content_is_open": True}  # 初始化 input_data
     state = graph.get_state(DEFAULT_THREAD, subgraphs=True)
     graph.update_state(
@@ -47,7 +61,9 @@ def regenerate_article_content(ui, input_data):
     while True:
         user_input = ui.get_input("确认是否需要重新获取文章内容 (y/n): ")
         if user_input.lower() == "y":
-            source = ui.get_input("请输入需要分析的文章地址: ")
+            source = parse_sources(
+                ui.get_input("请输入需要分析的文章地址(多个地址用空格分隔): ")
+            )
             input_data["source"] = source
             input_data["content_is_open"] = True
             state = graph.get_state(DEFAULT_THREAD, subgraphs=True)
@@ -76,6 +92,36 @@ def regenerate_article_content(ui, input_data):
     return input_data  # 返回 input_data 以便后续使用
 
 
+def stream_topics(ui):
+    """运行主题生成, 每个主题或候选主题生成完成后立即显示"""
+    topics = []
+    candidates = []
+    with ui.progress_manager("研究主题生成中") as counter:
+        total_estimated = 5
+        for _, mode, chunk in graph.stream(
+            None,
+            DEFAULT_THREAD,
+            stream_mode=["updates", "custom"],
+            subgraphs=True,
+        ):
+            if mode == "custom" and "candidate" in chunk:
+                # 启用多样性选择时, 候选主题全部生成后才会选出最终的主题
+                candidates.append(chunk["candidate"])
+                ui.print_info(
+                    f"候选研究方向生成中 ({chunk['index']}/{chunk['total']}):\n"
+                    + "\n".join(candidates)
+                )
+                ui.print_progress("研究主题生成中", chunk["index"] / chunk["total"])
+                continue
+            if mode == "custom" and "topic" in chunk:
+                topics.append(f"{chunk['index']}. {chunk['topic']}")
+                ui.print_info("研究方向生成中:\n" + "\n".join(topics))
+                continue
+            i = next(counter)
+            progress = min(i / total_estimated, 1)
+            ui.print_progress("研究主题生成中", progress)
+
+
 def generate_research_topics(ui, input_data):
     """生成研究主题"""
     ui.print_step(2, TOTAL_STEPS, "生成研究主题")
@@ -87,15 +133,7 @@ def generate_research_topics(ui, input_data):
     graph.update_state(
         state.tasks[0].state.config, input_data, as_node="human_feedback"
     )
-
-    with ui.progress_manager("研究主题生成中") as counter:
-        total_estimated = 5
-        for update in graph.stream(
-            None, DEFAULT_THREAD, stream_mode="updates", subgraphs=True
-        ):
-            i = next(counter)
-            progress = min(i / total_estimated, 1)
-            ui.print_progress("研究主题生成中", progress)
+    stream_topics(ui)
 
     while True:
         state = graph.get_state(DEFAULT_THREAD, subgraphs=True)
@@ -104,8 +142,20 @@ def generate_research_topics(ui, input_data):
             [f"{i}. {topic}" for i, topic in enumerate(event["topics"], 1)]
         )
         ui.print_info(f"研究方向列表如下:\n{topic_list}")
-        user_input = ui.get_input("确认是否需要重新生成研究方向 (y/n): ")
-        if user_input.lower() == "y":
+        if event.get("topic_candidates"):
+            user_input = ui.get_input(
+                "确认是否需要重新生成研究方向 (y/n, m 显示更多候选主题): "
+            )
+        else:
+            user_input = ui.get_input("确认是否需要重新生成研究方向 (y/n): ")
+        if user_input.lower() == "m" and event.get("topic_candidates"):
+            # 额外信息不变, 直接展示剩余的候选主题, 无需再次调用LLM
+            input_data.update({"regenerate": True})
+            graph.update_state(
+                state.tasks[0].state.config, input_data, as_node="human_feedback"
+            )
+            stream_topics(ui)
+        elif user_input.lower() == "y":
             additional_info = ui.get_input("请输入生成研究主题的额外信息: ")
             input_data.update(
                 {"regenerate": True, "additional_info": additional_info}
@@ -113,15 +163,7 @@ def generate_research_topics(ui, input_data):
             graph.update_state(
                 state.tasks[0].state.config, input_data, as_node="human_feedback"
             )
-
-            with ui.progress_manager("研究主题生成中") as counter:
-                total_estimated = 5
-                for update in graph.stream(
-                    None, DEFAULT_THREAD, stream_mode="updates", subgraphs=True
-                ):
-                    i = next(counter)
-                    progress = min(i / total_estimated, 1)
-                    ui.print_progress("研究主题生成中", progress)
+            stream_topics(ui)
         else:
             while True:
                 try:
@@ -351,6 +393,13 @@ def console_main():
     input_data = generate_blog_audio(ui, input_data)
 
 
+def export_llm_metrics():
+    """导出本次运行各节点的LLM token、延迟和费用"""
+    metrics_path = llm_factory.export_metrics()
+    if metrics_path is not None:
+        print(f"LLM调用度量已导出: {metrics_path}")
+
+
 if __name__ == "__main__":
     try:
         console_main()
@@ -359,3 +408,5 @@ if __name__ == "__main__":
     except Exception as e:
         logger.exception(e)
         print(f"\n\n发生错误: {str(e)}")
+    finally:
+        export_llm_metrics()
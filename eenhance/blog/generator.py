@@ -223,6 +223,7 @@ class LongFormContentGenerator:
 
         chunks = self.chunk_content(input_content, chunk_size)
         conversation_parts = []
+        # The first part sees the whole input; later parts see the conversation so far
         chat_context = input_content
         num_parts = len(chunks)
         print(f"Generating {num_parts} parts")
@@ -676,9 +677,17 @@ class ContentGenerator:
         messages = []
 
         # Only add text content if input_text is not empty
+        text = "Please analyze this input and generate a conversation. {input_text}"
+        if longform:
+            # Keep the system message identical across parts so that it is served
+            # from the provider's prefix cache. The context goes before the
+            # part-specific instruction and input: the first part gets the whole
+            # input as context, every later part the conversation so far, which
+            # only grows from part to part and so extends the previous prefix.
+            text = "CONTEXT: {context}\nINSTRUCTION: {instruction}\nINPUT: " + text
         text_content = {
             "type": "text",
-            "text": "Please analyze this input and generate a conversation. {input_text}",
+            "text": text,
         }
         messages.append(text_content)
 
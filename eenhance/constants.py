@@ -1,3 +1,11 @@
+import os
 from pathlib import Path
 
 PROJECT_ROOT_PATH: Path = Path(__file__).parent
+
+# 缓存、索引和度量等运行时文件的根目录, 位于包目录之外;
+# 可通过 EENHANCE_CACHE_DIR 环境变量覆盖
+CACHE_ROOT_PATH: Path = Path(
+    os.environ.get("EENHANCE_CACHE_DIR")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "eenhance"
+)
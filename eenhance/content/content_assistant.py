@@ -2,10 +2,15 @@
 文章内容获取助手
 """
 
+import asyncio
+from functools import lru_cache
+from typing import Iterable, List
 from typing_extensions import TypedDict
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 from .content_parser.content_extractor import ContentExtractor
+from .content_parser.schemas import ExtractionResult, join_results
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +18,7 @@ logger = logging.getLogger(__name__)
 
 # Content Agent 的输入参数
 class ContentInput(TypedDict):
-    source: str  # URL或文件路径
+    source: str | List[str]  # URL、文件路径、目录、glob或订阅源, 传入列表时并行提取并合并
     content_is_open: bool
 
 
@@ -21,6 +26,7 @@ class ContentInput(TypedDict):
 class ContentOutput(TypedDict):
     out_content: str
     error: str | None
+    source_errors: dict[str, str]  # 多来源时各失败来源的错误原因
 
 
 # no-op node that should be interrupted on
@@ -28,14 +34,73 @@ def human_feedback(state: ContentInput):
     print(state)
 
 
+@lru_cache(maxsize=None)
+def get_content_extractor() -> ContentExtractor:
+    """复用同一个 ContentExtractor, 避免每次执行节点都重新加载配置和创建子提取器"""
+    return ContentExtractor()
+
+
+def merge_results(results: Iterable[ExtractionResult]) -> ContentOutput:
+    """合并多个来源的提取结果, 每段内容标注来源; 只有全部来源失败时才设置 error"""
+    results = list(results)
+    source_errors = {
+        result["url"]: result["error"]
+        for result in results
+        if result["error"] is not None
+    }
+    try:
+        # 跨来源去除近似重复段落, 保留首次出现的来源中的段落
+        content = join_results(
+            results, "any source", deduplicate=get_content_extractor().deduplicate
+        )
+    except ValueError:
+        error = "; ".join(f"{url}: {err}" for url, err in source_errors.items())
+        error = error or "No content could be extracted"
+        return ContentOutput(out_content="", error=error, source_errors=source_errors)
+    return ContentOutput(out_content=content, error=None, source_errors=source_errors)
+
+
 def extract_content(state: ContentInput) -> ContentOutput:
     try:
-        extractor = ContentExtractor()
+        extractor = get_content_extractor()
+        if isinstance(state["source"], list):
+            return merge_results(extractor.extract_many(state["source"]))
+        source_type = extractor.get_source_type(state["source"])
+        if source_type == "corpus":
+            # 逐个文件流式合并, 未变化的文件直接从索引读取
+            return merge_results(
+                extractor.corpus_extractor.iter_extract(state["source"])
+            )
+        if source_type == "feed":
+            # 只提取订阅源中的新条目
+            return merge_results(extractor.extract_feed(state["source"]))
         content = extractor.extract_content(state["source"])
-        return ContentOutput(out_content=content, error=None)
+        content = extractor.deduplicate([content])[0]
+        return ContentOutput(out_content=content, error=None, source_errors={})
+    except Exception as e:
+        logger.error(f"Error extracting content: {str(e)}")
+        return ContentOutput(out_content="", error=str(e), source_errors={})
+
+
+async def aextract_content(state: ContentInput) -> ContentOutput:
+    try:
+        extractor = get_content_extractor()
+        if isinstance(state["source"], list):
+            return merge_results(await extractor.aextract_many(state["source"]))
+        source_type = extractor.get_source_type(state["source"])
+        if source_type == "corpus":
+            return await asyncio.to_thread(
+                merge_results, extractor.corpus_extractor.iter_extract(state["source"])
+            )
+        if source_type == "feed":
+            results = await asyncio.to_thread(extractor.extract_feed, state["source"])
+            return merge_results(results)
+        content = await extractor.aextract_content(state["source"])
+        content = extractor.deduplicate([content])[0]
+        return ContentOutput(out_content=content, error=None, source_errors={})
     except Exception as e:
         logger.error(f"Error extracting content: {str(e)}")
-        return ContentOutput(out_content="", error=str(e))
+        return ContentOutput(out_content="", error=str(e), source_errors={})
 
 
 def router(state: ContentInput):
@@ -50,7 +115,8 @@ graph = StateGraph(input=ContentInput, output=ContentOutput)
 
 # 添加节点
 graph.add_node("human_feedback", human_feedback)
-graph.add_node("extract", extract_content)
+# 同步执行(stream)时使用 extract_content, 异步执行(astream)时使用 aextract_content
+graph.add_node("extract", RunnableLambda(extract_content, afunc=aextract_content))
 
 # 添加边
 graph.add_edge(START, "human_feedback")
@@ -2,32 +2,228 @@
 Content Extractor Module
 
 This module provides functionality to extract content from various sources including
-websites, YouTube videos, and PDF files. It serves as a central hub for content
+websites, YouTube videos, PDF files, local document collections and RSS/Atom
+feeds or sitemaps. It serves as a central hub for content
 extraction, delegating to specialized extractors based on the source type.
+
+Extractors are looked up in a registry and imported and instantiated lazily on
+first use, so heavy dependencies (pymupdf, youtube_transcript_api, ...) are only
+loaded when a matching source is actually extracted.
 """
 
+import asyncio
+import importlib
 import logging
-from typing import List
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Pattern, Tuple
 from urllib.parse import urlparse
-from .youtube_transcriber import YouTubeTranscriber
 
-from .website_extractor import WebsiteExtractor
-from .pdf_extractor import PDFExtractor
+from .corpus_extractor import CorpusExtractor
+from .extraction_cache import ExtractionCache
+from .paragraph_dedup import ParagraphDeduplicator
+from .schemas import ExtractionResult, join_results, run_concurrently
 from eenhance.utils.config import load_config
+from eenhance.constants import CACHE_ROOT_PATH
+
+if TYPE_CHECKING:
+    from .feed_extractor import FeedExtractor
+    from .pdf_extractor import PDFExtractor
+    from .website_extractor import WebsiteExtractor
+    from .youtube_transcriber import YouTubeTranscriber
 
 logger = logging.getLogger(__name__)
 
 
 class ContentExtractor:
+    # 提取器注册表: 来源类型 -> "模块路径:类名", 首次使用时才导入和实例化
+    _extractors: Dict[str, str] = {
+        "youtube": "eenhance.content.content_parser.youtube_transcriber:YouTubeTranscriber",
+        "website": "eenhance.content.content_parser.website_extractor:WebsiteExtractor",
+        "pdf": "eenhance.content.content_parser.pdf_extractor:PDFExtractor",
+        "corpus": "eenhance.content.content_parser.corpus_extractor:CorpusExtractor",
+        "feed": "eenhance.content.content_parser.feed_extractor:FeedExtractor",
+    }
+
+    # 按文件路径匹配的来源类型
+    _path_patterns: Dict[str, Pattern] = {
+        "pdf": re.compile(r"\.pdf$", re.IGNORECASE),
+    }
+
     def __init__(self):
         """
         Initialize the ContentExtractor.
         """
-        self.youtube_transcriber = YouTubeTranscriber()
-        self.website_extractor = WebsiteExtractor()
-        self.pdf_extractor = PDFExtractor()
         self.config = load_config()
         self.content_extractor_config = self.config.get("content_extractor", {})
+        self.url_patterns = self._compile_url_patterns()
+        self.max_workers = self.content_extractor_config.get("max_workers", 4)
+        self.cache = self._create_cache()
+        self.deduplicator = self._create_deduplicator()
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def register_extractor(
+        cls, name: str, target: str, path_pattern: Optional[str] = None
+    ) -> None:
+        """
+        Register an extractor for a source type.
+
+        URL sources are routed to it through a ``<name>_url_patterns`` or
+        ``<name>_url_regexes`` list in the content_extractor config; file sources
+        through ``path_pattern``. The
+        extractor must provide an ``extract_content(source)`` method.
+
+        Args:
+                name (str): Source type name.
+                target (str): Import path of the extractor class, "module:ClassName".
+                path_pattern (Optional[str]): Regex matched against file paths.
+        """
+        cls._extractors[name] = target
+        if path_pattern:
+            cls._path_patterns[name] = re.compile(path_pattern, re.IGNORECASE)
+
+    def _compile_url_patterns(self) -> List[Tuple[str, Pattern, bool]]:
+        """
+        Compile the URL routing rules of the content_extractor config, one regex per type.
+
+        A ``<name>_url_patterns`` list holds substrings searched in the whole URL; a
+        ``<name>_url_regexes`` list holds case-insensitive regular expressions
+        searched in the URL path only, so they can be anchored to its end.
+
+        Returns:
+                List[Tuple[str, Pattern, bool]]: (source type, matcher, path only)
+                        triples in config order.
+        """
+        url_patterns = []
+        for key, patterns in self.content_extractor_config.items():
+            if not patterns:
+                continue
+            if key.endswith("_url_patterns"):
+                name = key[: -len("_url_patterns")]
+                url_patterns.append(
+                    (name, re.compile("|".join(re.escape(p) for p in patterns)), False)
+                )
+            elif key.endswith("_url_regexes"):
+                name = key[: -len("_url_regexes")]
+                url_patterns.append(
+                    (
+                        name,
+                        re.compile(
+                            "|".join(f"(?:{p})" for p in patterns), re.IGNORECASE
+                        ),
+                        True,
+                    )
+                )
+        return url_patterns
+
+    def get_extractor(self, name: str) -> Any:
+        """
+        Get the extractor for a source type, importing and creating it on first use.
+
+        Args:
+                name (str): Source type name.
+
+        Returns:
+                Any: The shared extractor instance.
+
+        Raises:
+                ValueError: If no extractor is registered for the source type.
+        """
+        extractor = self._instances.get(name)
+        if extractor is not None:
+            return extractor
+
+        target = self._extractors.get(name)
+        if target is None:
+            raise ValueError(f"No extractor registered for source type: {name}")
+
+        with self._lock:
+            if name not in self._instances:
+                module_name, class_name = target.split(":")
+                extractor_class = getattr(
+                    importlib.import_module(module_name), class_name
+                )
+                self._instances[name] = extractor_class()
+            return self._instances[name]
+
+    @property
+    def youtube_transcriber(self) -> "YouTubeTranscriber":
+        youtube_transcriber = self.get_extractor("youtube")
+        if youtube_transcriber.website_extractor is None:
+            # 解析播放列表时与网页提取共用会话和按站点限速
+            youtube_transcriber.website_extractor = self.website_extractor
+        return youtube_transcriber
+
+    @property
+    def website_extractor(self) -> "WebsiteExtractor":
+        return self.get_extractor("website")
+
+    @property
+    def pdf_extractor(self) -> "PDFExtractor":
+        return self.get_extractor("pdf")
+
+    @property
+    def corpus_extractor(self) -> CorpusExtractor:
+        return self.get_extractor("corpus")
+
+    @property
+    def feed_extractor(self) -> "FeedExtractor":
+        feed_extractor = self.get_extractor("feed")
+        if feed_extractor.website_extractor is None:
+            # 与网页提取共用会话和按站点限速
+            feed_extractor.website_extractor = self.website_extractor
+        return feed_extractor
+
+    def _create_cache(self) -> Optional[ExtractionCache]:
+        """
+        Create the on-disk extraction cache from config.
+
+        Returns:
+                Optional[ExtractionCache]: The cache, or None if caching is disabled.
+        """
+        cache_config = self.content_extractor_config.get("cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+
+        return ExtractionCache(
+            cache_dir=CACHE_ROOT_PATH / cache_config.get("dir", "extraction"),
+            max_size_bytes=int(cache_config.get("max_size_mb", 200) * 1024 * 1024),
+            max_age=cache_config.get("max_age", 0),
+        )
+
+    def _create_deduplicator(self) -> Optional[ParagraphDeduplicator]:
+        """
+        Create the near-duplicate paragraph filter from config.
+
+        Returns:
+                Optional[ParagraphDeduplicator]: The filter, or None if disabled.
+        """
+        dedup_config = self.content_extractor_config.get("dedup", {})
+        if not dedup_config.get("enabled", False):
+            return None
+
+        return ParagraphDeduplicator(
+            threshold=dedup_config.get("threshold", 0.95),
+            min_chars=dedup_config.get("min_chars", 30),
+            shingle_size=dedup_config.get("shingle_size", 4),
+        )
+
+    def deduplicate(self, contents: List[str]) -> List[str]:
+        """
+        Remove near-duplicate paragraphs within and across extracted contents.
+
+        Args:
+                contents (List[str]): Extracted contents, in source order.
+
+        Returns:
+                List[str]: The contents, unchanged if deduplication is disabled.
+        """
+        if self.deduplicator is None:
+            return contents
+        return self.deduplicator.deduplicate(contents)
 
     def is_url(self, source: str) -> bool:
         """
@@ -63,29 +259,262 @@ class ContentExtractor:
                 ValueError: If the source type is unsupported.
         """
         try:
-            if source.lower().endswith(".pdf"):
-                return self.pdf_extractor.extract_content(source)
-            elif self.is_url(source):
-                if any(
-                    pattern in source
-                    for pattern in self.content_extractor_config["youtube_url_patterns"]
-                ):
-                    return self.youtube_transcriber.extract_transcript(source)
-                elif any(
-                    pattern in source
-                    for pattern in self.content_extractor_config[
-                        "bilibili_url_patterns"
-                    ]
-                ):
-                    return self.bilibili_transcriber.extract_content(source)
-                else:
-                    return self.website_extractor.extract_content(source)
+            source_type = self.get_source_type(source)
+            if source_type == "pdf":
+                return self._extract_pdf(source)
+            elif source_type == "youtube":
+                if "/playlist" in source:
+                    return self._extract_playlist(source)
+                return self.youtube_transcriber.extract_transcript(source)
+            elif source_type == "website":
+                return self._extract_website(source)
+            elif source_type == "feed":
+                return self._extract_feed(source)
             else:
-                raise ValueError("Unsupported source type")
+                return self.get_extractor(source_type).extract_content(source)
         except Exception as e:
             logger.error(f"Error extracting content from {source}: {str(e)}")
             raise
 
+    async def aextract_content(self, source: str) -> str:
+        """
+        Asynchronously extract content from various sources.
+
+        Websites are fetched with the async HTTP client; PDF and transcript
+        extraction run in a worker thread so the event loop is never blocked.
+
+        Args:
+                source (str): URL or file path of the content source.
+
+        Returns:
+                str: Extracted text content.
+
+        Raises:
+                ValueError: If the source type is unsupported.
+        """
+        try:
+            if self.get_source_type(source) == "website":
+                return await self._aextract_website(source)
+            return await asyncio.to_thread(self.extract_content, source)
+        except Exception as e:
+            logger.error(f"Error extracting content from {source}: {str(e)}")
+            raise
+
+    def extract_many(
+        self, sources: List[str], max_workers: Optional[int] = None
+    ) -> List[ExtractionResult]:
+        """
+        Extract several sources concurrently.
+
+        A failing source does not affect the others; its error is reported in
+        its own result.
+
+        Args:
+                sources (List[str]): URLs or file paths.
+                max_workers (Optional[int]): Maximum number of concurrent extractions.
+                        Defaults to the ``max_workers`` value from config.
+
+        Returns:
+                List[ExtractionResult]: One result per source, in input order.
+        """
+        return run_concurrently(
+            self.extract_content, sources, max_workers or self.max_workers
+        )
+
+    async def aextract_many(
+        self, sources: List[str], max_workers: Optional[int] = None
+    ) -> List[ExtractionResult]:
+        """
+        Asynchronous counterpart of extract_many.
+
+        Args:
+                sources (List[str]): URLs or file paths.
+                max_workers (Optional[int]): Maximum number of concurrent extractions.
+                        Defaults to the ``max_workers`` value from config.
+
+        Returns:
+                List[ExtractionResult]: One result per source, in input order.
+        """
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+
+        async def _aextract(source: str) -> ExtractionResult:
+            async with semaphore:
+                try:
+                    content = await self.aextract_content(source)
+                    return ExtractionResult(url=source, content=content, error=None)
+                except Exception as e:
+                    return ExtractionResult(url=source, content="", error=str(e))
+
+        return list(await asyncio.gather(*(_aextract(source) for source in sources)))
+
+    def get_source_type(self, source: str) -> str:
+        """
+        Determine which extractor handles the given source.
+
+        Args:
+                source (str): URL or file path of the content source.
+
+        Returns:
+                str: The registered source type, e.g. 'pdf', 'youtube', 'website' or
+                        'corpus' for a local directory or glob pattern. URL rules of
+                        types without a registered extractor are ignored, so such
+                        URLs are extracted as websites.
+
+        Raises:
+                ValueError: If the source type is unsupported.
+        """
+        if CorpusExtractor.is_corpus(source):
+            return "corpus"
+
+        for name, pattern in self._path_patterns.items():
+            if pattern.search(source):
+                return name
+
+        if self.is_url(source):
+            path = urlparse(source if "://" in source else "https://" + source).path
+            for name, pattern, path_only in self.url_patterns:
+                # 没有注册提取器的来源类型按普通网页处理
+                if name in self._extractors and pattern.search(
+                    path if path_only else source
+                ):
+                    return name
+            return "website"
+
+        raise ValueError("Unsupported source type")
+
+    def _extract_playlist(self, source: str) -> str:
+        """
+        Extract and join the transcripts of every video of a YouTube playlist.
+
+        Videos without a transcript are skipped; an error is raised only if no
+        transcript could be fetched at all.
+        """
+        return join_results(
+            self.youtube_transcriber.extract_playlist(source), source, documents=False
+        )
+
+    def extract_feed(self, source: str) -> List[ExtractionResult]:
+        """
+        Extract the items of a feed or sitemap that were not processed yet.
+
+        Items are extracted concurrently with extract_many; only the successfully
+        extracted ones are marked as seen, so failures are retried on the next poll.
+
+        Args:
+                source (str): Feed or sitemap URL.
+
+        Returns:
+                List[ExtractionResult]: One result per new item, in feed order.
+        """
+        feed_extractor = self.feed_extractor
+        items = feed_extractor.poll(source)
+        results = self.extract_many([item["url"] for item in items])
+        feed_extractor.mark_seen(
+            source,
+            [
+                item
+                for item, result in zip(items, results)
+                if result["error"] is None
+            ],
+        )
+        return results
+
+    def _extract_feed(self, source: str) -> str:
+        """
+        Extract and join the new items of a feed, each wrapped with its URL.
+        """
+        return join_results(self.extract_feed(source), source)
+
+    def _extract_pdf(self, source: str) -> str:
+        """
+        Extract a PDF, reusing the cached text while the file is unchanged.
+
+        The cache key combines the absolute path with the file's mtime and size,
+        plus a fingerprint of the extractor settings that shape the text.
+        """
+        if self.cache is None:
+            return self.pdf_extractor.extract_content(source)
+
+        stat = os.stat(source)
+        key = (
+            f"pdf:{self.pdf_extractor.cache_fingerprint()}:"
+            f"{os.path.abspath(source)}:{stat.st_mtime_ns}:{stat.st_size}"
+        )
+        entry = self.cache.get(key)
+        if entry is not None:
+            logger.info(f"Extraction cache hit for {source}")
+            return entry["content"]
+
+        content = self.pdf_extractor.extract_content(source)
+        self.cache.put(key, content)
+        return content
+
+    def _website_cache_key(self, source: str) -> str:
+        return (
+            f"url:{self.website_extractor.cache_fingerprint()}:"
+            f"{self.website_extractor.normalize_url(source)}"
+        )
+
+    def _extract_website(self, source: str) -> str:
+        """
+        Extract a website, revalidating the cached text with a conditional GET.
+
+        Entries younger than the configured max_age are served without any
+        network access. The cache key combines the normalized URL with a
+        fingerprint of the extractor settings that shape the text.
+        """
+        if self.cache is None:
+            return self.website_extractor.extract_content(source)
+
+        key = self._website_cache_key(source)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            logger.info(f"Extraction cache hit for {source}")
+            return entry["content"]
+
+        result = self.website_extractor.extract_if_modified(
+            source,
+            etag=entry["etag"] if entry else None,
+            last_modified=entry["last_modified"] if entry else None,
+        )
+        if result["content"] is None:
+            logger.info(f"Extraction cache revalidated for {source}")
+            self.cache.touch(key, entry)
+            return entry["content"]
+
+        self.cache.put(
+            key, result["content"], result["etag"], result["last_modified"]
+        )
+        return result["content"]
+
+    async def _aextract_website(self, source: str) -> str:
+        """
+        Asynchronous counterpart of _extract_website.
+        """
+        if self.cache is None:
+            return await self.website_extractor.aextract_content(source)
+
+        key = self._website_cache_key(source)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            logger.info(f"Extraction cache hit for {source}")
+            return entry["content"]
+
+        result = await self.website_extractor.aextract_if_modified(
+            source,
+            etag=entry["etag"] if entry else None,
+            last_modified=entry["last_modified"] if entry else None,
+        )
+        if result["content"] is None:
+            logger.info(f"Extraction cache revalidated for {source}")
+            self.cache.touch(key, entry)
+            return entry["content"]
+
+        self.cache.put(
+            key, result["content"], result["etag"], result["last_modified"]
+        )
+        return result["content"]
+
 
 def main(seed: int = 42) -> None:
     """
@@ -0,0 +1,364 @@
+"""
+Corpus Extractor Module
+
+This module extracts local document collections: a directory, walked recursively,
+or a glob pattern of HTML, Markdown, text and PDF files. Files are read through
+memory-mapped I/O and extracted in a process pool, and results are yielded as
+they become available. An index of processed file hashes is kept on disk so that
+re-runs only read and extract new or changed files; the text of unchanged files
+is served from the index.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from typing_extensions import TypedDict
+from eenhance.utils.config import load_config
+from eenhance.utils.files import atomic_write_text
+from eenhance.constants import CACHE_ROOT_PATH
+from .schemas import ExtractionResult, join_results
+
+logger = logging.getLogger(__name__)
+
+HTML_EXTENSIONS = (".html", ".htm", ".xhtml")
+DEFAULT_EXTENSIONS = (".html", ".htm", ".md", ".markdown", ".txt", ".pdf")
+
+# 工作进程内复用的子提取器, 每个进程首次使用时创建
+_worker_extractors: Dict[str, object] = {}
+
+
+def _get_worker_extractor(name: str):
+    extractor = _worker_extractors.get(name)
+    if extractor is None:
+        if name == "pdf":
+            from .pdf_extractor import PDFExtractor
+
+            extractor = PDFExtractor()
+            # 已在进程池中运行, 不再嵌套创建按页的进程池
+            extractor.parallel = False
+        else:
+            from .website_extractor import WebsiteExtractor
+
+            extractor = WebsiteExtractor()
+        _worker_extractors[name] = extractor
+    return extractor
+
+
+def extract_file(path: str, known_digest: Optional[str]) -> Tuple[str, Optional[str]]:
+    """
+    Hash a file and extract its text unless the hash matches known_digest.
+
+    Runs in a worker process. The file is memory-mapped, so hashing and decoding
+    do not copy it through Python file buffers.
+
+    Args:
+            path (str): Path to the file.
+            known_digest (Optional[str]): SHA-256 of the last processed version.
+
+    Returns:
+            Tuple[str, Optional[str]]: The file's SHA-256 and its extracted text, or
+                    None as text if the content is unchanged.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            data = b""
+        else:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            digest = hashlib.sha256(data).hexdigest()
+            if digest == known_digest:
+                return digest, None
+
+            extension = os.path.splitext(path)[1].lower()
+            if extension == ".pdf":
+                return digest, _get_worker_extractor("pdf").extract_content(path)
+
+            # 直接从映射的缓冲区解码, 不先复制成 bytes
+            text = str(data, "utf-8", errors="replace")
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    if extension in HTML_EXTENSIONS:
+        return digest, _get_worker_extractor("website").extract_text(text)
+    return digest, text.strip()
+
+
+def _safe_extract_file(
+    path: str, known_digest: Optional[str]
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Run extract_file, returning (digest, text, error) instead of raising.
+    """
+    try:
+        digest, text = extract_file(path, known_digest)
+        return digest, text, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+# 索引中单个文件的记录
+class IndexEntry(TypedDict):
+    mtime_ns: int  # 处理时的修改时间
+    size: int  # 处理时的文件大小
+    sha256: str  # 处理时的内容哈希
+
+
+class CorpusIndex:
+    def __init__(self, index_dir: str | Path):
+        """
+        Initialize the CorpusIndex.
+
+        Args:
+                index_dir (str | Path): Directory holding index.json and the extracted
+                        texts, stored once per content hash.
+        """
+        self.index_dir = Path(index_dir)
+        self.texts_dir = self.index_dir / "texts"
+        self.texts_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.index_dir / "index.json"
+        self.entries: Dict[str, IndexEntry] = self._load()
+        # 多个线程可能同时提取语料, 共享同一个索引
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, IndexEntry]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable corpus index: {str(e)}")
+            return {}
+
+    def is_unchanged(self, path: str, stat: os.stat_result) -> bool:
+        """
+        Check whether a file still has the mtime and size it was processed with.
+        """
+        with self._lock:
+            entry = self.entries.get(path)
+        return (
+            entry is not None
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        )
+
+    def digest(self, path: str) -> Optional[str]:
+        with self._lock:
+            entry = self.entries.get(path)
+        return entry["sha256"] if entry else None
+
+    def get_text(self, digest: str) -> Optional[str]:
+        try:
+            return (self.texts_dir / f"{digest}.txt").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def update(
+        self, path: str, stat: os.stat_result, digest: str, text: Optional[str]
+    ) -> None:
+        """
+        Record a processed file, storing its text unless it is unchanged.
+        """
+        with self._lock:
+            self.entries[path] = IndexEntry(
+                mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=digest
+            )
+            if text is not None:
+                atomic_write_text(self.texts_dir / f"{digest}.txt", text)
+
+    def save(self) -> None:
+        """
+        Write the index and delete texts no longer referenced by any file.
+
+        Holds the lock throughout, so a concurrent update can neither change the
+        entries while they are serialized nor have its new text pruned.
+        """
+        with self._lock:
+            atomic_write_text(
+                self.index_path, json.dumps(self.entries, ensure_ascii=False)
+            )
+            referenced = {entry["sha256"] for entry in self.entries.values()}
+            for path in self.texts_dir.glob("*.txt"):
+                if path.stem not in referenced:
+                    path.unlink(missing_ok=True)
+
+
+class CorpusExtractor:
+    def __init__(self):
+        """
+        Initialize the CorpusExtractor.
+        """
+        self.config = load_config()
+        self.corpus_extractor_config = self.config.get("corpus_extractor", {})
+        self.extensions = tuple(
+            extension.lower()
+            for extension in self.corpus_extractor_config.get(
+                "extensions", DEFAULT_EXTENSIONS
+            )
+        )
+        self.max_workers = self.corpus_extractor_config.get("max_workers") or (
+            os.cpu_count() or 1
+        )
+        self.chunksize = self.corpus_extractor_config.get("chunksize", 8)
+        self.index = CorpusIndex(
+            CACHE_ROOT_PATH / self.corpus_extractor_config.get("index_dir", "corpus")
+        )
+
+    @staticmethod
+    def is_corpus(source: str) -> bool:
+        """
+        Check if the source is a local directory or a glob matching local files.
+
+        Args:
+                source (str): The source to check.
+
+        Returns:
+                bool: True if the source should be extracted as a corpus.
+        """
+        if os.path.isdir(source):
+            return True
+        if "://" in source or not glob.has_magic(source):
+            return False
+        return next(glob.iglob(source, recursive=True), None) is not None
+
+    def list_files(self, source: str) -> List[str]:
+        """
+        List the supported files of a directory (recursively) or glob pattern.
+
+        Args:
+                source (str): Directory or glob pattern.
+
+        Returns:
+                List[str]: Sorted absolute file paths.
+        """
+        if os.path.isdir(source):
+            paths = (
+                os.path.join(root, name)
+                for root, _, names in os.walk(source)
+                for name in names
+            )
+        else:
+            paths = glob.iglob(source, recursive=True)
+
+        return sorted(
+            os.path.abspath(path)
+            for path in paths
+            if path.lower().endswith(self.extensions) and os.path.isfile(path)
+        )
+
+    def iter_extract(
+        self, source: str, changed_only: bool = False
+    ) -> Iterator[ExtractionResult]:
+        """
+        Lazily extract every file of a corpus, in path order.
+
+        Files whose mtime and size match the index are served from it without being
+        read. Other files are hashed and, if their content changed, extracted in
+        the process pool. The index is saved once the iterator is exhausted or
+        closed.
+
+        Args:
+                source (str): Directory or glob pattern.
+                changed_only (bool): Only yield new or changed files.
+
+        Yields:
+                ExtractionResult: One result per file; failures carry their error.
+        """
+        files = self.list_files(source)
+        if not files:
+            raise ValueError(f"No supported files found in {source}")
+
+        stats = {}
+        pending = []
+        for path in files:
+            try:
+                stats[path] = os.stat(path)
+            except OSError as e:
+                stats[path] = e
+                continue
+            if not self.index.is_unchanged(path, stats[path]):
+                pending.append(path)
+        logger.info(
+            f"Corpus {source}: {len(files)} files, {len(pending)} new or changed"
+        )
+
+        changed_paths = set(pending)
+        executor = None
+        if len(pending) > 1 and self.max_workers > 1:
+            # 可能从线程池或 asyncio.to_thread 中调用, 在多线程进程中 fork
+            # 会复制其他线程持有的锁(日志、限速器等)导致子进程死锁, 因此使用 spawn
+            executor = ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(pending)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            extracted = executor.map(
+                _safe_extract_file,
+                pending,
+                [self.index.digest(path) for path in pending],
+                chunksize=self.chunksize,
+            )
+        else:
+            extracted = (
+                _safe_extract_file(path, self.index.digest(path)) for path in pending
+            )
+
+        try:
+            for path in files:
+                stat = stats[path]
+                if isinstance(stat, OSError):
+                    yield ExtractionResult(url=path, content="", error=str(stat))
+                    continue
+
+                if path not in changed_paths:
+                    if changed_only:
+                        continue
+                    text = self.index.get_text(self.index.digest(path))
+                    if text is not None:
+                        yield ExtractionResult(url=path, content=text, error=None)
+                        continue
+                    # 文本已丢失, 重新提取
+                    digest, text, error = _safe_extract_file(path, None)
+                else:
+                    digest, text, error = next(extracted)
+
+                if error is not None:
+                    yield ExtractionResult(url=path, content="", error=error)
+                    continue
+                if text is None:
+                    # 仅修改时间变化, 内容未变
+                    self.index.update(path, stat, digest, None)
+                    if changed_only:
+                        continue
+                    text = self.index.get_text(digest)
+                else:
+                    self.index.update(path, stat, digest, text)
+                yield ExtractionResult(url=path, content=text or "", error=None)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            self.index.save()
+
+    def extract_content(self, source: str) -> str:
+        """
+        Extract a corpus into one text, each file wrapped with its path.
+
+        Args:
+                source (str): Directory or glob pattern.
+
+        Returns:
+                str: The joined contents of every successfully extracted file.
+
+        Raises:
+                ValueError: If no file could be extracted.
+        """
+        return join_results(self.iter_extract(source), source)
+
@@ -0,0 +1,205 @@
+"""
+Extraction Cache Module
+
+This module provides a persistent on-disk cache for extracted content. Entries are
+keyed by a normalized source (URL or file identity), store the cleaned text together
+with the HTTP validators needed for conditional revalidation, and are evicted in
+least-recently-used order once the cache exceeds its size budget.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+from typing_extensions import TypedDict
+from eenhance.utils.files import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+
+def settings_fingerprint(settings: Any) -> str:
+    """
+    Hash the extractor settings that shape the extracted text, for use in cache keys.
+
+    Args:
+            settings (Any): JSON-serializable settings.
+
+    Returns:
+            str: A short hex digest that changes whenever the settings change.
+    """
+    payload = json.dumps(settings, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# 缓存条目
+class CacheEntry(TypedDict):
+    source: str  # 归一化后的来源
+    content: str  # 清洗后的文本内容
+    etag: str | None  # 响应的ETag
+    last_modified: str | None  # 响应的Last-Modified
+    stored_at: float  # 写入或最近一次校验的时间戳
+
+
+class ExtractionCache:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_size_bytes: int = 200 * 1024 * 1024,
+        max_age: float = 0,
+    ):
+        """
+        Initialize the ExtractionCache.
+
+        Args:
+                cache_dir (str | Path): Directory holding the cache entries.
+                max_size_bytes (int): Size budget of the cache directory; least recently
+                        used entries are evicted beyond it.
+                max_age (float): Seconds during which an entry is served without
+                        revalidation. 0 means always revalidate when possible.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # 缓存目录的总大小只在初始化时扫描一次, 之后随写入和删除增量更新
+        self._total_size = sum(size for _, size, _ in self._scan())
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Get a cache entry and mark it as recently used.
+
+        Args:
+                key (str): Normalized source key.
+
+        Returns:
+                Optional[CacheEntry]: The cached entry, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            # 使用文件修改时间记录最近访问, 用于LRU淘汰
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry for {key}: {str(e)}")
+            size = self._size(path)
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._total_size -= size
+            return None
+
+        if entry.get("source") != key:
+            return None
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Check whether an entry can be served without revalidation.
+
+        Args:
+                entry (CacheEntry): The cached entry.
+
+        Returns:
+                bool: True if the entry is younger than max_age.
+        """
+        return time.time() - entry["stored_at"] < self.max_age
+
+    def put(
+        self,
+        key: str,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        Store an entry, then evict least recently used entries over the size budget.
+
+        Args:
+                key (str): Normalized source key.
+                content (str): Cleaned text content.
+                etag (Optional[str]): ETag of the response.
+                last_modified (Optional[str]): Last-Modified of the response.
+        """
+        entry = CacheEntry(
+            source=key,
+            content=content,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=time.time(),
+        )
+        path = self._path(key)
+        text = json.dumps(entry, ensure_ascii=False)
+        old_size = self._size(path)
+        atomic_write_text(path, text)
+        with self._lock:
+            self._total_size += len(text.encode("utf-8")) - old_size
+
+        self._evict()
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        """
+        Mark an entry as revalidated (e.g. after a 304 response).
+
+        Args:
+                key (str): Normalized source key.
+                entry (CacheEntry): The cached entry.
+        """
+        self.put(key, entry["content"], entry["etag"], entry["last_modified"])
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+            self._total_size = 0
+
+    def _evict(self) -> None:
+        """
+        Delete least recently used entries until the cache fits max_size_bytes.
+
+        The directory is only scanned once the tracked total size exceeds the budget.
+        """
+        with self._lock:
+            if self._total_size <= self.max_size_bytes:
+                return
+
+            # 重新扫描目录, 同时校正其他进程写入造成的大小偏差
+            entries = self._scan()
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda item: item[0]):
+                if total_size <= self.max_size_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total_size -= size
+                logger.debug(f"Evicted extraction cache entry {path.name}")
+            self._total_size = total_size
@@ -0,0 +1,334 @@
+"""
+Feed Extractor Module
+
+This module polls RSS 2.0, Atom and XML sitemap sources (including sitemap
+indexes) for new items. Every feed is fetched with a conditional GET using the
+validators of the previous poll, so an unchanged feed costs a single 304 response.
+The item GUIDs/URLs already seen, together with their last update time, are kept
+in a local store; only items that are new, or whose update time changed, are
+returned.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+from typing_extensions import TypedDict
+from eenhance.utils.config import load_config
+from eenhance.utils.files import atomic_write_text
+from eenhance.constants import CACHE_ROOT_PATH
+
+if TYPE_CHECKING:
+    from .website_extractor import WebsiteExtractor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTENT_TYPES = (
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/xml",
+    "text/xml",
+    "text/plain",
+)
+
+
+# 订阅源中的单个条目
+class FeedItem(TypedDict):
+    id: str  # RSS guid / Atom id / sitemap loc, 缺失时为链接
+    url: str  # 条目链接
+    title: str  # 标题, sitemap 中为空
+    updated: str  # 发布或更新时间的原始文本, 缺失时为空
+
+
+# 单个订阅源的本地状态
+class FeedState(TypedDict):
+    url: str  # 订阅源地址
+    etag: str | None  # 上次响应的ETag
+    last_modified: str | None  # 上次响应的Last-Modified
+    seen: Dict[str, str]  # 已处理条目 id -> 处理时的更新时间
+    pending: List[FeedItem]  # 已发现但尚未处理完成的条目
+    feed_size: int  # 抓取到的最多条目数, seen 至少保留这么多条, 避免仍在源中的条目被当作新条目
+    polled_at: float  # 上次轮询的时间戳
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(element: ET.Element, name: str) -> str:
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or "").strip()
+    return ""
+
+
+def parse_feed(document: str) -> tuple[List[FeedItem], List[str]]:
+    """
+    Parse an RSS, Atom or sitemap document.
+
+    Args:
+            document (str): The XML document.
+
+    Returns:
+            tuple[List[FeedItem], List[str]]: The items in document order, and the
+                    child sitemap URLs if the document is a sitemap index.
+
+    Raises:
+            ValueError: If the document is not a supported feed.
+    """
+    try:
+        root = ET.fromstring(document.strip())
+    except ET.ParseError as e:
+        raise ValueError(f"Invalid feed document: {str(e)}")
+
+    kind = _local_name(root.tag)
+    items: List[FeedItem] = []
+    if kind == "sitemapindex":
+        return items, [
+            _child_text(sitemap, "loc")
+            for sitemap in root
+            if _local_name(sitemap.tag) == "sitemap" and _child_text(sitemap, "loc")
+        ]
+
+    if kind == "urlset":
+        for entry in root:
+            loc = _child_text(entry, "loc")
+            if _local_name(entry.tag) == "url" and loc:
+                items.append(
+                    FeedItem(
+                        id=loc, url=loc, title="", updated=_child_text(entry, "lastmod")
+                    )
+                )
+    elif kind in ("rss", "rdf"):
+        for entry in root.iter():
+            if _local_name(entry.tag) != "item":
+                continue
+            link = _child_text(entry, "link")
+            guid = _child_text(entry, "guid") or link
+            if guid:
+                items.append(
+                    FeedItem(
+                        id=guid,
+                        url=link or guid,
+                        title=_child_text(entry, "title"),
+                        updated=_child_text(entry, "pubdate")
+                        or _child_text(entry, "date"),
+                    )
+                )
+    elif kind == "feed":
+        for entry in root:
+            if _local_name(entry.tag) != "entry":
+                continue
+            link = ""
+            for child in entry:
+                rel = child.get("rel") or "alternate"
+                if _local_name(child.tag) == "link" and rel == "alternate":
+                    link = child.get("href", "")
+                    break
+            entry_id = _child_text(entry, "id") or link
+            if entry_id:
+                items.append(
+                    FeedItem(
+                        id=entry_id,
+                        url=link or entry_id,
+                        title=_child_text(entry, "title"),
+                        updated=_child_text(entry, "updated")
+                        or _child_text(entry, "published"),
+                    )
+                )
+    else:
+        raise ValueError(f"Unsupported feed format: <{kind}>")
+    return items, []
+
+
+class FeedStore:
+    def __init__(self, store_dir: str | Path, max_seen_items: int = 5000):
+        """
+        Initialize the FeedStore.
+
+        Args:
+                store_dir (str | Path): Directory holding one state file per feed.
+                max_seen_items (int): Seen items kept per feed; the oldest are
+                        forgotten beyond it.
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.max_seen_items = max_seen_items
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.store_dir / f"{digest}.json"
+
+    def get(self, url: str) -> FeedState:
+        """
+        Get the state of a feed, or an empty state if it was never polled.
+        """
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as file:
+                state = json.load(file)
+            if state.get("url") == url:
+                state.setdefault("pending", [])
+                state.setdefault("feed_size", 0)
+                return state
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable feed state for {url}: {str(e)}")
+        return FeedState(
+            url=url,
+            etag=None,
+            last_modified=None,
+            seen={},
+            pending=[],
+            feed_size=0,
+            polled_at=0.0,
+        )
+
+    def put(self, state: FeedState) -> None:
+        """
+        Store the state of a feed.
+        """
+        seen = state["seen"]
+        max_seen_items = max(self.max_seen_items, state.get("feed_size", 0))
+        if len(seen) > max_seen_items:
+            # 字典保持插入顺序, 丢弃最早记录(即最久未出现在源中)的条目
+            state["seen"] = dict(list(seen.items())[-max_seen_items:])
+
+        with self._lock:
+            atomic_write_text(
+                self._path(state["url"]), json.dumps(state, ensure_ascii=False)
+            )
+
+
+class FeedExtractor:
+    def __init__(self, website_extractor: Optional["WebsiteExtractor"] = None):
+        """
+        Initialize the FeedExtractor.
+
+        Args:
+                website_extractor (Optional[WebsiteExtractor]): Extractor whose session and
+                        rate limiter are used to download feeds; created on first use
+                        if not given.
+        """
+        self.config = load_config()
+        self.feed_extractor_config = self.config.get("feed_extractor", {})
+        self.max_items = self.feed_extractor_config.get("max_items_per_poll", 20)
+        self.max_pending_items = self.feed_extractor_config.get(
+            "max_pending_items", 500
+        )
+        self.allowed_content_types = list(
+            self.feed_extractor_config.get(
+                "allowed_content_types", DEFAULT_CONTENT_TYPES
+            )
+        )
+        self.store = FeedStore(
+            CACHE_ROOT_PATH / self.feed_extractor_config.get("store_dir", "feeds"),
+            max_seen_items=self.feed_extractor_config.get("max_seen_items", 5000),
+        )
+        self.website_extractor = website_extractor
+
+    def _fetch_items(self, url: str, depth: int = 0) -> List[FeedItem]:
+        """
+        Conditionally fetch a feed and parse its items; empty when unchanged.
+
+        Sitemap indexes are followed one level deep, each child sitemap with its
+        own validators.
+        """
+        if self.website_extractor is None:
+            from .website_extractor import WebsiteExtractor
+
+            self.website_extractor = WebsiteExtractor()
+
+        state = self.store.get(url)
+        fetched = self.website_extractor.fetch_if_modified(
+            url,
+            etag=state["etag"],
+            last_modified=state["last_modified"],
+            allowed_content_types=self.allowed_content_types,
+        )
+        state["etag"] = fetched["etag"]
+        state["last_modified"] = fetched["last_modified"]
+        state["polled_at"] = time.time()
+        self.store.put(state)
+        if fetched["body"] is None:
+            logger.info(f"Feed {url} not modified")
+            return []
+
+        items, sitemaps = parse_feed(fetched["body"])
+        if depth == 0:
+            for sitemap in sitemaps:
+                try:
+                    items.extend(self._fetch_items(sitemap, depth + 1))
+                except Exception as e:
+                    logger.warning(f"Skipping sitemap {sitemap}: {str(e)}")
+        return items
+
+    def poll(self, url: str) -> List[FeedItem]:
+        """
+        Get the items of a feed that were not processed yet.
+
+        Items are new when their id was never marked as seen, or when their update
+        time changed since. At most ``max_items_per_poll`` items are returned, in
+        document order. New items stay pending until mark_seen is called, so items
+        beyond the limit or whose processing failed are returned again by later
+        polls even when the feed itself answers 304. At most ``max_pending_items``
+        items are kept pending; the rest, e.g. the backlog of a large sitemap on
+        its first poll, are marked as seen without being returned.
+
+        Args:
+                url (str): Feed or sitemap URL.
+
+        Returns:
+                List[FeedItem]: The new items; call mark_seen once they are processed.
+        """
+        fetched = self._fetch_items(url)
+        state = self.store.get(url)
+        # 先处理上次遗留的条目, 同一 id 以最新抓取的为准
+        candidates = {item["id"]: item for item in state["pending"]}
+        candidates.update((item["id"], item) for item in fetched)
+        seen = state["seen"]
+        # 仍在源中的条目移到末尾, 裁剪 seen 时优先丢弃已从源中消失的条目
+        for item in fetched:
+            if item["id"] in seen:
+                seen[item["id"]] = seen.pop(item["id"])
+        state["feed_size"] = max(state["feed_size"], len(fetched))
+        new_items = [
+            item for item in candidates.values() if seen.get(item["id"]) != item["updated"]
+        ]
+        overflow = new_items[self.max_pending_items :]
+        if overflow:
+            logger.warning(
+                f"Feed {url}: skipping {len(overflow)} items beyond "
+                f"max_pending_items={self.max_pending_items}"
+            )
+            for item in overflow:
+                seen[item["id"]] = item["updated"]
+            new_items = new_items[: self.max_pending_items]
+        state["pending"] = new_items
+        self.store.put(state)
+        logger.info(f"Feed {url}: {len(new_items)} new items")
+        return new_items[: self.max_items]
+
+    def mark_seen(self, url: str, items: List[FeedItem]) -> None:
+        """
+        Record items as processed so later polls skip them.
+
+        Args:
+                url (str): Feed or sitemap URL.
+                items (List[FeedItem]): The processed items.
+        """
+        state = self.store.get(url)
+        for item in items:
+            state["seen"].pop(item["id"], None)
+            state["seen"][item["id"]] = item["updated"]
+        processed = {item["id"] for item in items}
+        state["pending"] = [
+            item for item in state["pending"] if item["id"] not in processed
+        ]
+        self.store.put(state)
@@ -0,0 +1,216 @@
+"""
+Host Rate Limiter Module
+
+This module provides a per-host politeness scheduler for crawling. Each host gets a
+token bucket that bounds its request rate and burst size, a cap on in-flight
+requests, and a backoff window that pauses all requests to the host after a
+throttled (429/503) response, honoring the server's Retry-After header.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# 异步等待并发名额时的轮询间隔(秒)
+ASYNC_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class HostPolicy:
+    requests_per_second: float = 2.0  # 令牌补充速率
+    burst: int = 5  # 令牌桶容量, 即可连续发出的请求数
+    max_concurrency: int = 4  # 同时进行中的请求数上限
+
+
+@dataclass
+class _HostState:
+    policy: HostPolicy
+    tokens: float
+    updated_at: float
+    in_flight: int = 0
+    blocked_until: float = 0.0
+    failures: int = 0
+
+
+class HostRateLimiter:
+    def __init__(
+        self,
+        default_policy: Optional[HostPolicy] = None,
+        host_policies: Optional[Dict[str, HostPolicy]] = None,
+        backoff_base: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        """
+        Initialize the HostRateLimiter.
+
+        Args:
+                default_policy (Optional[HostPolicy]): Policy of hosts without an override.
+                host_policies (Optional[Dict[str, HostPolicy]]): Per-host overrides; a key
+                        also applies to its subdomains.
+                backoff_base (float): Seconds to pause a host after its first throttled
+                        response, doubled for each consecutive one.
+                max_backoff (float): Upper bound of a single pause, Retry-After included.
+        """
+        self.default_policy = default_policy or HostPolicy()
+        self.host_policies = {
+            host.lower(): policy for host, policy in (host_policies or {}).items()
+        }
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._hosts: Dict[str, _HostState] = {}
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "HostRateLimiter":
+        """
+        Create a limiter from the ``rate_limit`` section of the website_extractor config.
+        """
+
+        def policy(section: dict, base: HostPolicy) -> HostPolicy:
+            return HostPolicy(
+                requests_per_second=section.get(
+                    "requests_per_second", base.requests_per_second
+                ),
+                burst=section.get("burst", base.burst),
+                max_concurrency=section.get("max_concurrency", base.max_concurrency),
+            )
+
+        default_policy = policy(config, HostPolicy())
+        return cls(
+            default_policy=default_policy,
+            host_policies={
+                host: policy(section or {}, default_policy)
+                for host, section in (config.get("hosts") or {}).items()
+            },
+            backoff_base=config.get("backoff_base", 1.0),
+            max_backoff=config.get("max_backoff", 60.0),
+        )
+
+    def policy_for(self, host: str) -> HostPolicy:
+        """
+        Get the policy of a host, matching overrides on the host and its parents.
+        """
+        parts = host.lower().split(".")
+        for i in range(len(parts)):
+            policy = self.host_policies.get(".".join(parts[i:]))
+            if policy is not None:
+                return policy
+        return self.default_policy
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            policy = self.policy_for(host)
+            state = _HostState(
+                policy=policy, tokens=float(policy.burst), updated_at=time.monotonic()
+            )
+            self._hosts[host] = state
+        return state
+
+    def _try_acquire(self, host: str) -> Optional[float]:
+        """
+        Take a token and an in-flight slot for the host if both are available.
+
+        Must be called with the condition held.
+
+        Returns:
+                Optional[float]: 0 if acquired, otherwise the seconds until a token
+                        frees up or the backoff ends; None if only waiting for a slot.
+        """
+        state = self._state(host)
+        now = time.monotonic()
+        if now < state.blocked_until:
+            return state.blocked_until - now
+
+        policy = state.policy
+        state.tokens = min(
+            float(policy.burst),
+            state.tokens + (now - state.updated_at) * policy.requests_per_second,
+        )
+        state.updated_at = now
+        if state.in_flight >= policy.max_concurrency:
+            return None
+        if state.tokens < 1:
+            return (1 - state.tokens) / policy.requests_per_second
+
+        state.tokens -= 1
+        state.in_flight += 1
+        return 0.0
+
+    def _release(self, host: str) -> None:
+        with self._condition:
+            self._hosts[host].in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[None]:
+        """
+        Block until a request to the host is allowed and hold it for the duration.
+
+        Args:
+                host (str): Host name of the request.
+        """
+        with self._condition:
+            while (wait := self._try_acquire(host)) != 0:
+                self._condition.wait(timeout=wait)
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    @asynccontextmanager
+    async def aslot(self, host: str) -> AsyncIterator[None]:
+        """
+        Asynchronous counterpart of slot that never blocks the event loop.
+
+        Args:
+                host (str): Host name of the request.
+        """
+        while True:
+            with self._condition:
+                wait = self._try_acquire(host)
+            if wait == 0:
+                break
+            await asyncio.sleep(ASYNC_POLL_INTERVAL if wait is None else wait)
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    def backoff(self, host: str, retry_after: Optional[float] = None) -> float:
+        """
+        Pause all requests to a host after a throttled response.
+
+        The pause is Retry-After when the server sent one, otherwise an exponential
+        backoff over consecutive throttled responses, capped at max_backoff.
+
+        Args:
+                host (str): Host name of the throttled request.
+                retry_after (Optional[float]): Parsed Retry-After in seconds.
+
+        Returns:
+                float: The pause in seconds.
+        """
+        with self._condition:
+            state = self._state(host)
+            if retry_after is None:
+                retry_after = self.backoff_base * 2**state.failures
+            delay = min(retry_after, self.max_backoff)
+            state.failures += 1
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+            self._condition.notify_all()
+        logger.warning(f"Throttled by {host}, pausing requests for {delay:.1f}s")
+        return delay
+
+    def record_success(self, host: str) -> None:
+        """
+        Reset the backoff of a host after a successful response.
+        """
+        with self._condition:
+            self._state(host).failures = 0
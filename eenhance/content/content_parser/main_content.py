@@ -0,0 +1,187 @@
+"""
+Main Content Detection Module
+
+This module locates the main article block of an HTML document, in the spirit of
+Readability. One traversal of the DOM records, for every element, how much text
+and link text it holds; blocks whose class or id marks them as comments, sidebars,
+related-article lists and the like are discounted. Starting from <body>, the
+detector then descends into the child holding most of the non-link text for as
+long as that child keeps nearly all of it and the page heading.
+
+The traversal is parser-agnostic: callers describe their tree with a children
+function and a node description function, so the same scoring is used for the
+BeautifulSoup and selectolax backends.
+"""
+
+import re
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# 类名或id表明为非正文的区块
+NEGATIVE_HINTS = re.compile(
+    r"comment|sidebar|related|recommend|share|social|breadcrumb|advert|"
+    r"sponsor|promo|widget|popular|footer|copyright|disqus|reply",
+    re.IGNORECASE,
+)
+# 同时匹配时不视为非正文区块, 如 "article-comments-count"
+POSITIVE_HINTS = re.compile(r"article|body|content|entry|main|post|story", re.IGNORECASE)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 块级元素, 提取文本时前后换行, 使每个段落各占一行
+BLOCK_TAGS = frozenset(
+    "address article aside blockquote br caption dd details div dl dt figcaption "
+    "figure form h1 h2 h3 h4 h5 h6 hr li main ol p pre section summary table td th "
+    "title tr ul".split()
+)
+
+# describe 返回的节点类型
+TEXT = "text"
+ELEMENT = "element"
+
+# (类型, 标签名, 类名与id, 文本)
+NodeDescription = Tuple[str, str, str, str]
+
+
+class _Block:
+    __slots__ = ("node", "children", "text", "link", "headings", "negative", "in_link")
+
+    def __init__(self, node: Any, negative: bool, in_link: bool):
+        self.node = node
+        self.children: List["_Block"] = []
+        self.text = 0  # 子树中的文本字符数
+        self.link = 0  # 子树中链接内的文本字符数
+        self.headings = 0  # 子树中的 h1 数量
+        self.negative = negative
+        self.in_link = in_link
+
+    @property
+    def net(self) -> int:
+        return self.text - self.link
+
+
+def select_main_content(
+    root: Any,
+    children: Callable[[Any], Iterable[Any]],
+    describe: Callable[[Any], Optional[NodeDescription]],
+    min_ratio: float = 0.8,
+) -> Tuple[Any, List[Any]]:
+    """
+    Find the main content block under root.
+
+    Args:
+            root (Any): The node to search, usually <body>.
+            children (Callable[[Any], Iterable[Any]]): Returns the child nodes of a node.
+            describe (Callable[[Any], Optional[NodeDescription]]): Describes a node as
+                    (TEXT, "", "", text) or (ELEMENT, tag, class and id, ""); None skips
+                    the node and its subtree (comments, doctypes, ...).
+            min_ratio (float): Fraction of its parent's non-link text a child must hold
+                    to be descended into.
+
+    Returns:
+            Tuple[Any, List[Any]]: The main content node and the discounted blocks
+                    inside it, which callers should drop before taking its text.
+    """
+    root_block = _Block(root, negative=False, in_link=False)
+    blocks = [root_block]
+
+    # 先序遍历建立区块树, 文本长度计入最近的元素区块
+    stack = [(child, root_block) for child in reversed(list(children(root)))]
+    while stack:
+        node, parent = stack.pop()
+        description = describe(node)
+        if description is None:
+            continue
+        kind, tag, hints, text = description
+        if kind == TEXT:
+            length = len(text.strip())
+            parent.text += length
+            if parent.in_link:
+                parent.link += length
+            continue
+
+        negative = bool(hints) and (
+            NEGATIVE_HINTS.search(hints) is not None
+            and POSITIVE_HINTS.search(hints) is None
+        )
+        block = _Block(node, negative, in_link=parent.in_link or tag == "a")
+        if tag == "h1":
+            block.headings = 1
+        parent.children.append(block)
+        blocks.append(block)
+        stack.extend((child, block) for child in reversed(list(children(node))))
+
+    # 逆序即子区块先于父区块, 汇总子树统计; 非正文区块不计入父区块
+    parents = {id(child): block for block in blocks for child in block.children}
+    for block in reversed(blocks[1:]):
+        if block.negative:
+            continue
+        parent = parents[id(block)]
+        parent.text += block.text
+        parent.link += block.link
+        parent.headings += block.headings
+
+    main = root_block
+    while True:
+        candidates = [child for child in main.children if not child.negative]
+        best = max(candidates, key=lambda block: block.net, default=None)
+        if (
+            best is None
+            or best.net <= 0
+            or best.net < min_ratio * main.net
+            or best.headings < main.headings
+        ):
+            break
+        main = best
+
+    discounted = []
+    stack = list(main.children)
+    while stack:
+        block = stack.pop()
+        if block.negative:
+            discounted.append(block.node)
+        else:
+            stack.extend(block.children)
+    return main.node, discounted
+
+
+def block_text(
+    root: Any,
+    children: Callable[[Any], Iterable[Any]],
+    describe: Callable[[Any], Optional[NodeDescription]],
+) -> str:
+    """
+    Get the text under root with a newline around every block element.
+
+    Text inside inline elements (links, emphasis, ...) stays on the line of its
+    paragraph, so that each paragraph of the page becomes one line.
+
+    Args:
+            root (Any): The node whose text is taken.
+            children (Callable[[Any], Iterable[Any]]): Returns the child nodes of a node.
+            describe (Callable[[Any], Optional[NodeDescription]]): Describes a node, see
+                    select_main_content.
+
+    Returns:
+            str: The text, with whitespace inside text nodes collapsed to spaces.
+    """
+    parts = []
+    # 栈中的 None 表示块级元素结束
+    stack = list(reversed(list(children(root))))
+    while stack:
+        node = stack.pop()
+        if node is None:
+            parts.append("\n")
+            continue
+        description = describe(node)
+        if description is None:
+            continue
+        kind, tag, _, text = description
+        if kind == TEXT:
+            # 与浏览器渲染一致, 文本节点内的换行只是空白
+            parts.append(WHITESPACE_PATTERN.sub(" ", text))
+            continue
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+            stack.append(None)
+        stack.extend(reversed(list(children(node))))
+    return "".join(parts)
@@ -0,0 +1,157 @@
+"""
+Paragraph Deduplication Module
+
+This module removes near-duplicate paragraphs from extracted content. Each paragraph
+is reduced to a 64-bit SimHash fingerprint computed from character shingles, and
+fingerprints are indexed by bands so that candidates within the configured Hamming
+distance are found without comparing every pair of paragraphs.
+"""
+
+import logging
+import re
+from typing import Dict, List, Tuple
+
+from eenhance.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 多项式滚动哈希的基数与 splitmix64 的混合常数
+SHINGLE_BASE = 0x100000001B3
+MIX_CONSTANT_1 = 0xBF58476D1CE4E5B9
+MIX_CONSTANT_2 = 0x94D049BB133111EB
+
+
+class ParagraphDeduplicator:
+    def __init__(
+        self, threshold: float = 0.95, min_chars: int = 30, shingle_size: int = 4
+    ):
+        """
+        Initialize the ParagraphDeduplicator.
+
+        Args:
+                threshold (float): SimHash similarity (1 - Hamming distance / 64)
+                        from which two paragraphs are considered duplicates.
+                min_chars (int): Paragraphs shorter than this are always kept.
+                shingle_size (int): Number of characters per shingle.
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+
+        self.threshold = threshold
+        self.min_chars = min_chars
+        self.shingle_size = shingle_size
+        self.max_distance = int((1 - threshold) * FINGERPRINT_BITS)
+        # 按鸽巢原理, 距离不超过 max_distance 的两个指纹至少有一段完全相同
+        self.bands = self._band_masks(self.max_distance + 1)
+
+    @staticmethod
+    def _band_masks(count: int) -> List[Tuple[int, int]]:
+        """
+        Split the fingerprint bits into ``count`` contiguous bands.
+
+        Returns:
+                List[Tuple[int, int]]: (shift, mask) of every band.
+        """
+        bands = []
+        start = 0
+        for i in range(count):
+            width = FINGERPRINT_BITS // count + (
+                1 if i < FINGERPRINT_BITS % count else 0
+            )
+            bands.append((start, (1 << width) - 1))
+            start += width
+        return bands
+
+    def fingerprint(self, text: str) -> int:
+        """
+        Compute the 64-bit SimHash of a text from its character shingles.
+
+        Args:
+                text (str): The text.
+
+        Returns:
+                int: The fingerprint.
+        """
+        # 延迟导入, 避免导入 content_extractor 时加载 numpy
+        import numpy as np
+
+        normalized = WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+        codepoints = np.frombuffer(
+            normalized.encode("utf-32-le"), dtype=np.uint32
+        ).astype(np.uint64)
+        size = min(self.shingle_size, len(codepoints))
+        if size == 0:
+            return 0
+
+        # 向量化计算所有字符 shingle 的哈希, uint64 溢出即取模 2^64
+        count = len(codepoints) - size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            hashes = hashes * np.uint64(SHINGLE_BASE) + codepoints[offset : offset + count]
+        hashes ^= hashes >> np.uint64(30)
+        hashes *= np.uint64(MIX_CONSTANT_1)
+        hashes ^= hashes >> np.uint64(27)
+        hashes *= np.uint64(MIX_CONSTANT_2)
+        hashes ^= hashes >> np.uint64(31)
+
+        bits = (hashes[:, None] >> np.arange(FINGERPRINT_BITS, dtype=np.uint64)) & 1
+        weights = 2 * bits.sum(axis=0, dtype=np.int64) - count
+        return sum(1 << int(i) for i in np.flatnonzero(weights > 0))
+
+    def deduplicate(self, texts: List[str]) -> List[str]:
+        """
+        Remove paragraphs that nearly duplicate an earlier paragraph.
+
+        Texts are processed in order and share one index, so a paragraph repeated
+        across several sources is kept only in the first one. Paragraphs are the
+        lines of each text.
+
+        Args:
+                texts (List[str]): Extracted texts, e.g. one per source.
+
+        Returns:
+                List[str]: The texts without near-duplicate paragraphs.
+        """
+        index: List[Dict[int, List[int]]] = [{} for _ in self.bands]
+        results = []
+        removed_chars = 0
+        removed_tokens = 0
+
+        for text in texts:
+            kept = []
+            for paragraph in text.split("\n"):
+                if len(paragraph.strip()) < self.min_chars:
+                    kept.append(paragraph)
+                    continue
+
+                fingerprint = self.fingerprint(paragraph)
+                if self._has_near_duplicate(fingerprint, index):
+                    removed_chars += len(paragraph)
+                    removed_tokens += estimate_tokens(paragraph)
+                    continue
+
+                for band_index, (shift, mask) in zip(index, self.bands):
+                    band_index.setdefault((fingerprint >> shift) & mask, []).append(
+                        fingerprint
+                    )
+                kept.append(paragraph)
+            results.append("\n".join(kept))
+
+        if removed_chars:
+            logger.info(
+                f"Removed near-duplicate paragraphs: {removed_chars} chars, "
+                f"~{removed_tokens} tokens saved"
+            )
+        return results
+
+    def _has_near_duplicate(
+        self, fingerprint: int, index: List[Dict[int, List[int]]]
+    ) -> bool:
+        for band_index, (shift, mask) in zip(index, self.bands):
+            for candidate in band_index.get((fingerprint >> shift) & mask, ()):
+                if (fingerprint ^ candidate).bit_count() <= self.max_distance:
+                    return True
+        return False
@@ -4,32 +4,142 @@ PDF Extractor Module
 This module provides functionality to extract text content from PDF files.
 It handles the reading of PDF files, text extraction, and normalization of
 the extracted content, including handling of special characters and accents.
+Large documents can be split into page ranges and extracted in a process pool,
+or streamed lazily page by page. Running headers, footers and page numbers that
+repeat across pages are stripped to keep downstream prompts small.
 """
 
 import pymupdf
 import logging
+import multiprocessing
 import os
+import re
 import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from eenhance.utils.config import load_config
+from eenhance.utils.tokens import estimate_tokens
+from .extraction_cache import settings_fingerprint
 
 logger = logging.getLogger(__name__)
 
+# 归一化短行中的数字, 使 "第 3 页" 与 "第 4 页" 视为同一页眉/页脚
+DIGITS_PATTERN = re.compile(r"\d+")
+PAGE_NUMBER_MAX_TEXT = 20
+
+
+def extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract the raw text of pages [start, stop) of a PDF file.
+
+    Runs in a worker process, so it opens the document itself.
+
+    Args:
+            file_path (str): Path to the PDF file.
+            start (int): First page index (inclusive).
+            stop (int): Last page index (exclusive).
+
+    Returns:
+            List[str]: One text per page.
+    """
+    with pymupdf.open(file_path) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
 
 class PDFExtractor:
-    def extract_content(self, file_path: str) -> str:
+    def __init__(self):
+        """
+        Initialize the PDFExtractor.
+        """
+        self.config = load_config()
+        self.pdf_extractor_config = self.config.get("pdf_extractor", {})
+        self.parallel = self.pdf_extractor_config.get("parallel", False)
+        self.parallel_min_pages = self.pdf_extractor_config.get(
+            "parallel_min_pages", 100
+        )
+        self.max_workers = self.pdf_extractor_config.get("max_workers") or (
+            os.cpu_count() or 1
+        )
+        self.max_chars = self.pdf_extractor_config.get("max_chars")
+        repeated_lines_config = self.pdf_extractor_config.get("repeated_lines", {})
+        self.strip_repeated_lines = repeated_lines_config.get("enabled", False)
+        self.repeated_min_ratio = repeated_lines_config.get("min_ratio", 0.5)
+        self.repeated_min_pages = repeated_lines_config.get("min_pages", 3)
+        self.repeated_edge_lines = repeated_lines_config.get("edge_lines", 3)
+
+    def iter_pages(
+        self, file_path: str, pages: Optional[Iterable[int]] = None
+    ) -> Iterator[str]:
+        """
+        Lazily yield the normalized text of each selected page.
+
+        Only one page is held in memory at a time and the document is closed as
+        soon as the generator is exhausted or closed.
+
+        Args:
+                file_path (str): Path to the PDF file.
+                pages (Optional[Iterable[int]]): Zero-based page indices to read, in
+                        the given order. Negative indices count from the end and
+                        out-of-range indices are skipped. Defaults to all pages.
+
+        Yields:
+                str: NFKD-normalized page text.
+        """
+        with pymupdf.open(file_path) as doc:
+            page_count = doc.page_count
+            indices = range(page_count) if pages is None else pages
+            for index in indices:
+                if index < 0:
+                    index += page_count
+                if not 0 <= index < page_count:
+                    logger.warning(f"Skipping page {index} outside {file_path}")
+                    continue
+                yield unicodedata.normalize("NFKD", doc[index].get_text())
+
+    def extract_content(
+        self,
+        file_path: str,
+        pages: Optional[Iterable[int]] = None,
+        max_chars: Optional[int] = None,
+    ) -> str:
         """
         Extract text content from a PDF file, handling foreign characters and special characters.
         Accents are removed from the text.
 
+        Documents with at least ``parallel_min_pages`` pages are extracted in page
+        ranges on a process pool when ``parallel`` is enabled. When pages or
+        max_chars are given, pages are streamed with iter_pages and reading stops
+        once max_chars characters have been collected.
+
         Args:
                 file_path (str): Path to the PDF file.
+                pages (Optional[Iterable[int]]): Zero-based page indices to extract.
+                max_chars (Optional[int]): Maximum number of characters to return.
+                        Defaults to the ``max_chars`` value from config.
 
         Returns:
                 str: Extracted text content with accents removed and properly handled characters.
         """
+        max_chars = max_chars or self.max_chars
         try:
+            if pages is not None or max_chars:
+                return self._extract_streaming(file_path, pages, max_chars)
+
             doc = pymupdf.open(file_path)
-            content = " ".join(page.get_text() for page in doc)
-            doc.close()
+            page_count = doc.page_count
+            if self.parallel and self.max_workers > 1 and (
+                page_count >= self.parallel_min_pages
+            ):
+                doc.close()
+                page_texts = self._extract_parallel(file_path, page_count)
+            else:
+                page_texts = [page.get_text() for page in doc]
+                doc.close()
+
+            if self.strip_repeated_lines:
+                page_texts = self.remove_repeated_lines(page_texts)
+            content = " ".join(page_texts)
 
             # Normalize the text to handle special characters and remove accents
             normalized_content = unicodedata.normalize("NFKD", content)
@@ -39,6 +149,163 @@ class PDFExtractor:
             logger.error(f"Error extracting PDF content: {str(e)}")
             raise
 
+    def _extract_streaming(
+        self,
+        file_path: str,
+        pages: Optional[Iterable[int]],
+        max_chars: Optional[int],
+    ) -> str:
+        """
+        Join streamed pages, stopping early once max_chars is reached.
+        """
+        parts = []
+        length = 0
+        for page_text in self.iter_pages(file_path, pages):
+            parts.append(page_text)
+            length += len(page_text) + 1
+            if max_chars and length >= max_chars:
+                break
+
+        if self.strip_repeated_lines:
+            parts = self.remove_repeated_lines(parts)
+        content = " ".join(parts)
+        return content[:max_chars] if max_chars else content
+
+    def _extract_parallel(self, file_path: str, page_count: int) -> List[str]:
+        """
+        Extract page ranges in a process pool and reassemble them in order.
+
+        Args:
+                file_path (str): Path to the PDF file.
+                page_count (int): Number of pages in the document.
+
+        Returns:
+                List[str]: One text per page, identical to the serial path.
+        """
+        ranges = self.split_page_ranges(page_count, self.max_workers)
+        logger.info(
+            f"Extracting {page_count} pages of {file_path} in {len(ranges)} ranges"
+        )
+        # 提取可能在线程池中运行, 多线程进程中 fork 可能使子进程死锁, 因此使用 spawn
+        with ProcessPoolExecutor(
+            max_workers=len(ranges), mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            parts = executor.map(
+                extract_page_range,
+                [file_path] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+            return [page_text for part in parts for page_text in part]
+
+    def cache_fingerprint(self) -> str:
+        """
+        Fingerprint of the settings that shape the extracted text.
+
+        Returns:
+                str: Digest included in extraction cache keys, so cached documents
+                        are re-extracted after the truncation or repeated-line
+                        settings change.
+        """
+        return settings_fingerprint(
+            {
+                "max_chars": self.max_chars,
+                "repeated_lines": [
+                    self.strip_repeated_lines,
+                    self.repeated_min_ratio,
+                    self.repeated_min_pages,
+                    self.repeated_edge_lines,
+                ],
+            }
+        )
+
+    def remove_repeated_lines(self, page_texts: List[str]) -> List[str]:
+        """
+        Drop running headers, footers and page numbers repeated across pages.
+
+        Only the first and last ``edge_lines`` non-empty lines of each page are
+        candidates. A candidate is dropped when it appears on at least
+        ``min_ratio`` of the pages; digits in short lines are normalized so
+        page numbers such as "Page 3 of 10" match across pages. Counting uses a hash index, so the
+        pass is linear in the size of the text.
+
+        Args:
+                page_texts (List[str]): One text per page.
+
+        Returns:
+                List[str]: Page texts without the repeated lines.
+        """
+        if len(page_texts) < self.repeated_min_pages:
+            return page_texts
+
+        pages_lines = [text.split("\n") for text in page_texts]
+        edge_keys = [self._edge_line_keys(lines) for lines in pages_lines]
+
+        counts = Counter(key for keys in edge_keys for key in set(keys.values()))
+        threshold = max(2, self.repeated_min_ratio * len(page_texts))
+        repeated = {key for key, count in counts.items() if count >= threshold}
+        if not repeated:
+            return page_texts
+
+        cleaned_texts = []
+        for lines, keys in zip(pages_lines, edge_keys):
+            cleaned_texts.append(
+                "\n".join(
+                    line
+                    for i, line in enumerate(lines)
+                    if keys.get(i) not in repeated
+                )
+            )
+
+        original = "".join(page_texts)
+        kept = "".join(cleaned_texts)
+        saved_chars = len(original) - len(kept)
+        saved_tokens = estimate_tokens(original) - estimate_tokens(kept)
+        logger.info(
+            f"Removed {len(repeated)} repeated header/footer lines: "
+            f"saved {saved_chars} characters (~{saved_tokens} tokens)"
+        )
+        return cleaned_texts
+
+    def _edge_line_keys(self, lines: List[str]) -> dict:
+        """
+        Map the index of each edge line of a page to its normalized key.
+        """
+        non_empty = [i for i, line in enumerate(lines) if line.strip()]
+        edge = self.repeated_edge_lines
+        indices = non_empty[:edge] + non_empty[-edge:] if edge else non_empty
+
+        keys = {}
+        for i in indices:
+            key = " ".join(lines[i].split())
+            normalized = DIGITS_PATTERN.sub("#", key)
+            if len(normalized.replace("#", "")) <= PAGE_NUMBER_MAX_TEXT:
+                key = normalized
+            keys[i] = key
+        return keys
+
+    @staticmethod
+    def split_page_ranges(page_count: int, num_ranges: int) -> List[Tuple[int, int]]:
+        """
+        Split page indices into at most num_ranges contiguous, near-equal ranges.
+
+        Args:
+                page_count (int): Number of pages.
+                num_ranges (int): Desired number of ranges.
+
+        Returns:
+                List[Tuple[int, int]]: (start, stop) pairs covering [0, page_count).
+        """
+        num_ranges = max(1, min(num_ranges, page_count))
+        size, remainder = divmod(page_count, num_ranges)
+        ranges = []
+        start = 0
+        for i in range(num_ranges):
+            stop = start + size + (1 if i < remainder else 0)
+            ranges.append((start, stop))
+            start = stop
+        return ranges
+
 
 def main(seed: int = 42) -> None:
     """
@@ -0,0 +1,88 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+from typing_extensions import TypedDict
+
+logger = logging.getLogger(__name__)
+
+
+# 单个来源的提取结果
+class ExtractionResult(TypedDict):
+    url: str  # 输入的URL或文件路径
+    content: str  # 提取的文本内容, 失败时为空字符串
+    error: str | None  # 失败原因
+
+
+def join_results(
+    results: Iterable[ExtractionResult],
+    source: str,
+    deduplicate: Optional[Callable[[List[str]], List[str]]] = None,
+    documents: bool = True,
+) -> str:
+    """
+    Join the successful results of a multi-part source into one text.
+
+    Failed results are logged and skipped.
+
+    Args:
+            results (Iterable[ExtractionResult]): Results in source order.
+            source (str): The source the results belong to, for error messages.
+            deduplicate (Optional[Callable[[List[str]], List[str]]]): Applied to the
+                    successful contents before joining, e.g. near-duplicate removal.
+            documents (bool): Wrap each content in a ``<Document source=...>`` tag
+                    naming its URL or path.
+
+    Returns:
+            str: The contents, separated by blank lines.
+
+    Raises:
+            ValueError: If no result succeeded.
+    """
+    succeeded = []
+    for result in results:
+        if result["error"] is None:
+            succeeded.append(result)
+        else:
+            logger.warning(f"Skipping {result['url']}: {result['error']}")
+    if not succeeded:
+        raise ValueError(f"No content could be extracted from {source}")
+
+    contents = [result["content"] for result in succeeded]
+    if deduplicate is not None:
+        contents = deduplicate(contents)
+    if documents:
+        contents = [
+            f'<Document source="{result["url"]}"/>\n{content}\n</Document>'
+            for result, content in zip(succeeded, contents)
+        ]
+    return "\n\n".join(contents)
+
+
+def run_concurrently(
+    fn: Callable[[str], str], items: List[str], max_workers: int
+) -> List[ExtractionResult]:
+    """
+    Extract several sources on a thread pool.
+
+    A failing item does not affect the others; its error is reported in its own
+    result.
+
+    Args:
+            fn (Callable[[str], str]): Extracts the text of one URL or path.
+            items (List[str]): URLs or file paths.
+            max_workers (int): Maximum number of concurrent calls.
+
+    Returns:
+            List[ExtractionResult]: One result per item, in input order.
+    """
+    if not items:
+        return []
+
+    def _extract(item: str) -> ExtractionResult:
+        try:
+            return ExtractionResult(url=item, content=fn(item), error=None)
+        except Exception as e:
+            return ExtractionResult(url=item, content="", error=str(e))
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(_extract, items))
@@ -2,20 +2,60 @@
 Website Extractor Module
 
 This module is responsible for extracting clean text content from websites using
-BeautifulSoup for local HTML parsing instead of the Jina AI API.
+local HTML parsing instead of the Jina AI API. The parser backend is configurable:
+BeautifulSoup with the pure-Python ``html.parser`` (default) or ``lxml`` builder,
+or the C-based ``selectolax`` parser. Requests go through a per-host rate
+limiter that backs off on 429/503 responses. With main-content detection enabled,
+only the article block is kept, dropping sidebars, comment threads and
+related-article lists.
 """
 
+import asyncio
+import httpx
 import requests
 import re
 import html
 import logging
+from contextlib import asynccontextmanager, contextmanager, nullcontext
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from weakref import WeakKeyDictionary
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from eenhance.utils.config import load_config
-from typing import List
+from eenhance.utils.throttle import THROTTLE_STATUS_CODES, parse_retry_after
+from typing import AsyncIterator, Iterator, List, Optional
+from typing_extensions import TypedDict
+from . import main_content
+from .extraction_cache import settings_fingerprint
+from .host_limiter import HostRateLimiter
+from .schemas import ExtractionResult, run_concurrently
 
 logger = logging.getLogger(__name__)
 
+# 支持的HTML解析后端
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+# 匹配 <meta charset="..."> 和 <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET_PATTERN = re.compile(
+    rb"<meta[^>]+charset=[\"']?([a-zA-Z0-9_\-]+)", re.IGNORECASE
+)
+
+
+# extract_if_modified 的结果
+class ConditionalExtraction(TypedDict):
+    content: str | None  # 提取的文本内容, 服务端返回304时为None
+    etag: str | None  # 响应的ETag
+    last_modified: str | None  # 响应的Last-Modified
+
+
+# fetch_if_modified 的结果
+class ConditionalFetch(TypedDict):
+    body: str | None  # 解码后的响应内容, 服务端返回304时为None
+    etag: str | None  # 响应的ETag
+    last_modified: str | None  # 响应的Last-Modified
+
 
 class WebsiteExtractor:
     def __init__(self):
@@ -30,6 +70,124 @@ class WebsiteExtractor:
         self.remove_patterns = self.website_extractor_config.get(
             "markdown_cleaning", {}
         ).get("remove_patterns", [])
+        self.max_workers = self.website_extractor_config.get("max_workers", 8)
+        self.stream = self.website_extractor_config.get("stream", False)
+        self.chunk_size = self.website_extractor_config.get("chunk_size", 65536)
+        self.max_content_bytes = self.website_extractor_config.get(
+            "max_content_bytes", 10 * 1024 * 1024
+        )
+        self.allowed_content_types = [
+            content_type.lower()
+            for content_type in self.website_extractor_config.get(
+                "allowed_content_types", []
+            )
+        ]
+        self.parser = self._resolve_parser(
+            self.website_extractor_config.get("parser", "html.parser")
+        )
+        rate_limit_config = self.website_extractor_config.get("rate_limit", {})
+        self.rate_limiter: Optional[HostRateLimiter] = None
+        self.max_retries = 0
+        if rate_limit_config.get("enabled", False):
+            self.rate_limiter = HostRateLimiter.from_config(rate_limit_config)
+            self.max_retries = rate_limit_config.get("max_retries", 3)
+        main_content_config = self.website_extractor_config.get("main_content", {})
+        self.main_content = main_content_config.get("enabled", False)
+        self.main_content_min_ratio = main_content_config.get("min_ratio", 0.8)
+        self.session = self._create_session()
+        # 每个事件循环一个异步客户端, 事件循环被回收时条目随之删除
+        self._async_clients: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = WeakKeyDictionary()
+        self._async_client_lifetimes: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, AsyncIterator[None]
+        ] = WeakKeyDictionary()
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create a pooled HTTP session shared by all requests of this extractor.
+
+        Connections are kept alive and reused per host, and compressed responses
+        (gzip/deflate, plus brotli when available) are requested.
+
+        Returns:
+                requests.Session: The configured session.
+        """
+        adapter = HTTPAdapter(
+            pool_connections=self.website_extractor_config.get("pool_connections", 10),
+            pool_maxsize=self.website_extractor_config.get("pool_maxsize", 10),
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(
+            {
+                "User-Agent": self.user_agent,
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "Connection": "keep-alive",
+            }
+        )
+        return session
+
+    @staticmethod
+    def _resolve_parser(parser: str) -> str:
+        """
+        Validate the configured parser backend, falling back to ``html.parser``
+        when its optional dependency is not installed.
+
+        Args:
+                parser (str): One of PARSER_BACKENDS.
+
+        Returns:
+                str: The parser backend to use.
+
+        Raises:
+                ValueError: If the parser backend is unknown.
+        """
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(
+                f"Unsupported parser: {parser}. "
+                f"Choose from: {', '.join(PARSER_BACKENDS)}"
+            )
+        if parser == "html.parser":
+            return parser
+
+        try:
+            if parser == "lxml":
+                import lxml  # noqa: F401
+            else:
+                import selectolax  # noqa: F401
+        except ImportError:
+            logger.warning(
+                f"HTML parser backend '{parser}' is not installed "
+                f"(pip install {parser}), falling back to html.parser"
+            )
+            return "html.parser"
+        return parser
+
+    def cache_fingerprint(self) -> str:
+        """
+        Fingerprint of the settings that shape the extracted text.
+
+        Returns:
+                str: Digest included in extraction cache keys, so cached pages are
+                        re-extracted after the parser or cleaning settings change.
+        """
+        return settings_fingerprint(
+            {
+                "parser": self.parser,
+                "main_content": self.main_content,
+                "main_content_min_ratio": self.main_content_min_ratio,
+                "unwanted_tags": self.unwanted_tags,
+                "remove_patterns": self.remove_patterns,
+            }
+        )
+
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session and release pooled connections.
+        """
+        self.session.close()
 
     def extract_content(self, url: str) -> str:
         """
@@ -44,29 +202,219 @@ class WebsiteExtractor:
         Raises:
                 Exception: If there's an error in extracting the content.
         """
-        try:
-            # Normalize the URL
-            normalized_url = self.normalize_url(url)
+        return self.extract_if_modified(url)["content"]
+
+    def extract_if_modified(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> ConditionalExtraction:
+        """
+        Extract clean text content from a website with a conditional GET.
 
-            # Request the webpage
-            headers = {"User-Agent": self.user_agent}
-            response = requests.get(
-                normalized_url, headers=headers, timeout=self.timeout
+        When ``etag`` or ``last_modified`` are given they are sent as
+        ``If-None-Match`` / ``If-Modified-Since``; if the server answers
+        ``304 Not Modified`` the page is neither downloaded nor parsed and
+        ``content`` is None.
+
+        Args:
+                url (str): Website URL.
+                etag (Optional[str]): ETag of the cached copy.
+                last_modified (Optional[str]): Last-Modified of the cached copy.
+
+        Returns:
+                ConditionalExtraction: Extracted content and the response validators.
+
+        Raises:
+                Exception: If there's an error in extracting the content.
+        """
+        try:
+            fetched = self._fetch(url, etag, last_modified)
+            content = None
+            if fetched["body"] is not None:
+                content = self.extract_text(fetched["body"])
+            return ConditionalExtraction(
+                content=content,
+                etag=fetched["etag"],
+                last_modified=fetched["last_modified"],
+            )
+        except requests.RequestException as e:
+            logger.error(f"Failed to extract content from {url}: {str(e)}")
+            raise Exception(f"Failed to extract content from {url}: {str(e)}")
+        except Exception as e:
+            logger.error(
+                f"An unexpected error occurred while extracting content from {url}: {str(e)}"
             )
+            raise Exception(
+                f"An unexpected error occurred while extracting content from {url}: {str(e)}"
+            )
+
+    def fetch_if_modified(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        allowed_content_types: Optional[List[str]] = None,
+    ) -> ConditionalFetch:
+        """
+        Download a document with a conditional GET without extracting its text.
+
+        Used for non-HTML documents such as feeds and sitemaps; the request goes
+        through the same session, rate limiter and size limits as page extraction.
+
+        Args:
+                url (str): Document URL.
+                etag (Optional[str]): ETag of the cached copy.
+                last_modified (Optional[str]): Last-Modified of the cached copy.
+                allowed_content_types (Optional[List[str]]): Content types accepted
+                        instead of the configured ``allowed_content_types``.
+
+        Returns:
+                ConditionalFetch: The decoded body, None on 304, and the validators.
+
+        Raises:
+                Exception: If the document cannot be downloaded.
+        """
+        try:
+            return self._fetch(url, etag, last_modified, allowed_content_types)
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Failed to fetch {url}: {str(e)}")
+            raise Exception(f"Failed to fetch {url}: {str(e)}")
+
+    def post_json(
+        self,
+        url: str,
+        payload: dict,
+        allowed_content_types: Optional[List[str]] = None,
+    ) -> str:
+        """
+        POST a JSON payload and return the response body.
+
+        Used for JSON APIs such as YouTube's playlist continuation endpoint; the
+        request goes through the same session, rate limiter and size limits as
+        page extraction.
+
+        Args:
+                url (str): Endpoint URL.
+                payload (dict): JSON request body.
+                allowed_content_types (Optional[List[str]]): Content types accepted
+                        instead of the configured ``allowed_content_types``.
+
+        Returns:
+                str: The decoded response body.
+
+        Raises:
+                Exception: If the request fails.
+        """
+        try:
+            with self._request(
+                self.normalize_url(url), {}, method="POST", json=payload
+            ) as response:
+                response.raise_for_status()
+                if self.stream:
+                    return self.read_body(response, allowed_content_types)
+                return response.text
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Failed to post to {url}: {str(e)}")
+            raise Exception(f"Failed to post to {url}: {str(e)}")
+
+    def _fetch(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        allowed_content_types: Optional[List[str]] = None,
+    ) -> ConditionalFetch:
+        """
+        Conditional GET shared by extract_if_modified and fetch_if_modified.
+        """
+        # Normalize the URL
+        normalized_url = self.normalize_url(url)
+
+        headers = self._conditional_headers(etag, last_modified)
+
+        # Request the webpage over the pooled session
+        with self._request(normalized_url, headers) as response:
             response.raise_for_status()  # Raise an exception for bad status codes
 
-            # Parse the page content with BeautifulSoup
-            soup = BeautifulSoup(response.text, "html.parser")
+            validators = {
+                "etag": response.headers.get("ETag", etag),
+                "last_modified": response.headers.get("Last-Modified", last_modified),
+            }
+            if response.status_code == 304:
+                return ConditionalFetch(body=None, **validators)
 
-            # Remove unwanted elements
-            self.remove_unwanted_elements(soup)
+            if self.stream:
+                body = self.read_body(response, allowed_content_types)
+            else:
+                body = response.text
+        return ConditionalFetch(body=body, **validators)
 
-            # Extract and clean the text content
-            raw_text = soup.get_text(separator="\n")  # Get all text content
-            cleaned_content = self.clean_content(raw_text)
+    async def aextract_content(self, url: str) -> str:
+        """
+        Asynchronously extract clean text content from a website.
 
-            return cleaned_content
-        except requests.RequestException as e:
+        Args:
+                url (str): Website URL.
+
+        Returns:
+                str: Extracted clean text content.
+
+        Raises:
+                Exception: If there's an error in extracting the content.
+        """
+        return (await self.aextract_if_modified(url))["content"]
+
+    async def aextract_if_modified(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> ConditionalExtraction:
+        """
+        Asynchronous counterpart of extract_if_modified built on httpx.
+
+        The download never blocks the event loop and HTML parsing runs in a
+        worker thread.
+
+        Args:
+                url (str): Website URL.
+                etag (Optional[str]): ETag of the cached copy.
+                last_modified (Optional[str]): Last-Modified of the cached copy.
+
+        Returns:
+                ConditionalExtraction: Extracted content and the response validators.
+
+        Raises:
+                Exception: If there's an error in extracting the content.
+        """
+        try:
+            # Normalize the URL
+            normalized_url = self.normalize_url(url)
+
+            headers = self._conditional_headers(etag, last_modified)
+
+            async with self._arequest(normalized_url, headers) as response:
+                validators = {
+                    "etag": response.headers.get("ETag", etag),
+                    "last_modified": response.headers.get(
+                        "Last-Modified", last_modified
+                    ),
+                }
+                if response.status_code == 304:
+                    return ConditionalExtraction(content=None, **validators)
+                response.raise_for_status()  # Raise an exception for bad status codes
+
+                if self.stream:
+                    page = await self.aread_body(response)
+                else:
+                    await response.aread()
+                    page = response.text
+
+            content = await asyncio.to_thread(self.extract_text, page)
+            return ConditionalExtraction(content=content, **validators)
+        except httpx.HTTPError as e:
             logger.error(f"Failed to extract content from {url}: {str(e)}")
             raise Exception(f"Failed to extract content from {url}: {str(e)}")
         except Exception as e:
@@ -77,6 +425,392 @@ class WebsiteExtractor:
                 f"An unexpected error occurred while extracting content from {url}: {str(e)}"
             )
 
+    def _slot(self, host: str):
+        if self.rate_limiter is None:
+            return nullcontext()
+        return self.rate_limiter.slot(host)
+
+    def _aslot(self, host: str):
+        if self.rate_limiter is None:
+            return nullcontext()
+        return self.rate_limiter.aslot(host)
+
+    def _is_throttled(self, host: str, status_code: int, headers, attempt: int) -> bool:
+        """
+        Back off the host on a 429/503 response and tell whether to retry it.
+
+        The response of the last attempt is returned to the caller as is.
+        """
+        if self.rate_limiter is None:
+            return False
+        if status_code not in THROTTLE_STATUS_CODES:
+            self.rate_limiter.record_success(host)
+            return False
+        self.rate_limiter.backoff(host, parse_retry_after(headers.get("Retry-After")))
+        return attempt < self.max_retries
+
+    @contextmanager
+    def _request(
+        self, url: str, headers: dict, method: str = "GET", **kwargs
+    ) -> Iterator[requests.Response]:
+        """
+        Request a URL within the host's rate limit, retrying throttled responses.
+
+        The in-flight slot is held until the response is closed, so streamed
+        downloads count against the host's concurrency.
+        """
+        host = urlparse(url).hostname or ""
+        for attempt in range(self.max_retries + 1):
+            with self._slot(host):
+                response = self.session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    stream=self.stream,
+                    **kwargs,
+                )
+                with response:
+                    if self._is_throttled(
+                        host, response.status_code, response.headers, attempt
+                    ):
+                        continue
+                    yield response
+                    return
+
+    @asynccontextmanager
+    async def _arequest(
+        self, url: str, headers: dict
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Asynchronous counterpart of _request.
+        """
+        host = urlparse(url).hostname or ""
+        client = await self._get_async_client()
+        for attempt in range(self.max_retries + 1):
+            async with self._aslot(host):
+                async with client.stream("GET", url, headers=headers) as response:
+                    if self._is_throttled(
+                        host, response.status_code, response.headers, attempt
+                    ):
+                        continue
+                    yield response
+                    return
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async HTTP client bound to the running event loop.
+
+        httpx clients cannot be shared across event loops, so each loop gets its
+        own client. The client is closed together with its loop: it is owned by
+        an async generator that the loop finalizes on shutdown (as asyncio.run
+        does), since a client cannot be closed from another loop afterwards.
+
+        Returns:
+                httpx.AsyncClient: The configured client.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                headers={
+                    "User-Agent": self.user_agent,
+                    "Accept-Encoding": ACCEPT_ENCODING,
+                },
+                limits=httpx.Limits(
+                    max_connections=self.website_extractor_config.get(
+                        "pool_maxsize", 10
+                    )
+                    * self.website_extractor_config.get("pool_connections", 10),
+                    max_keepalive_connections=self.website_extractor_config.get(
+                        "pool_maxsize", 10
+                    ),
+                ),
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+            lifetime = self._async_client_lifetime(client)
+            await lifetime.__anext__()
+            self._async_clients[loop] = client
+            self._async_client_lifetimes[loop] = lifetime
+        return client
+
+    @staticmethod
+    async def _async_client_lifetime(
+        client: httpx.AsyncClient,
+    ) -> AsyncIterator[None]:
+        # 事件循环关闭前 shutdown_asyncgens 会结束该生成器, 从而关闭客户端
+        try:
+            yield
+        finally:
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the async HTTP client of the running event loop and release its
+        pooled connections.
+        """
+        loop = asyncio.get_running_loop()
+        self._async_clients.pop(loop, None)
+        lifetime = self._async_client_lifetimes.pop(loop, None)
+        if lifetime is not None:
+            await lifetime.aclose()
+
+    @staticmethod
+    def _conditional_headers(
+        etag: Optional[str], last_modified: Optional[str]
+    ) -> dict:
+        """
+        Build the If-None-Match / If-Modified-Since headers of a conditional GET.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def read_body(
+        self,
+        response: requests.Response,
+        allowed_content_types: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Read a streamed response body in chunks and decode it.
+
+        The download is aborted as soon as the content type is not allowed or the
+        body exceeds ``max_content_bytes``, so oversized responses are never fully
+        buffered. The charset declared in the Content-Type header (or in a
+        ``<meta>`` tag near the top of the document) is used when present; only
+        otherwise is the encoding detected, and then from the first chunk only.
+
+        Args:
+                response (requests.Response): A response requested with stream=True.
+                allowed_content_types (Optional[List[str]]): Overrides the configured
+                        ``allowed_content_types``.
+
+        Returns:
+                str: The decoded body.
+
+        Raises:
+                ValueError: If the content type is not allowed or the body is too large.
+        """
+        params = self._check_response_headers(response.headers, allowed_content_types)
+
+        chunks = []
+        total = 0
+        for chunk in response.iter_content(chunk_size=self.chunk_size):
+            total = self._check_body_size(total + len(chunk))
+            chunks.append(chunk)
+
+        return self._decode_body(b"".join(chunks), params)
+
+    async def aread_body(self, response: httpx.Response) -> str:
+        """
+        Asynchronous counterpart of read_body for streamed httpx responses.
+
+        Args:
+                response (httpx.Response): A response opened with client.stream().
+
+        Returns:
+                str: The decoded body.
+
+        Raises:
+                ValueError: If the content type is not allowed or the body is too large.
+        """
+        params = self._check_response_headers(response.headers)
+
+        chunks = []
+        total = 0
+        async for chunk in response.aiter_bytes(chunk_size=self.chunk_size):
+            total = self._check_body_size(total + len(chunk))
+            chunks.append(chunk)
+
+        return self._decode_body(b"".join(chunks), params)
+
+    def _check_response_headers(
+        self, headers, allowed_content_types: Optional[List[str]] = None
+    ) -> str:
+        """
+        Reject disallowed content types and declared oversized bodies.
+
+        Args:
+                headers: Case-insensitive response headers.
+                allowed_content_types (Optional[List[str]]): Overrides the configured
+                        ``allowed_content_types``.
+
+        Returns:
+                str: The parameters of the Content-Type header (e.g. the charset).
+
+        Raises:
+                ValueError: If the content type is not allowed or the body is too large.
+        """
+        content_type = headers.get("Content-Type", "")
+        media_type, _, params = content_type.partition(";")
+        media_type = media_type.strip().lower()
+        if allowed_content_types is None:
+            allowed_content_types = self.allowed_content_types
+        if (
+            media_type
+            and allowed_content_types
+            and media_type not in allowed_content_types
+        ):
+            raise ValueError(f"Unsupported content type: {media_type}")
+
+        content_length = headers.get("Content-Length")
+        if content_length and int(content_length) > self.max_content_bytes:
+            raise ValueError(
+                f"Content length {content_length} exceeds {self.max_content_bytes} bytes"
+            )
+        return params
+
+    def _check_body_size(self, total: int) -> int:
+        """
+        Abort the download once the running byte count exceeds max_content_bytes.
+        """
+        if total > self.max_content_bytes:
+            raise ValueError(
+                f"Response body exceeds {self.max_content_bytes} bytes, aborted"
+            )
+        return total
+
+    def _decode_body(self, body: bytes, params: str) -> str:
+        """
+        Decode a body with its declared charset, detecting it only as a fallback.
+        """
+        encoding = self._declared_charset(params) or self._meta_charset(body)
+        if encoding is None:
+            detected = requests.compat.chardet.detect(body[: self.chunk_size])
+            encoding = detected.get("encoding") or "utf-8"
+
+        try:
+            return body.decode(encoding, errors="replace")
+        except LookupError:
+            return body.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _declared_charset(params: str) -> Optional[str]:
+        """
+        Get the charset parameter of a Content-Type header, if any.
+        """
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "charset" and value.strip():
+                return value.strip().strip("\"'")
+        return None
+
+    @staticmethod
+    def _meta_charset(body: bytes) -> Optional[str]:
+        """
+        Get the charset declared by a <meta> tag in the head of the document, if any.
+        """
+        match = META_CHARSET_PATTERN.search(body[:4096])
+        return match.group(1).decode("ascii") if match else None
+
+    def extract_many(
+        self, urls: List[str], max_workers: Optional[int] = None
+    ) -> List[ExtractionResult]:
+        """
+        Fetch and extract a list of websites concurrently.
+
+        A failing URL does not abort the batch; its error is reported in the
+        corresponding result instead.
+
+        Args:
+                urls (List[str]): Website URLs.
+                max_workers (Optional[int]): Maximum number of concurrent fetches.
+                        Defaults to the ``max_workers`` value from config.
+
+        Returns:
+                List[ExtractionResult]: One result per URL, in input order.
+        """
+        return run_concurrently(
+            self.extract_content, urls, max_workers or self.max_workers
+        )
+
+    def extract_text(self, page: str) -> str:
+        """
+        Extract clean text content from an HTML document.
+
+        Args:
+                page (str): Raw HTML.
+
+        Returns:
+                str: Extracted clean text content.
+        """
+        if self.parser == "selectolax":
+            raw_text = self._extract_raw_text_selectolax(page)
+        else:
+            # Parse the page content with BeautifulSoup
+            soup = BeautifulSoup(page, self.parser)
+
+            # Remove unwanted elements
+            self.remove_unwanted_elements(soup)
+
+            if self.main_content:
+                raw_text = self._extract_main_text_soup(soup)
+            else:
+                raw_text = _soup_text(soup)  # Get all text content
+
+        # Clean the text content
+        return self.clean_content(raw_text)
+
+    def _extract_raw_text_selectolax(self, page: str) -> str:
+        """
+        Remove unwanted elements and extract the raw text with selectolax.
+
+        Args:
+                page (str): Raw HTML.
+
+        Returns:
+                str: Raw text content, block elements separated by newlines.
+        """
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(page)
+        if tree.root is None:
+            return ""
+        tree.strip_tags(self.unwanted_tags)
+        if not self.main_content or tree.body is None:
+            return _lexbor_text(tree.root)
+
+        node, discounted = main_content.select_main_content(
+            tree.body,
+            lambda node: node.iter(include_text=True),
+            _describe_lexbor_node,
+            self.main_content_min_ratio,
+        )
+        for block in discounted:
+            block.decompose()
+        title = tree.css_first("head > title")
+        title_text = _lexbor_text(title) if title is not None else ""
+        return title_text + "\n" + _lexbor_text(node)
+
+    def _extract_main_text_soup(self, soup: BeautifulSoup) -> str:
+        """
+        Extract the raw text of the main content block and the document title.
+
+        Args:
+                soup (BeautifulSoup): Parsed document without unwanted elements.
+
+        Returns:
+                str: Raw text content, block elements separated by newlines.
+        """
+        if soup.body is None:
+            return _soup_text(soup)
+
+        node, discounted = main_content.select_main_content(
+            soup.body,
+            lambda node: node.contents,
+            _describe_soup_node,
+            self.main_content_min_ratio,
+        )
+        for block in discounted:
+            block.decompose()
+        title = soup.head.title if soup.head is not None else None
+        title_text = _soup_text(title) if title is not None else ""
+        return title_text + "\n" + _soup_text(node)
+
     def normalize_url(self, url: str) -> str:
         """
         Normalize the given URL by adding scheme if missing and ensuring it's a valid URL.
@@ -110,8 +844,9 @@ class WebsiteExtractor:
         Args:
                 soup (BeautifulSoup): The BeautifulSoup object to clean.
         """
-        for tag in self.unwanted_tags:
-            for element in soup.find_all(tag):
+        # 一次遍历找出所有待删除的标签
+        for element in soup.find_all(self.unwanted_tags):
+            if not element.decomposed:
                 element.decompose()
 
     def clean_content(self, content: str) -> str:
@@ -128,11 +863,11 @@ class WebsiteExtractor:
         # Decode HTML entities
         cleaned_content = html.unescape(content)
 
-        # Remove extra whitespace
-        cleaned_content = re.sub(r"\s+", " ", cleaned_content)
+        # Remove extra whitespace, keeping one paragraph per line
+        cleaned_content = re.sub(r"[^\S\n]+", " ", cleaned_content)
 
-        # Remove extra newlines
-        cleaned_content = re.sub(r"\n{3,}", "\n\n", cleaned_content)
+        # Remove empty lines
+        cleaned_content = re.sub(r"\s*\n\s*", "\n", cleaned_content)
 
         # Apply custom cleaning patterns from config
         for pattern in self.remove_patterns:
@@ -141,6 +876,35 @@ class WebsiteExtractor:
         return cleaned_content.strip()
 
 
+def _describe_soup_node(node) -> Optional[main_content.NodeDescription]:
+    if isinstance(node, Tag):
+        hints = " ".join(node.get("class", [])) + " " + node.get("id", "")
+        return main_content.ELEMENT, node.name, hints, ""
+    if isinstance(node, NavigableString) and not isinstance(node, PreformattedString):
+        return main_content.TEXT, "", "", str(node)
+    return None
+
+
+def _soup_text(node) -> str:
+    return main_content.block_text(node, lambda node: node.contents, _describe_soup_node)
+
+
+def _lexbor_text(node) -> str:
+    return main_content.block_text(
+        node, lambda node: node.iter(include_text=True), _describe_lexbor_node
+    )
+
+
+def _describe_lexbor_node(node) -> Optional[main_content.NodeDescription]:
+    if node.tag == "-text":
+        return main_content.TEXT, "", "", node.text(deep=False)
+    if node.tag.startswith(("-", "_", "!")):
+        return None
+    attributes = node.attributes
+    hints = f"{attributes.get('class') or ''} {attributes.get('id') or ''}"
+    return main_content.ELEMENT, node.tag, hints, ""
+
+
 def main(seed: int = 42) -> None:
     """
     Main function to test the WebsiteExtractor class.
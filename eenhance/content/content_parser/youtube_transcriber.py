@@ -3,35 +3,145 @@ YouTube Transcriber Module
 
 This module is responsible for extracting and cleaning transcripts from YouTube videos.
 It uses the YouTube Transcript API to fetch transcripts and provides functionality
-to clean and format the extracted text.
+to clean and format the extracted text. Transcripts are cached on disk by video id
+and language, and lists of videos or whole playlists can be fetched concurrently.
 """
 
 from youtube_transcript_api import YouTubeTranscriptApi
 import logging
+import re
+from typing import TYPE_CHECKING, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
 from eenhance.utils.config import load_config
+from eenhance.constants import CACHE_ROOT_PATH
+from .extraction_cache import ExtractionCache
+from .schemas import ExtractionResult, run_concurrently
 import os
 
+if TYPE_CHECKING:
+    from .website_extractor import WebsiteExtractor
+
 logger = logging.getLogger(__name__)
 
+PLAYLIST_PAGE_URL = "https://www.youtube.com/playlist"
+# 播放列表后续分页的接口, 每页约100个视频
+PLAYLIST_BROWSE_URL = "https://www.youtube.com/youtubei/v1/browse"
+
+# YouTube 视频ID由11位字母、数字、"-"和"_"组成
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+# youtu.be/ID, /shorts/ID, /embed/ID, /live/ID, /v/ID
+VIDEO_PATH_PATTERN = re.compile(
+    r"^/(?:shorts/|embed/|live/|v/)?([A-Za-z0-9_-]{11})(?:[/?#]|$)"
+)
+# 播放列表页面和分页接口响应中的视频ID
+PLAYLIST_VIDEO_PATTERN = re.compile(r'"videoId":\s*"([A-Za-z0-9_-]{11})"')
+# 下一页的 continuation token
+PLAYLIST_CONTINUATION_PATTERN = re.compile(
+    r'"continuationCommand":\s*\{\s*"token":\s*"([^"]+)"'
+)
+# 页面中分页接口所需的 API key 和客户端版本
+INNERTUBE_API_KEY_PATTERN = re.compile(r'"INNERTUBE_API_KEY":\s*"([^"]+)"')
+INNERTUBE_CLIENT_VERSION_PATTERN = re.compile(
+    r'"INNERTUBE_CONTEXT_CLIENT_VERSION":\s*"([^"]+)"'
+)
+
 
 class YouTubeTranscriber:
-    def __init__(self):
+    def __init__(self, website_extractor: Optional["WebsiteExtractor"] = None):
+        """
+        Initialize the YouTubeTranscriber.
+
+        Args:
+                website_extractor (Optional[WebsiteExtractor]): Extractor whose session and
+                        rate limiter are used to resolve playlists; created on first
+                        use if not given.
+        """
         self.config = load_config()
         self.youtube_transcriber_config = self.config.get("youtube_transcriber")
+        self.languages = self.youtube_transcriber_config.get("languages", ["en"])
+        self.max_workers = self.youtube_transcriber_config.get("max_workers", 4)
+        self.max_playlist_pages = self.youtube_transcriber_config.get(
+            "max_playlist_pages", 20
+        )
+        self.cache = self._create_cache()
+        self.website_extractor = website_extractor
+
+    def _create_cache(self) -> Optional[ExtractionCache]:
+        """
+        Create the on-disk transcript cache from config.
+
+        Returns:
+                Optional[ExtractionCache]: The cache, or None if caching is disabled.
+        """
+        cache_config = self.youtube_transcriber_config.get("cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+
+        return ExtractionCache(
+            cache_dir=CACHE_ROOT_PATH / cache_config.get("dir", "youtube"),
+            max_size_bytes=int(cache_config.get("max_size_mb", 100) * 1024 * 1024),
+        )
+
+    @staticmethod
+    def extract_video_id(url: str) -> str:
+        """
+        Extract the video id from a YouTube URL or a bare video id.
 
-    def extract_transcript(self, url: str) -> str:
+        Supports watch, youtu.be, shorts, embed, live and mobile URLs.
+
+        Args:
+                url (str): YouTube video URL or id.
+
+        Returns:
+                str: The 11-character video id.
+
+        Raises:
+                ValueError: If no video id can be found.
+        """
+        url = url.strip()
+        if VIDEO_ID_PATTERN.match(url):
+            return url
+
+        if not url.startswith(("http://", "https://")):
+            url = "https://" + url
+        parsed = urlparse(url)
+
+        video_ids = parse_qs(parsed.query).get("v")
+        if video_ids and VIDEO_ID_PATTERN.match(video_ids[0]):
+            return video_ids[0]
+
+        match = VIDEO_PATH_PATTERN.match(parsed.path)
+        if match:
+            return match.group(1)
+
+        raise ValueError(f"Invalid YouTube video URL: {url}")
+
+    def extract_transcript(self, url: str, languages: Optional[List[str]] = None) -> str:
         """
         Extract transcript from a YouTube video and remove '[music]' tags (case-insensitive).
 
         Args:
                 url (str): YouTube video URL.
+                languages (Optional[List[str]]): Preferred transcript languages in
+                        priority order. Defaults to the ``languages`` value from config.
 
         Returns:
                 str: Cleaned and extracted transcript.
         """
         try:
-            video_id = url.split("v=")[-1]
-            transcript = YouTubeTranscriptApi.get_transcript(video_id)
+            video_id = self.extract_video_id(url)
+            languages = languages or self.languages
+            key = f"youtube:{video_id}:{','.join(languages)}"
+
+            if self.cache is not None:
+                entry = self.cache.get(key)
+                if entry is not None:
+                    logger.info(f"Transcript cache hit for {video_id}")
+                    return entry["content"]
+
+            transcript = YouTubeTranscriptApi.get_transcript(
+                video_id, languages=languages
+            )
             cleaned_transcript = " ".join(
                 [
                     entry["text"]
@@ -40,11 +150,118 @@ class YouTubeTranscriber:
                     not in self.youtube_transcriber_config["remove_phrases"]
                 ]
             )
+
+            if self.cache is not None:
+                self.cache.put(key, cleaned_transcript)
             return cleaned_transcript
         except Exception as e:
             logger.error(f"Error extracting YouTube transcript: {str(e)}")
             raise
 
+    def extract_many(
+        self, urls: List[str], max_workers: Optional[int] = None
+    ) -> List[ExtractionResult]:
+        """
+        Fetch the transcripts of a list of videos concurrently.
+
+        Args:
+                urls (List[str]): YouTube video URLs or ids.
+                max_workers (Optional[int]): Maximum number of concurrent fetches.
+                        Defaults to the ``max_workers`` value from config.
+
+        Returns:
+                List[ExtractionResult]: One result per video, in input order.
+        """
+        return run_concurrently(
+            self.extract_transcript, urls, max_workers or self.max_workers
+        )
+
+    def resolve_playlist(self, url: str) -> List[str]:
+        """
+        Resolve a playlist URL to the ids of its videos, in playlist order.
+
+        The playlist page lists the first videos only; the rest are requested page
+        by page from the continuation endpoint, up to ``max_playlist_pages`` pages.
+        Requests go through the website extractor's session and rate limiter.
+
+        Args:
+                url (str): YouTube playlist URL (containing a ``list`` parameter).
+
+        Returns:
+                List[str]: Video ids, without duplicates.
+
+        Raises:
+                ValueError: If the URL has no playlist id.
+        """
+        playlist_ids = parse_qs(urlparse(url).query).get("list")
+        if not playlist_ids:
+            raise ValueError(f"Invalid YouTube playlist URL: {url}")
+
+        if self.website_extractor is None:
+            from .website_extractor import WebsiteExtractor
+
+            self.website_extractor = WebsiteExtractor()
+
+        page = self.website_extractor.fetch_if_modified(
+            f"{PLAYLIST_PAGE_URL}?{urlencode({'list': playlist_ids[0], 'hl': 'en'})}"
+        )["body"]
+        video_ids = dict.fromkeys(PLAYLIST_VIDEO_PATTERN.findall(page))
+        api_key = INNERTUBE_API_KEY_PATTERN.search(page)
+        client_version = INNERTUBE_CLIENT_VERSION_PATTERN.search(page)
+        browse_url = PLAYLIST_BROWSE_URL
+        if api_key:
+            browse_url += f"?{urlencode({'key': api_key.group(1)})}"
+
+        body = page
+        for _ in range(self.max_playlist_pages):
+            tokens = PLAYLIST_CONTINUATION_PATTERN.findall(body)
+            if not tokens:
+                return list(video_ids)
+            body = self.website_extractor.post_json(
+                browse_url,
+                {
+                    "context": {
+                        "client": {
+                            "clientName": "WEB",
+                            "clientVersion": (
+                                client_version.group(1)
+                                if client_version
+                                else "2.20240101.00.00"
+                            ),
+                            "hl": "en",
+                        }
+                    },
+                    # 下一页的入口位于列表末尾
+                    "continuation": tokens[-1],
+                },
+                allowed_content_types=["application/json"],
+            )
+            video_ids.update(dict.fromkeys(PLAYLIST_VIDEO_PATTERN.findall(body)))
+
+        if PLAYLIST_CONTINUATION_PATTERN.search(body):
+            logger.warning(
+                f"Playlist {url} is truncated to its first {len(video_ids)} videos "
+                f"after {self.max_playlist_pages} continuation pages"
+            )
+        return list(video_ids)
+
+    def extract_playlist(
+        self, url: str, max_workers: Optional[int] = None
+    ) -> List[ExtractionResult]:
+        """
+        Fetch the transcripts of every video of a playlist concurrently.
+
+        Args:
+                url (str): YouTube playlist URL.
+                max_workers (Optional[int]): Maximum number of concurrent fetches.
+
+        Returns:
+                List[ExtractionResult]: One result per video, in playlist order.
+        """
+        video_ids = self.resolve_playlist(url)
+        logger.info(f"Resolved {len(video_ids)} videos from playlist {url}")
+        return self.extract_many(video_ids, max_workers=max_workers)
+
 
 def main(seed: int = 42) -> None:
     """
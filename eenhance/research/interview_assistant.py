@@ -17,6 +17,9 @@ config = load_config()
 
 llm = llm_factory.create_llm(use_case="research", temperature=0)
 
+# 提示词按 "固定指令在前, 可变内容在后" 组织, 使重复调用共享尽量长的前缀,
+# 命中模型提供方的前缀缓存
+
 # Generate analyst question
 question_instructions = """你是一名分析师,负责采访专家以了解特定主题。
 
@@ -24,11 +27,12 @@ question_instructions = """你是一名分析师,负责采访专家以了解特
 
 1. 有趣:人们会觉得令人惊讶或不明显的见解。
 2. 具体:避免泛泛而谈,包含来自专家的具体例子。
-以下是你的关注主题和目标: {goals}
 首先用适合你角色的名字介绍自己,然后提出你的问题。
 继续提问以深入了解和完善你对主题的理解。
 当你对理解感到满意时,以"非常感谢你的帮助!"结束采访。
-记住在整个回答过程中保持角色特征,反映提供给你的角色和目标。"""
+记住在整个回答过程中保持角色特征,反映提供给你的角色和目标。
+
+以下是你的关注主题和目标: {goals}"""
 
 
 def generate_question(state: InterviewState):
@@ -125,13 +129,9 @@ def search_wikipedia(state: InterviewState):
 # Generate expert answer
 answer_instructions = """你是一位正在接受分析师采访的专家。
 
-以下是分析师的关注领域: {goals}。
-
 你的目标是回答采访者提出的问题。
 
-要回答问题,请使用以下背景资料:
-
-{context}
+要回答问题,请使用下方的背景资料。
 
 回答问题时,请遵循以下准则:
 
@@ -149,7 +149,13 @@ answer_instructions = """你是一位正在接受分析师采访的专家。
 
 [1] assistant/docs/llama3_1.pdf, 第7页
 
-在引用时省略方括号以及Document source前缀。"""
+在引用时省略方括号以及Document source前缀。
+
+以下是分析师的关注领域: {goals}。
+
+背景资料:
+
+{context}"""
 
 
 def generate_answer(state: InterviewState):
@@ -161,7 +167,10 @@ def generate_answer(state: InterviewState):
     context = state["context"]
 
     # Answer question
-    system_message = answer_instructions.format(goals=analyst.persona, context=context)
+    # 背景资料逐轮追加, 按顺序拼接可使上一轮的资料成为本轮提示词的前缀
+    system_message = answer_instructions.format(
+        goals=analyst.persona, context="\n\n".join(context)
+    )
     answer = llm.invoke([SystemMessage(content=system_message)] + messages)
 
     # Name the message as coming from the expert
@@ -226,8 +235,7 @@ a. 标题(##标题)
 b. 摘要(###标题)
 c. 来源(###标题)
 
-4. 根据分析师的关注领域制作引人入胜的标题:
-{focus}
+4. 根据下方分析师的关注领域制作引人入胜的标题
 
 5. 对于摘要部分:
 - 用与分析师关注领域相关的一般背景/上下文设置摘要
@@ -259,7 +267,10 @@ c. 来源(###标题)
 8. 最终审查:
 - 确保报告遵循所需结构
 - 在报告标题之前不包含任何前言
-- 检查是否遵循了所有准则"""
+- 检查是否遵循了所有准则
+
+分析师的关注领域:
+{focus}"""
 
 
 def write_section(state: InterviewState):
@@ -274,7 +285,11 @@ def write_section(state: InterviewState):
     system_message = section_writer_instructions.format(focus=analyst.description)
     section = llm.invoke(
         [SystemMessage(content=system_message)]
-        + [HumanMessage(content=f"使用这些来源撰写你的章节: {context}")]
+        + [
+            HumanMessage(
+                content="使用这些来源撰写你的章节:\n\n" + "\n\n".join(context)
+            )
+        ]
     )
 
     # Append it to state
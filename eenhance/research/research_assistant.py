@@ -100,9 +100,7 @@ def initiate_all_interviews(state: ResearchGraphState):
 
 
 # Write a report based on the interviews
-report_writer_instructions = """你是一位技术写作者,正在撰写关于以下总体主题的报告:
-
-{topic}
+report_writer_instructions = """你是一位技术写作者,正在撰写关于下方总体主题的报告。
 
 你有一个分析师团队。每个分析师做了两件事:
 
@@ -130,6 +128,10 @@ report_writer_instructions = """你是一位技术写作者,正在撰写关于
 [1] 来源1
 [2] 来源2
 
+报告的总体主题:
+
+{topic}
+
 以下是你的分析师的备忘录,用于构建你的报告:
 
 {context}"""
@@ -157,7 +159,7 @@ def write_report(state: ResearchGraphState):
 
 
 # Write the introduction or conclusion
-intro_conclusion_instructions = """你是一位正在完成关于{topic}的报告的技术写作者。
+intro_conclusion_instructions = """你是一位正在完成一份报告的技术写作者。
 
 你将获得报告的所有章节。
 
@@ -177,6 +179,8 @@ intro_conclusion_instructions = """你是一位正在完成关于{topic}的报
 
 对于结论,使用## 结论作为章节标题。
 
+报告的主题: {topic}
+
 以下是用于写作的章节: {formatted_str_sections}"""
 
 
@@ -2,16 +2,55 @@
 生成研究主题助手
 """
 
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Callable
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import StreamWriter
 import logging
 from langchain.prompts import PromptTemplate
 from eenhance.utils.llm import llm_factory
-from langchain.output_parsers import CommaSeparatedListOutputParser
+from eenhance.utils.config import load_config
+from eenhance.utils.compressor import ExtractiveCompressor
+from eenhance.utils.diversity import DiversitySelector
+from eenhance.utils.tokens import estimate_tokens
+from eenhance.constants import CACHE_ROOT_PATH
+from eenhance.content.content_parser.extraction_cache import ExtractionCache
 
 logger = logging.getLogger(__name__)
 
+config = load_config()
+compression_config = config.get("topic", {}).get("compression", {})
+cache_config = config.get("topic", {}).get("cache", {})
+diversity_config = config.get("topic", {}).get("diversity", {})
+
+TOPIC_TEMPERATURE = 0.7
+TOPIC_COUNT = 3
+
+# 主题之间的分隔符, 以及主题前的序号和列表标记
+TOPIC_SEPARATOR_PATTERN = re.compile(r"[,，\n]")
+TOPIC_PREFIX_PATTERN = re.compile(r"^(?:\d+\s*[.、)）]|[-*•])\s*")
+
+# 生成研究主题的提示模板, 修改后缓存的主题自动失效
+TOPIC_TEMPLATE = """基于以下内容和补充信息，生成{topic_count}个具体且有深度的研究主题：
+
+主要内容：{content}
+
+{additional_info_prompt}
+
+要求：
+1. 每个主题应该明确且具有研究价值
+2. 主题应该相互独立，覆盖不同的研究角度
+3. 确保主题与输入内容密切相关
+4. 考虑补充信息提供的具体要求或限制
+
+请生成{topic_count}个研究主题，用逗号分隔。
+"""
+
 
 # 研究主题助手的输入参数
 class TopicInput(TypedDict):
@@ -19,11 +58,16 @@ class TopicInput(TypedDict):
     additional_info: str | None  # 用户提供的额外信息
     selected_topic: str | None  # 用户选择的主题
     regenerate: bool  # 是否需要重新生成主题
+    topics: list[str] | None  # 已生成的主题, 存在时 regenerate 会跳过缓存重新调用LLM
+    topic_candidates: list[str] | None  # 尚未展示的候选主题, 按多样性排序
+    topic_candidates_key: str | None  # 候选主题对应的内容和额外信息的缓存键
 
 
 # 研究主题助手的输出参数
 class TopicOutput(TypedDict):
     topics: list[str]  # 生成的研究主题列表
+    topic_candidates: list[str]  # 尚未展示的候选主题, 重新生成时优先使用
+    topic_candidates_key: str | None  # 候选主题对应的内容和额外信息的缓存键
     selected_topic: str | None  # 最终选定的主题
     error: str | None
 
@@ -32,59 +76,237 @@ def human_feedback(state: TopicInput):
     pass
 
 
-def generate_topics(state: TopicInput) -> TopicOutput:
+def compress_content(content: str) -> str:
+    """按配置的 token 预算对内容做抽取式压缩, 未启用时原样返回"""
+    if not compression_config.get("enabled", False):
+        return content
+    compressor = ExtractiveCompressor(
+        method=compression_config.get("method", "textrank")
+    )
+    return compressor.compress(content, compression_config.get("max_tokens", 6000))
+
+
+class TopicListParser:
+    """增量解析逗号或换行分隔的主题列表, 每个主题完整后立即返回"""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """追加一段流式输出, 返回其中新完成的主题"""
+        self._buffer += text
+        *completed, self._buffer = TOPIC_SEPARATOR_PATTERN.split(self._buffer)
+        return [topic for topic in map(self._clean, completed) if topic]
+
+    def close(self) -> list[str]:
+        """输出结束, 返回最后一个主题"""
+        topic = self._clean(self._buffer)
+        self._buffer = ""
+        return [topic] if topic else []
+
+    @staticmethod
+    def _clean(topic: str) -> str:
+        topic = TOPIC_PREFIX_PATTERN.sub("", topic.strip())
+        topic = topic.strip().strip("\"'“”‘’「」*").strip()
+        # 跳过 "以下是3个研究主题：" 之类的引导语
+        if topic.endswith((":", "：")):
+            return ""
+        return topic
+
+
+def request_topics(
+    content: str,
+    additional_info: str | None,
+    on_topic: Callable[[str], None] | None = None,
+    count: int = TOPIC_COUNT,
+) -> list[str]:
+    """调用LLM基于内容流式生成 count 个研究主题, 每解析出一个主题就回调 on_topic"""
+    # 处理额外信息
+    additional_info_prompt = (
+        f"补充信息：{additional_info}" if additional_info else "补充信息：无"
+    )
+
+    # 创建prompt
+    prompt = PromptTemplate(
+        template=TOPIC_TEMPLATE,
+        input_variables=["content", "additional_info_prompt", "topic_count"],
+    )
+
+    # 初始化LLM
+    llm = llm_factory.create_llm(use_case="topic", temperature=TOPIC_TEMPERATURE)
+
+    # 生成主题
+    _input = prompt.format(
+        content=content,
+        additional_info_prompt=additional_info_prompt,
+        topic_count=count,
+    )
+    parser = TopicListParser()
+    topics = []
+    stream = llm.stream(_input)
     try:
+        for chunk in stream:
+            for topic in parser.feed(chunk.content):
+                topics.append(topic)
+                if on_topic is not None:
+                    on_topic(topic)
+            if len(topics) >= count:
+                # 已得到足够的主题, 提前结束生成
+                break
+        else:
+            for topic in parser.close():
+                topics.append(topic)
+                if on_topic is not None:
+                    on_topic(topic)
+    finally:
+        stream.close()
+    return topics
 
-        # 创建输出解析器
-        output_parser = CommaSeparatedListOutputParser()
 
-        # 定义提示模板
-        template = """基于以下内容和补充信息，生成3个具体且有深度的研究主题：
+def candidate_count() -> int:
+    """一次LLM调用生成的候选主题数, 未启用多样性选择时即 TOPIC_COUNT"""
+    if not diversity_config.get("enabled", False):
+        return TOPIC_COUNT
+    return max(diversity_config.get("candidates", 9), TOPIC_COUNT)
 
-主要内容：{content}
 
-{additional_info_prompt}
+def rank_topics(topics: list[str], reference: str) -> list[str]:
+    """按 MMR 对候选主题排序, 使前几个主题既贴合内容又彼此不同"""
+    if not diversity_config.get("enabled", False) or len(topics) <= TOPIC_COUNT:
+        return topics
+    # 去重后再排序, LLM 偶尔会重复输出同一个主题
+    topics = list(dict.fromkeys(topics))
+    selector = DiversitySelector(
+        relevance_weight=diversity_config.get("relevance_weight", 0.7)
+    )
+    return [topics[i] for i in selector.rank(topics, reference)]
 
-要求：
-1. 每个主题应该明确且具有研究价值
-2. 主题应该相互独立，覆盖不同的研究角度
-3. 确保主题与输入内容密切相关
-4. 考虑补充信息提供的具体要求或限制
 
-请生成3个研究主题，用逗号分隔。
-"""
+@lru_cache(maxsize=None)
+def get_topic_cache() -> ExtractionCache | None:
+    """按配置创建持久化的主题缓存, 未启用时返回 None"""
+    if not cache_config.get("enabled", False):
+        return None
+    return ExtractionCache(
+        cache_dir=CACHE_ROOT_PATH / cache_config.get("dir", "topic"),
+        max_size_bytes=int(cache_config.get("max_size_mb", 20) * 1024 * 1024),
+    )
 
-        # 处理额外信息
-        additional_info = state.get("additional_info")
-        additional_info_prompt = (
-            f"补充信息：{additional_info}" if additional_info else "补充信息：无"
-        )
 
-        # 创建prompt
-        prompt = PromptTemplate(
-            template=template,
-            input_variables=["content", "additional_info_prompt"],
-            output_parser=output_parser,
-        )
+def topic_cache_key(content: str, additional_info: str | None) -> str:
+    """主题缓存的键: 内容、额外信息、模型、温度、提示模板、压缩和多样性配置的哈希"""
+    payload = json.dumps(
+        [
+            content,
+            additional_info or "",
+            config.get("topic", {}).get("llm_model", "deepseek-chat"),
+            TOPIC_TEMPERATURE,
+            TOPIC_TEMPLATE,
+            compression_config,
+            diversity_config,
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return "topic:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-        # 初始化LLM
-        llm = llm_factory.create_llm(use_case="topic", temperature=0.7)
 
-        # 生成主题
-        _input = prompt.format(
-            content=state["out_content"], additional_info_prompt=additional_info_prompt
-        )
-        topics = llm.invoke(_input)
-        topics = output_parser.parse(topics.content)
+def generate_topics(
+    state: TopicInput, writer: StreamWriter = lambda _: None
+) -> TopicOutput:
+    """生成研究主题, 每个主题完成后通过 custom 流事件 {"topic", "index"} 立即发出
+
+    启用多样性选择时, 一次LLM调用生成多个候选主题, 每个候选完成后通过 custom 流事件
+    {"candidate", "index", "total"} 发出进度, 全部生成后按 MMR 选出前3个再逐个发出。
+    其余候选保存在 topic_candidates 中, 重新生成时直接展示而无需再次调用LLM;
+    不足一页(3个)的剩余候选排序最靠后, 直接舍弃。
+    """
+
+    def emit(topic: str) -> None:
+        if len(emitted) < TOPIC_COUNT:
+            emitted.append(topic)
+            writer({"topic": topic, "index": len(emitted)})
 
+    def emit_candidate(topic: str) -> None:
+        received.append(topic)
+        writer({"candidate": topic, "index": len(received), "total": count})
+
+    def output(ranked: list[str]) -> TopicOutput:
+        topics = ranked[:TOPIC_COUNT]
+        # 流式生成时已发出的主题不再重复发出
+        for topic in topics[len(emitted) :]:
+            emit(topic)
+        candidates = ranked[TOPIC_COUNT:]
         return TopicOutput(
-            topics=topics[:3],  # 确保只返回3个主题
+            topics=topics,
+            topic_candidates=candidates if len(candidates) >= TOPIC_COUNT else [],
+            topic_candidates_key=key,
             selected_topic=state.get("selected_topic"),
             error=None,
         )
+
+    emitted = []
+    received = []
+    try:
+        content = state["out_content"]
+        additional_info = state.get("additional_info")
+        key = topic_cache_key(content, additional_info)
+
+        # 重新生成且内容和额外信息未变时, 先展示剩余的候选主题
+        if (
+            state.get("topics")
+            and state.get("topic_candidates")
+            and state.get("topic_candidates_key") == key
+        ):
+            logger.info("Showing more topics from the remaining candidates")
+            return output(state["topic_candidates"])
+
+        # 已生成过主题时再次生成, 说明用户要求重新生成, 跳过缓存
+        cache = get_topic_cache()
+        if cache is not None and not state.get("topics"):
+            entry = cache.get(key)
+            if entry is not None:
+                logger.info("Topic cache hit")
+                return output(json.loads(entry["content"]))
+
+        # 压缩内容到 token 预算内, 避免长文档超出上下文窗口
+        compressed = compress_content(content)
+        count = candidate_count()
+        # 需要排序的候选主题要等全部生成后才能选出, 生成期间只发出进度
+        topics = request_topics(
+            compressed,
+            additional_info,
+            on_topic=emit if count == TOPIC_COUNT else emit_candidate,
+            count=count,
+        )
+
+        # 对比模式: 同时用未压缩的内容生成主题, 便于评估压缩对主题质量的影响
+        if compression_config.get("compare", False) and compressed != content:
+            uncompressed_topics = request_topics(content, additional_info, count=count)
+            logger.info(
+                f"Topics from compressed content (~{estimate_tokens(compressed)} "
+                f"tokens): {topics}"
+            )
+            logger.info(
+                f"Topics from uncompressed content (~{estimate_tokens(content)} "
+                f"tokens): {uncompressed_topics}"
+            )
+
+        ranked = rank_topics(
+            topics[:count], "\n".join(filter(None, [compressed, additional_info]))
+        )
+        if cache is not None and ranked:
+            cache.put(key, json.dumps(ranked, ensure_ascii=False))
+        return output(ranked)
     except Exception as e:
         logger.error(f"Error generating topics: {str(e)}")
-        return TopicOutput(topics=[], selected_topic=None, error=str(e))
+        return TopicOutput(
+            topics=[],
+            topic_candidates=[],
+            topic_candidates_key=None,
+            selected_topic=None,
+            error=str(e),
+        )
 
 
 def router(state: TopicInput):
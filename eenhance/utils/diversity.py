@@ -0,0 +1,79 @@
+"""
+Diversity Selection Module
+
+This module ranks candidate texts (e.g. generated topics) by Maximal Marginal
+Relevance: each pick maximizes relevance to a reference text minus similarity to
+the candidates already picked. Candidates are embedded with the same hashed TF-IDF
+vectors as the extractive compressor, so ranking runs locally in NumPy without
+any model or network call.
+"""
+
+from typing import List
+
+import numpy as np
+
+from eenhance.utils.compressor import ExtractiveCompressor
+
+
+class DiversitySelector:
+    def __init__(self, relevance_weight: float = 0.7, n_features: int = 1024):
+        """
+        Initialize the DiversitySelector.
+
+        Args:
+                relevance_weight (float): MMR trade-off; 1 ranks by relevance only,
+                        0 by novelty only.
+                n_features (int): Dimension of the hashed TF-IDF vectors.
+        """
+        if not 0 <= relevance_weight <= 1:
+            raise ValueError("relevance_weight must be between 0 and 1")
+        self.relevance_weight = relevance_weight
+        self.vectorizer = ExtractiveCompressor(n_features=n_features)
+
+    def rank(self, candidates: List[str], reference: str) -> List[int]:
+        """
+        Order candidates so that every prefix is relevant and mutually distinct.
+
+        Args:
+                candidates (List[str]): The candidate texts.
+                reference (str): Text the candidates should be relevant to.
+
+        Returns:
+                List[int]: Indices of all candidates in MMR order.
+        """
+        if not candidates:
+            return []
+
+        vectors = self.vectorizer.vectorize(candidates + [reference])
+        candidate_vectors, reference_vector = vectors[:-1], vectors[-1]
+        relevance = candidate_vectors @ reference_vector
+        similarity = candidate_vectors @ candidate_vectors.T
+
+        n = len(candidates)
+        ranked = []
+        remaining = np.ones(n, dtype=bool)
+        max_similarity = np.zeros(n, dtype=np.float32)
+        for _ in range(n):
+            scores = (
+                self.relevance_weight * relevance
+                - (1 - self.relevance_weight) * max_similarity
+            )
+            index = int(np.argmax(np.where(remaining, scores, -np.inf)))
+            ranked.append(index)
+            remaining[index] = False
+            max_similarity = np.maximum(max_similarity, similarity[:, index])
+        return ranked
+
+    def select(self, candidates: List[str], reference: str, k: int) -> List[str]:
+        """
+        Pick the k most relevant, mutually distinct candidates.
+
+        Args:
+                candidates (List[str]): The candidate texts.
+                reference (str): Text the candidates should be relevant to.
+                k (int): Number of candidates to pick.
+
+        Returns:
+                List[str]: The picked candidates in MMR order.
+        """
+        return [candidates[i] for i in self.rank(candidates, reference)[:k]]
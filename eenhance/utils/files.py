@@ -0,0 +1,32 @@
+"""
+File Helpers Module
+
+This module provides file writes shared by the on-disk caches and indexes.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write_text(path: str | Path, text: str) -> None:
+    """
+    Write a UTF-8 text file atomically.
+
+    The text goes to a temporary file in the same directory, which then replaces
+    the target, so concurrent readers and interrupted writes never see a
+    partially written file.
+
+    Args:
+            path (str | Path): The file to write.
+            text (str): The file content.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(tmp_path, path)
+    except Exception:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
@@ -2,10 +2,19 @@
 LLM配置模块
 
 该模块提供了统一的LLM配置管理,包括模型选择、参数设置等。
+相同参数的LLM实例会被复用, 所有实例共享同一个HTTP连接池、请求调度器、响应缓存
+和用量统计。
 """
 
+import threading
+from pathlib import Path
+import httpx
 from langchain_openai import ChatOpenAI
 from .config import load_config
+from .llm_cache import SQLiteResponseCache
+from .llm_scheduler import PRIORITIES, LLMScheduler, ScheduledTransport
+from .llm_metrics import LLMUsageTracker
+from eenhance.constants import CACHE_ROOT_PATH
 import os
 
 
@@ -14,6 +23,104 @@ class LLMFactory:
 
     def __init__(self):
         self.config = load_config()
+        self._llms = {}
+        self._transport = None
+        self._http_clients = {}
+        self._scheduler = None
+        self._response_cache = None
+        self._usage_tracker = None
+        self._lock = threading.Lock()
+
+    @property
+    def transport(self) -> httpx.HTTPTransport:
+        """
+        所有LLM实例共享的HTTP连接池, 首次使用时按 llm.http 配置创建
+
+        连接在请求之间保持活动, 避免每次调用重新建立TCP和TLS连接。
+        """
+        if self._transport is None:
+            http_config = self.config.get("llm", {}).get("http", {})
+            self._transport = httpx.HTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=http_config.get("max_connections", 20),
+                    max_keepalive_connections=http_config.get(
+                        "max_keepalive_connections", 10
+                    ),
+                    keepalive_expiry=http_config.get("keepalive_expiry", 60),
+                )
+            )
+        return self._transport
+
+    @property
+    def scheduler(self) -> LLMScheduler | None:
+        """
+        所有LLM请求共享的调度器, 未启用时返回None
+        """
+        scheduler_config = self.config.get("llm", {}).get("scheduler", {})
+        if self._scheduler is None and scheduler_config.get("enabled", False):
+            self._scheduler = LLMScheduler.from_config(scheduler_config)
+        return self._scheduler
+
+    def http_client(self, priority: int = PRIORITIES["default"]) -> httpx.Client:
+        """
+        获取指定优先级的HTTP客户端, 各优先级的客户端共享同一个连接池和调度器
+        """
+        client = self._http_clients.get(priority)
+        if client is None:
+            http_config = self.config.get("llm", {}).get("http", {})
+            transport = self.transport
+            if self.scheduler is not None:
+                transport = ScheduledTransport(transport, self.scheduler, priority)
+            client = httpx.Client(
+                transport=transport,
+                timeout=httpx.Timeout(
+                    http_config.get("timeout", 600),
+                    connect=http_config.get("connect_timeout", 10),
+                ),
+            )
+            self._http_clients[priority] = client
+        return client
+
+    @property
+    def response_cache(self) -> SQLiteResponseCache | None:
+        """
+        所有用例共享的持久化响应缓存, 未启用时返回None
+        """
+        cache_config = self.config.get("llm", {}).get("response_cache", {})
+        if self._response_cache is None and cache_config.get("enabled", False):
+            ttl_hours = cache_config.get("ttl_hours")
+            self._response_cache = SQLiteResponseCache(
+                CACHE_ROOT_PATH / cache_config.get("path", "llm/responses.sqlite3"),
+                ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+                max_entries=cache_config.get("max_entries", 5000),
+            )
+        return self._response_cache
+
+    @property
+    def usage_tracker(self) -> LLMUsageTracker | None:
+        """
+        记录所有LLM调用的token、延迟和费用的回调处理器, 未启用时返回None
+        """
+        metrics_config = self.config.get("llm", {}).get("metrics", {})
+        if self._usage_tracker is None and metrics_config.get("enabled", False):
+            self._usage_tracker = LLMUsageTracker(
+                pricing=metrics_config.get("pricing", {})
+            )
+        return self._usage_tracker
+
+    def export_metrics(self) -> Path | None:
+        """
+        导出本次运行的LLM调用度量(JSON 和 Prometheus 文本格式)
+
+        Returns:
+            Path | None: JSON文件的路径, 未启用或没有调用记录时返回None
+        """
+        if self._usage_tracker is None or not self._usage_tracker.records:
+            return None
+        metrics_config = self.config.get("llm", {}).get("metrics", {})
+        return self._usage_tracker.export(
+            CACHE_ROOT_PATH / metrics_config.get("export_dir", "metrics")
+        )
 
     def create_llm(
         self,
@@ -23,7 +130,7 @@ class LLMFactory:
         **kwargs
     ) -> ChatOpenAI:
         """
-        创建LLM实例的工厂方法
+        创建LLM实例的工厂方法, 相同参数返回同一个实例
 
         Args:
             use_case: 使用场景,如 'research', 'blog', 'topic' 等
@@ -54,7 +161,49 @@ class LLMFactory:
         if api_base_env:
             llm_params["base_url"] = os.getenv(api_base_env)
 
-        return ChatOpenAI(**llm_params)
+        # 参数中可能有不可哈希的值(如 model_kwargs), 用 repr 作为缓存键
+        key = (use_case, repr(sorted(llm_params.items())))
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                # 用例未配置 response_cache 时, 只缓存确定性(温度为0)的调用
+                cache = None
+                if use_case_config.get("response_cache", temperature == 0):
+                    cache = self.response_cache
+                if cache is not None:
+                    llm_params = {"cache": cache, **llm_params}
+                # 按图节点和会话记录用量, 流式调用也返回 token 用量
+                if self.usage_tracker is not None:
+                    llm_params = {
+                        "callbacks": [self.usage_tracker],
+                        "stream_usage": True,
+                        **llm_params,
+                    }
+                # 交互式用例(如主题生成)的请求先于后台用例放行
+                priority = PRIORITIES[use_case_config.get("priority", "default")]
+                # 调度器已对 429/503 退避重试, 关闭SDK自身的重试, 避免两层重试叠加
+                if self.scheduler is not None:
+                    llm_params = {"max_retries": 0, **llm_params}
+                llm = ChatOpenAI(
+                    **{"http_client": self.http_client(priority), **llm_params}
+                )
+                self._llms[key] = llm
+        return llm
+
+    def close(self) -> None:
+        """释放缓存的LLM实例并关闭共享的HTTP连接池和响应缓存"""
+        with self._lock:
+            self._llms.clear()
+            if self._response_cache is not None:
+                self._response_cache.close()
+                self._response_cache = None
+            for client in self._http_clients.values():
+                client.close()
+            self._http_clients.clear()
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+            self._scheduler = None
 
 
 # 创建全局单例
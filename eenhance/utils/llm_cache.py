@@ -0,0 +1,137 @@
+"""
+LLM响应缓存模块
+
+该模块提供基于SQLite的持久化LLM响应缓存, 作为 LangChain 的 BaseCache 挂载到
+LLM实例上。缓存键为模型及其参数(llm_string)和完整的消息列表(prompt)的哈希,
+条目在TTL后过期, 超出容量时淘汰最久未使用的条目。
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# 命中缓存时写入 generation_info 的标记, 度量模块据此不把命中计为API调用
+CACHE_HIT_KEY = "response_cache_hit"
+
+
+class SQLiteResponseCache(BaseCache):
+    """持久化的LLM响应缓存, 支持TTL、按容量的LRU淘汰以及命中统计"""
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl_seconds: Optional[float] = None,
+        max_entries: int = 5000,
+    ):
+        """
+        Args:
+            path: SQLite数据库文件路径
+            ttl_seconds: 条目的有效期, None表示永不过期
+            max_entries: 最多保留的条目数, 超出时淘汰最久未使用的条目
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 各节点可能在不同线程中调用LLM, 共享一个连接并由锁保护
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """查找缓存的响应, 未命中或已过期时返回None, 命中的响应带有 CACHE_HIT_KEY 标记"""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (
+                self.ttl_seconds is None or now - row[1] <= self.ttl_seconds
+            ):
+                self._conn.execute(
+                    "UPDATE responses SET used_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+                self.hits += 1
+                value = row[0]
+            else:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+        try:
+            generations = loads(value)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached LLM response: {str(e)}")
+            return None
+        for generation in generations:
+            generation.generation_info = {
+                **(generation.generation_info or {}),
+                CACHE_HIT_KEY: True,
+            }
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """写入响应, 超出容量时淘汰最久未使用的条目"""
+        # 空响应通常是出错或被截断, 不缓存
+        if not any(generation.text for generation in return_val):
+            return
+        value = dumps(list(return_val))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self._key(prompt, llm_string), value, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """清空缓存和命中统计"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """返回命中次数、未命中次数和当前条目数"""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
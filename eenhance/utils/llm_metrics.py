@@ -0,0 +1,291 @@
+"""
+LLM调用度量模块
+
+该模块提供一个 LangChain 回调处理器, 记录每次LLM调用的输入、输出和命中提供方缓存的
+token数、耗时、首个token的延迟以及估算费用, 并按图节点(langgraph_node)和会话
+(thread_id)标记。命中本地响应缓存的调用单独计数, 不计token和费用。汇总结果可导出为
+JSON或 Prometheus 文本格式。
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from .llm_cache import CACHE_HIT_KEY
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = "unknown"
+
+# 导出为 Prometheus 指标的汇总字段: (指标名, 字段, 类型, 说明)
+PROMETHEUS_METRICS = [
+    ("eenhance_llm_calls_total", "calls", "counter", "LLM calls"),
+    ("eenhance_llm_errors_total", "errors", "counter", "Failed LLM calls"),
+    (
+        "eenhance_llm_response_cache_hits_total",
+        "cache_hits",
+        "counter",
+        "LLM calls served from the local response cache",
+    ),
+    ("eenhance_llm_prompt_tokens_total", "prompt_tokens", "counter", "Prompt tokens"),
+    (
+        "eenhance_llm_completion_tokens_total",
+        "completion_tokens",
+        "counter",
+        "Completion tokens",
+    ),
+    (
+        "eenhance_llm_cached_tokens_total",
+        "cached_tokens",
+        "counter",
+        "Prompt tokens served from the provider's prefix cache",
+    ),
+    ("eenhance_llm_cost_usd_total", "cost", "counter", "Estimated cost in USD"),
+    (
+        "eenhance_llm_latency_seconds_total",
+        "latency",
+        "counter",
+        "Total latency of LLM calls",
+    ),
+    (
+        "eenhance_llm_time_to_first_token_seconds_total",
+        "time_to_first_token",
+        "counter",
+        "Total time to first token of streamed LLM calls",
+    ),
+]
+
+
+# 单次LLM调用的记录
+@dataclass
+class CallRecord:
+    node: str  # 图节点名称
+    thread_id: str  # 会话id
+    model: str  # 模型名称
+    prompt_tokens: int = 0  # 输入token数, 包含命中缓存的部分
+    completion_tokens: int = 0  # 输出token数
+    cached_tokens: int = 0  # 命中提供方前缀缓存的输入token数
+    latency: float = 0.0  # 从开始到结束的秒数
+    time_to_first_token: Optional[float] = None  # 流式调用收到首个token的秒数
+    cost: float = 0.0  # 估算费用(美元)
+    cache_hit: bool = False  # 是否命中本地响应缓存, 命中时没有发出API请求
+    error: Optional[str] = None
+
+
+def _usage(response: LLMResult) -> Dict[str, int]:
+    """从响应中读取token用量, 兼容 usage_metadata 和 DeepSeek 的 token_usage 字段"""
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            metadata = getattr(message, "usage_metadata", None)
+            if metadata:
+                usage["prompt_tokens"] += metadata.get("input_tokens", 0)
+                usage["completion_tokens"] += metadata.get("output_tokens", 0)
+                usage["cached_tokens"] += (
+                    metadata.get("input_token_details") or {}
+                ).get("cache_read", 0) or 0
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    if not usage["prompt_tokens"] and token_usage:
+        usage["prompt_tokens"] = token_usage.get("prompt_tokens", 0)
+        usage["completion_tokens"] = token_usage.get("completion_tokens", 0)
+    if not usage["cached_tokens"]:
+        usage["cached_tokens"] = token_usage.get("prompt_cache_hit_tokens", 0) or 0
+    return usage
+
+
+def _is_cache_hit(response: LLMResult) -> bool:
+    """响应是否来自本地响应缓存"""
+    generations = [
+        generation for generations in response.generations for generation in generations
+    ]
+    return bool(generations) and all(
+        (generation.generation_info or {}).get(CACHE_HIT_KEY) for generation in generations
+    )
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LLMUsageTracker(BaseCallbackHandler):
+    """记录每次LLM调用的token用量、延迟和费用"""
+
+    def __init__(self, pricing: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Args:
+            pricing: 模型名称 -> 每百万token的价格(美元), 包含 input、cached_input 和
+                output, 未列出的模型费用记为0
+        """
+        self.pricing = pricing or {}
+        self.records: List[CallRecord] = []
+        self._running: Dict[UUID, tuple[CallRecord, float]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        invocation_params: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        record = CallRecord(
+            node=metadata.get("langgraph_node") or UNKNOWN,
+            thread_id=str(metadata.get("thread_id") or UNKNOWN),
+            model=(invocation_params or {}).get("model")
+            or metadata.get("ls_model_name")
+            or UNKNOWN,
+        )
+        with self._lock:
+            self._running[run_id] = (record, time.monotonic())
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            running = self._running.get(run_id)
+            if running is not None and running[0].time_to_first_token is None:
+                running[0].time_to_first_token = time.monotonic() - running[1]
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            running = self._running.pop(run_id, None)
+        if running is None:
+            return
+        record, started_at = running
+        record.latency = time.monotonic() - started_at
+        if _is_cache_hit(response):
+            # 缓存的响应保留了原始调用的用量, 不能再次计入token和费用
+            record.cache_hit = True
+            logger.info(f"LLM call in {record.node} served from the response cache")
+            with self._lock:
+                self.records.append(record)
+            return
+        usage = _usage(response)
+        record.prompt_tokens = usage["prompt_tokens"]
+        record.completion_tokens = usage["completion_tokens"]
+        record.cached_tokens = usage["cached_tokens"]
+        record.cost = self.cost(record)
+        # 命中前缀缓存的token数来自API返回的用量字段, 用于检查提示词布局是否有效
+        logger.info(
+            f"LLM call in {record.node}: {record.prompt_tokens} prompt tokens "
+            f"({record.cached_tokens} cached), {record.completion_tokens} completion "
+            f"tokens, {record.latency:.2f}s"
+        )
+        with self._lock:
+            self.records.append(record)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            running = self._running.pop(run_id, None)
+        if running is None:
+            return
+        record, started_at = running
+        record.latency = time.monotonic() - started_at
+        record.error = str(error)
+        with self._lock:
+            self.records.append(record)
+
+    def cost(self, record: CallRecord) -> float:
+        """按价格表估算一次调用的费用"""
+        price = self.pricing.get(record.model)
+        if not price:
+            return 0.0
+        uncached = record.prompt_tokens - record.cached_tokens
+        return (
+            uncached * price.get("input", 0)
+            + record.cached_tokens * price.get("cached_input", price.get("input", 0))
+            + record.completion_tokens * price.get("output", 0)
+        ) / 1_000_000
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        按 (thread_id, 节点, 模型) 汇总调用记录
+
+        Returns:
+            List[Dict[str, Any]]: 每组的调用次数、错误次数、缓存命中次数、token数、
+                费用和延迟之和,
+                按费用从高到低排序
+        """
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            key = (record.thread_id, record.node, record.model)
+            group = groups.setdefault(
+                key,
+                {
+                    "thread_id": record.thread_id,
+                    "node": record.node,
+                    "model": record.model,
+                    "calls": 0,
+                    "errors": 0,
+                    "cache_hits": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cached_tokens": 0,
+                    "cost": 0.0,
+                    "latency": 0.0,
+                    "time_to_first_token": 0.0,
+                },
+            )
+            group["calls"] += 1
+            group["errors"] += record.error is not None
+            group["cache_hits"] += record.cache_hit
+            for field in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+                group[field] += getattr(record, field)
+            group["cost"] += record.cost
+            group["latency"] += record.latency
+            group["time_to_first_token"] += record.time_to_first_token or 0.0
+        return sorted(groups.values(), key=lambda group: -group["cost"])
+
+    def to_json(self) -> str:
+        """导出汇总和每次调用的记录"""
+        with self._lock:
+            calls = [asdict(record) for record in self.records]
+        return json.dumps(
+            {"summary": self.summary(), "calls": calls}, ensure_ascii=False, indent=2
+        )
+
+    def to_prometheus(self) -> str:
+        """导出为 Prometheus 文本格式"""
+        summary = self.summary()
+        lines = []
+        for name, field, kind, description in PROMETHEUS_METRICS:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for group in summary:
+                labels = ",".join(
+                    f'{label}="{_escape_label(group[label])}"'
+                    for label in ("thread_id", "node", "model")
+                )
+                lines.append(f"{name}{{{labels}}} {group[field]}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, export_dir: str | Path) -> Path:
+        """
+        将本次运行的度量写入 export_dir 下的 llm_metrics_<时间>.json 和 .prom 文件
+
+        Returns:
+            Path: JSON文件的路径
+        """
+        export_dir = Path(export_dir)
+        export_dir.mkdir(parents=True, exist_ok=True)
+        stem = export_dir / time.strftime("llm_metrics_%Y%m%d_%H%M%S")
+        json_path = stem.with_suffix(".json")
+        json_path.write_text(self.to_json(), encoding="utf-8")
+        stem.with_suffix(".prom").write_text(self.to_prometheus(), encoding="utf-8")
+        return json_path
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records.clear()
+            self._running.clear()
@@ -0,0 +1,242 @@
+"""
+LLM调度模块
+
+该模块为进程内所有LLM请求提供统一调度: 限制同时进行中的请求数, 按每分钟token预算
+限速, 按优先级放行等待中的请求(交互式请求先于后台请求), 并在收到 429/503 响应后
+以带抖动的指数退避暂停所有请求。
+
+调度以 httpx 传输层的形式实现, 包装共享连接池的传输层, 因此对所有用例的LLM实例透明。
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from typing import Optional
+import httpx
+from .throttle import THROTTLE_STATUS_CODES, parse_retry_after
+from .tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 优先级, 数值越小越先放行
+PRIORITIES = {"interactive": 0, "default": 1, "background": 2}
+
+
+class LLMScheduler:
+    """进程级的LLM请求调度器"""
+
+    def __init__(
+        self,
+        max_in_flight: int = 4,
+        tokens_per_minute: Optional[int] = None,
+        backoff_base: float = 1.0,
+        max_backoff: float = 60.0,
+        max_retries: int = 4,
+    ):
+        """
+        Args:
+            max_in_flight: 同时进行中的请求数上限
+            tokens_per_minute: 每分钟的输入token预算, None表示不限
+            backoff_base: 首次被限流后的暂停秒数, 连续限流时逐次翻倍
+            max_backoff: 单次暂停的上限, 包括服务端的 Retry-After
+            max_retries: 被限流的请求最多重试的次数
+        """
+        self.max_in_flight = max_in_flight
+        self.tokens_per_minute = tokens_per_minute
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self._condition = threading.Condition()
+        self._waiting = []  # (优先级, 序号) 的小顶堆
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._failures = 0
+
+    @classmethod
+    def from_config(cls, config: dict) -> "LLMScheduler":
+        """
+        根据 llm.scheduler 配置创建调度器
+        """
+        return cls(
+            max_in_flight=config.get("max_in_flight", 4),
+            tokens_per_minute=config.get("tokens_per_minute"),
+            backoff_base=config.get("backoff_base", 1.0),
+            max_backoff=config.get("max_backoff", 60.0),
+            max_retries=config.get("max_retries", 4),
+        )
+
+    def _wait_time(self, tokens: int) -> Optional[float]:
+        """
+        计算请求还需等待的秒数, 0表示可以立即放行, None表示等待名额释放
+
+        必须在持有 condition 时调用。
+        """
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._in_flight >= self.max_in_flight:
+            return None
+        if self.tokens_per_minute:
+            rate = self.tokens_per_minute / 60
+            self._tokens = min(
+                float(self.tokens_per_minute),
+                self._tokens + (now - self._updated_at) * rate,
+            )
+            self._updated_at = now
+            # 超过整个预算的请求在预算填满时放行, 避免永远等待
+            needed = min(tokens, self.tokens_per_minute)
+            if self._tokens < needed:
+                return (needed - self._tokens) / rate
+        return 0.0
+
+    def acquire(self, tokens: int = 0, priority: int = PRIORITIES["default"]) -> None:
+        """
+        阻塞直到请求被放行, 同一时刻只有优先级最高的等待者可以被放行
+
+        Args:
+            tokens: 请求预计消耗的token数
+            priority: 请求的优先级, 数值越小越先放行
+        """
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    if self._waiting[0] == entry:
+                        wait = self._wait_time(tokens)
+                        if wait == 0:
+                            break
+                    else:
+                        wait = None
+                    self._condition.wait(timeout=wait)
+                if self.tokens_per_minute:
+                    self._tokens -= min(tokens, self.tokens_per_minute)
+                self._in_flight += 1
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def release(self) -> None:
+        """释放请求占用的名额"""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def backoff(self, retry_after: Optional[float] = None) -> float:
+        """
+        收到限流响应后暂停所有请求
+
+        服务端给出 Retry-After 时按其暂停, 否则按连续限流次数指数退避并加入随机抖动,
+        避免所有请求在同一时刻重试。
+
+        Args:
+            retry_after: 解析后的 Retry-After 秒数
+
+        Returns:
+            float: 暂停的秒数
+        """
+        with self._condition:
+            if retry_after is None:
+                retry_after = self.backoff_base * 2**self._failures
+                retry_after *= random.uniform(0.5, 1.5)
+            delay = min(retry_after, self.max_backoff)
+            self._failures += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._condition.notify_all()
+        logger.warning(f"LLM requests throttled, pausing for {delay:.1f}s")
+        return delay
+
+    def record_success(self) -> None:
+        """成功响应后重置退避"""
+        with self._condition:
+            self._failures = 0
+
+
+def estimate_request_tokens(request: httpx.Request) -> int:
+    """估算请求中消息的token数"""
+    try:
+        body = json.loads(request.read() or b"{}")
+    except ValueError:
+        return 0
+    return estimate_tokens(json.dumps(body.get("messages", ""), ensure_ascii=False))
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """响应体读取完毕或关闭时释放调度名额, 流式响应在整个生成期间占用名额"""
+
+    def __init__(self, stream: httpx.SyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class ScheduledTransport(httpx.BaseTransport):
+    """经过调度器放行后再发出请求的传输层, 被限流时退避并重试"""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        scheduler: LLMScheduler,
+        priority: int = PRIORITIES["default"],
+    ):
+        """
+        Args:
+            transport: 实际发送请求的传输层, 可在多个 ScheduledTransport 间共享
+            scheduler: 调度器
+            priority: 经过该传输层的请求的优先级
+        """
+        self.transport = transport
+        self.scheduler = scheduler
+        self.priority = priority
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        tokens = estimate_request_tokens(request)
+        for attempt in range(self.scheduler.max_retries + 1):
+            self.scheduler.acquire(tokens, self.priority)
+            try:
+                response = self.transport.handle_request(request)
+            except BaseException:
+                self.scheduler.release()
+                raise
+
+            if (
+                response.status_code in THROTTLE_STATUS_CODES
+                and attempt < self.scheduler.max_retries
+            ):
+                response.close()
+                self.scheduler.release()
+                self.scheduler.backoff(
+                    parse_retry_after(response.headers.get("Retry-After"))
+                )
+                continue
+
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                self.scheduler.record_success()
+            return httpx.Response(
+                status_code=response.status_code,
+                headers=response.headers,
+                stream=_ReleasingStream(response.stream, self.scheduler.release),
+                extensions=response.extensions,
+            )
+
+    def close(self) -> None:
+        # 共享的传输层由创建者关闭
+        pass
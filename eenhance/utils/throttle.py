@@ -0,0 +1,35 @@
+"""
+Throttling Helpers Module
+
+This module holds the HTTP throttling conventions shared by the per-host crawl
+limiter and the LLM request scheduler: which response status codes mean "slow
+down", and how to read the server's Retry-After header.
+"""
+
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# 需要退避重试的响应状态码
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+            value (Optional[str]): The header value.
+
+    Returns:
+            Optional[float]: Seconds to wait, or None if absent or unparsable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,37 @@
+"""
+Token Estimation Module
+
+This module provides an offline token estimate used to report and budget prompt
+sizes without calling the model provider or downloading tokenizer files.
+"""
+
+import math
+import re
+
+# DeepSeek 官方换算: 1个中文字符约0.6个token, 1个英文字符约0.3个token
+CJK_TOKENS_PER_CHAR = 0.6
+OTHER_TOKENS_PER_CHAR = 0.3
+
+CJK_PATTERN = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]"
+)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: Estimated token count.
+    """
+    if not text:
+        return 0
+    cjk_chars = len(CJK_PATTERN.findall(text))
+    other_chars = len(WHITESPACE_PATTERN.sub("", text)) - cjk_chars
+    return math.ceil(
+        cjk_chars * CJK_TOKENS_PER_CHAR + other_chars * OTHER_TOKENS_PER_CHAR
+    )
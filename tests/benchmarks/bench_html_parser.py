@@ -0,0 +1,70 @@
+"""
+HTML Parser Benchmark
+
+Compares the WebsiteExtractor parser backends on the saved HTML fixtures in
+tests/data/html. Each fixture is inflated to several sizes (1-5 MB) by repeating
+its <body>, and every backend's output is checked against html.parser.
+
+Usage:
+        python -m tests.benchmarks.bench_html_parser
+"""
+
+import statistics
+import time
+from pathlib import Path
+
+from eenhance.content.content_parser.website_extractor import (
+    PARSER_BACKENDS,
+    WebsiteExtractor,
+)
+
+FIXTURE_DIR = Path(__file__).resolve().parents[1] / "data" / "html"
+TARGET_SIZES_MB = [1, 5]
+REPEAT = 3
+
+
+def inflate(page: str, target_bytes: int) -> str:
+    """Repeat the <body> of a page until the document reaches target_bytes."""
+    head, _, rest = page.partition("<body>")
+    body, _, tail = rest.rpartition("</body>")
+    copies = max(1, target_bytes // max(1, len(body.encode("utf-8"))))
+    return f"{head}<body>{body * copies}</body>{tail}"
+
+
+def time_backend(extractor: WebsiteExtractor, page: str) -> tuple[float, str]:
+    """Return the median extraction time and the extracted text."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        text = extractor.extract_text(page)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), text
+
+
+def main() -> None:
+    """
+    Run the benchmark and print one row per fixture, size and backend.
+    """
+    extractor = WebsiteExtractor()
+    backends = [b for b in PARSER_BACKENDS if extractor._resolve_parser(b) == b]
+
+    print(f"{'fixture':<20}{'size':>8}{'backend':>14}{'time (s)':>12}{'identical':>12}")
+    for fixture in sorted(FIXTURE_DIR.glob("*.html")):
+        page = fixture.read_text(encoding="utf-8")
+        for size_mb in TARGET_SIZES_MB:
+            inflated = inflate(page, size_mb * 1024 * 1024)
+            size = f"{len(inflated.encode('utf-8')) / 1024 / 1024:.1f}MB"
+            reference = None
+            for backend in backends:
+                extractor.parser = backend
+                elapsed, text = time_backend(extractor, inflated)
+                if reference is None:
+                    reference = text
+                print(
+                    f"{fixture.name:<20}{size:>8}{backend:>14}"
+                    f"{elapsed:>12.3f}{str(text == reference):>12}"
+                )
+
+
+if __name__ == "__main__":
+    main()
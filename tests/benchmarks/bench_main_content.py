@@ -0,0 +1,61 @@
+"""
+Main Content Benchmark
+
+Compares full-page text extraction with main-content detection on the saved HTML
+fixtures in tests/data/html: extracted characters, estimated tokens and median
+extraction time, for every installed parser backend.
+
+Usage:
+        python -m tests.benchmarks.bench_main_content
+"""
+
+import statistics
+import time
+from pathlib import Path
+
+from eenhance.content.content_parser.website_extractor import (
+    PARSER_BACKENDS,
+    WebsiteExtractor,
+)
+from eenhance.utils.tokens import estimate_tokens
+
+FIXTURE_DIR = Path(__file__).resolve().parents[1] / "data" / "html"
+REPEAT = 50
+
+
+def time_extraction(extractor: WebsiteExtractor, page: str) -> tuple[float, str]:
+    """Return the median extraction time and the extracted text."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        text = extractor.extract_text(page)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), text
+
+
+def main() -> None:
+    """
+    Run the benchmark and print one row per fixture, backend and mode.
+    """
+    extractor = WebsiteExtractor()
+    backends = [b for b in PARSER_BACKENDS if extractor._resolve_parser(b) == b]
+
+    print(
+        f"{'fixture':<16}{'backend':>12}{'mode':>8}"
+        f"{'chars':>8}{'tokens':>8}{'time (ms)':>12}"
+    )
+    for fixture in sorted(FIXTURE_DIR.glob("*.html")):
+        page = fixture.read_text(encoding="utf-8")
+        for backend in backends:
+            extractor.parser = backend
+            for mode, enabled in (("full", False), ("main", True)):
+                extractor.main_content = enabled
+                elapsed, text = time_extraction(extractor, page)
+                print(
+                    f"{fixture.name:<16}{backend:>12}{mode:>8}{len(text):>8}"
+                    f"{estimate_tokens(text):>8}{elapsed * 1000:>12.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+PDF Extractor Benchmark
+
+Generates large text PDFs and compares the serial and parallel page-range
+extraction paths of PDFExtractor.
+
+Usage:
+        python -m tests.benchmarks.bench_pdf_extractor
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import pymupdf
+
+from eenhance.content.content_parser.pdf_extractor import PDFExtractor
+
+PAGE_COUNTS = [50, 200, 600]
+LINES_PER_PAGE = 45
+
+
+def generate_pdf(path: Path, page_count: int) -> None:
+    """Write a PDF with page_count pages of dense text."""
+    doc = pymupdf.open()
+    for i in range(page_count):
+        page = doc.new_page()
+        text = "\n".join(
+            f"Page {i} line {j}: concurrent data structures and lock-free queues"
+            for j in range(LINES_PER_PAGE)
+        )
+        page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def main() -> None:
+    """
+    Run the benchmark and print serial vs parallel timings per document size.
+    """
+    extractor = PDFExtractor()
+    extractor.parallel_min_pages = 1
+
+    print(f"{'pages':>8}{'serial (s)':>14}{'parallel (s)':>14}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for page_count in PAGE_COUNTS:
+            path = Path(tmp_dir) / f"doc_{page_count}.pdf"
+            generate_pdf(path, page_count)
+
+            extractor.parallel = False
+            start = time.perf_counter()
+            serial = extractor.extract_content(str(path))
+            serial_time = time.perf_counter() - start
+
+            extractor.parallel = True
+            start = time.perf_counter()
+            parallel = extractor.extract_content(str(path))
+            parallel_time = time.perf_counter() - start
+
+            assert serial == parallel
+            print(
+                f"{page_count:>8}{serial_time:>14.3f}{parallel_time:>14.3f}"
+                f"{serial_time / parallel_time:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
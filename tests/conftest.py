@@ -0,0 +1,59 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """按路径返回预置响应的本地HTTP服务"""
+
+    # 支持长连接, 便于检查连接复用; 所有响应都带 Content-Length
+    protocol_version = "HTTP/1.1"
+    body = b""  # POST 请求的请求体
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond()
+
+    def _respond(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        self.server.clients.append(self.client_address)
+        route = self.server.routes.get(self.path)
+        if route is None:
+            self.send_error(404)
+            return
+        status, headers, body = route(self) if callable(route) else route
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """
+    启动本地HTTP服务, 通过 server.routes[path] = (status, headers, body) 配置响应
+
+    server.requests 记录每个请求的路径和请求头, server.clients 记录发出请求的客户端
+    地址, 同一地址即同一个连接。
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.routes = {}
+    server.requests = []
+    server.clients = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,52 @@
+import pytest
+from eenhance.utils.compressor import ExtractiveCompressor
+from eenhance.utils.tokens import estimate_tokens
+
+# 围绕同一主题的句子, 以及少量离题的句子
+ON_TOPIC = [
+    "大语言模型正在改变软件开发的方式。",
+    "开发者使用大语言模型生成代码和测试。",
+    "大语言模型生成的代码仍然需要人工审查。",
+    "很多团队把大语言模型集成到代码审查流程中。",
+]
+OFF_TOPIC = [
+    "今天的午饭是红烧肉和青菜。",
+    "周末天气晴朗适合去公园散步。",
+]
+
+
+def test_split_sentences_handles_chinese_and_english():
+    text = "第一句。第二句！Third one. Fourth one?\n第五行"
+    assert ExtractiveCompressor.split_sentences(text) == [
+        "第一句。",
+        "第二句！",
+        "Third one.",
+        "Fourth one?",
+        "第五行",
+    ]
+
+
+def test_text_within_budget_is_unchanged():
+    text = "".join(ON_TOPIC)
+    assert ExtractiveCompressor().compress(text, estimate_tokens(text)) == text
+
+
+@pytest.mark.parametrize("method", ["textrank", "tfidf"])
+def test_compress_keeps_central_sentences_in_order(method):
+    sentences = [ON_TOPIC[0], OFF_TOPIC[0], ON_TOPIC[1], OFF_TOPIC[1], ON_TOPIC[2]]
+    text = "".join(sentences)
+    # 预算正好容纳所有切题的句子
+    budget = sum(estimate_tokens(s) for s in sentences if s in ON_TOPIC)
+
+    compressed = ExtractiveCompressor(method=method).compress(text, budget)
+
+    assert estimate_tokens(compressed) <= budget
+    # 保留的句子按原文顺序排列
+    assert ExtractiveCompressor.split_sentences(compressed) == [
+        s for s in sentences if s in ON_TOPIC
+    ]
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        ExtractiveCompressor(method="lsa")
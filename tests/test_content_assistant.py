@@ -0,0 +1,82 @@
+import asyncio
+from eenhance.content import content_assistant
+
+
+def test_content_graph_runs_async_node(http_server, tmp_path):
+    http_server.routes["/article"] = (
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        "<html><body><article><p>异步提取的文章内容</p></article></body></html>",
+    )
+    extractor = content_assistant.get_content_extractor()
+    extractor.cache = None
+    thread = {"configurable": {"thread_id": "test_async"}}
+
+    async def run():
+        # 第一次运行在 human_feedback 前中断
+        async for _ in content_assistant.graph.astream(
+            {"source": "", "content_is_open": True}, thread
+        ):
+            pass
+        await content_assistant.graph.aupdate_state(
+            thread,
+            {"source": http_server.url + "/article", "content_is_open": True},
+            as_node="human_feedback",
+        )
+        async for _ in content_assistant.graph.astream(None, thread):
+            pass
+        state = await content_assistant.graph.aget_state(thread)
+        await extractor.website_extractor.aclose()
+        return state.values
+
+    values = asyncio.run(run())
+
+    assert values["out_content"] == "异步提取的文章内容"
+    assert values.get("error") is None
+
+
+def test_content_graph_merges_multiple_sources(http_server):
+    http_server.routes["/a"] = (
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        "<html><body><p>第一篇文章</p></body></html>",
+    )
+    http_server.routes["/b"] = (
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        "<html><body><p>第二篇文章</p></body></html>",
+    )
+    extractor = content_assistant.get_content_extractor()
+    extractor.cache = None
+    sources = [
+        http_server.url + "/a",
+        http_server.url + "/missing",
+        http_server.url + "/b",
+    ]
+
+    output = content_assistant.extract_content({"source": sources})
+
+    # 成功的来源按输入顺序合并并标注来源, 失败的来源单独记录
+    assert output["out_content"] == (
+        f'<Document source="{sources[0]}"/>\n第一篇文章\n</Document>\n\n'
+        f'<Document source="{sources[2]}"/>\n第二篇文章\n</Document>'
+    )
+    assert output["error"] is None
+    assert list(output["source_errors"]) == [sources[1]]
+
+
+def test_content_graph_reports_error_when_all_sources_fail(http_server):
+    extractor = content_assistant.get_content_extractor()
+    extractor.cache = None
+    sources = [http_server.url + "/missing1", http_server.url + "/missing2"]
+
+    async def run():
+        output = await content_assistant.aextract_content({"source": sources})
+        await extractor.website_extractor.aclose()
+        return output
+
+    output = asyncio.run(run())
+
+    assert output["out_content"] == ""
+    assert output["error"] is not None
+    assert set(output["source_errors"]) == set(sources)
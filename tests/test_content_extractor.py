@@ -0,0 +1,62 @@
+import pytest
+from eenhance.content.content_parser.content_extractor import ContentExtractor
+
+
+class _TextExtractor:
+    def extract_content(self, source: str) -> str:
+        return f"text of {source}"
+
+
+@pytest.fixture
+def extractor():
+    extractor = ContentExtractor()
+    extractor.cache = None
+    return extractor
+
+
+@pytest.mark.parametrize(
+    "source, source_type",
+    [
+        ("docs/whitepaper.PDF", "pdf"),
+        ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "youtube"),
+        ("youtu.be/dQw4w9WgXcQ", "youtube"),
+        ("https://www.bilibili.com/video/BV1xx411c7mD", "website"),
+        ("juejin.cn/post/7440000000000000000", "website"),
+    ],
+)
+def test_get_source_type(extractor, source, source_type):
+    assert extractor.get_source_type(source) == source_type
+
+
+def test_extractors_are_created_lazily_and_reused(extractor):
+    assert extractor._instances == {}
+
+    website_extractor = extractor.website_extractor
+
+    assert list(extractor._instances) == ["website"]
+    assert extractor.get_extractor("website") is website_extractor
+
+
+def test_unregistered_source_type_is_rejected(extractor):
+    with pytest.raises(ValueError, match="No extractor registered"):
+        extractor.get_extractor("bilibili")
+
+
+def test_url_rules_without_extractor_fall_back_to_website(extractor):
+    extractor.content_extractor_config = {"bilibili_url_patterns": ["bilibili.com"]}
+    extractor.url_patterns = extractor._compile_url_patterns()
+
+    source = "https://www.bilibili.com/video/BV1xx411c7mD"
+    assert extractor.get_source_type(source) == "website"
+
+
+def test_register_extractor_with_path_pattern(extractor, monkeypatch):
+    monkeypatch.setattr(ContentExtractor, "_extractors", dict(extractor._extractors))
+    monkeypatch.setattr(
+        ContentExtractor, "_path_patterns", dict(extractor._path_patterns)
+    )
+    ContentExtractor.register_extractor(
+        "text", f"{__name__}:_TextExtractor", path_pattern=r"\.txt$"
+    )
+
+    assert extractor.extract_content("notes.txt") == "text of notes.txt"
@@ -0,0 +1,128 @@
+import os
+import threading
+import pymupdf
+import pytest
+from eenhance.content.content_parser import corpus_extractor
+from eenhance.content.content_parser.content_extractor import ContentExtractor
+from eenhance.content.content_parser.corpus_extractor import (
+    CorpusExtractor,
+    CorpusIndex,
+)
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    corpus = tmp_path / "corpus"
+    (corpus / "sub").mkdir(parents=True)
+    (corpus / "a.html").write_text(
+        "<html><body><nav>menu</nav><p>html body</p></body></html>",
+        encoding="utf-8",
+    )
+    (corpus / "b.md").write_text("# Title\n\nmarkdown body\n", encoding="utf-8")
+    (corpus / "sub" / "c.txt").write_text("plain text body", encoding="utf-8")
+    (corpus / "sub" / "empty.txt").write_text("", encoding="utf-8")
+    (corpus / "image.png").write_bytes(b"\x89PNG")
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), "pdf body")
+    doc.save(corpus / "d.pdf")
+    doc.close()
+    return corpus
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    extractor = CorpusExtractor()
+    extractor.index = CorpusIndex(tmp_path / "index")
+    extractor.max_workers = 2
+    return extractor
+
+
+def test_extracts_supported_files_in_path_order(corpus_dir, extractor):
+    results = list(extractor.iter_extract(str(corpus_dir)))
+
+    assert [os.path.relpath(r["url"], corpus_dir) for r in results] == [
+        "a.html",
+        "b.md",
+        "d.pdf",
+        os.path.join("sub", "c.txt"),
+        os.path.join("sub", "empty.txt"),
+    ]
+    contents = [r["content"] for r in results]
+    assert contents[0] == "html body"
+    assert contents[1] == "# Title\n\nmarkdown body"
+    assert "pdf body" in contents[2]
+    assert contents[3:] == ["plain text body", ""]
+    assert all(r["error"] is None for r in results)
+
+
+def test_rerun_only_extracts_new_or_changed_files(corpus_dir, extractor, monkeypatch):
+    first = list(extractor.iter_extract(str(corpus_dir)))
+
+    extracted = []
+    extract_file = corpus_extractor.extract_file
+
+    def tracking_extract_file(path, known_digest):
+        extracted.append(os.path.basename(path))
+        return extract_file(path, known_digest)
+
+    monkeypatch.setattr(corpus_extractor, "extract_file", tracking_extract_file)
+    extractor.max_workers = 1
+    (corpus_dir / "b.md").write_text("changed markdown", encoding="utf-8")
+    (corpus_dir / "e.txt").write_text("new file", encoding="utf-8")
+
+    # 重新加载索引, 模拟新的进程
+    extractor.index = CorpusIndex(extractor.index.index_dir)
+    second = list(extractor.iter_extract(str(corpus_dir)))
+
+    assert sorted(extracted) == ["b.md", "e.txt"]
+    assert second[0] == first[0]
+    assert second[1]["content"] == "changed markdown"
+
+    changed = list(extractor.iter_extract(str(corpus_dir), changed_only=True))
+    assert changed == []
+
+
+def test_glob_source_is_routed_to_corpus(corpus_dir, extractor):
+    content_extractor = ContentExtractor()
+    content_extractor._instances["corpus"] = extractor
+    source = str(corpus_dir / "**" / "*.txt")
+
+    assert content_extractor.get_source_type(source) == "corpus"
+    assert content_extractor.get_source_type(str(corpus_dir)) == "corpus"
+    assert content_extractor.get_source_type("www.example.com/page?id=1") == "website"
+    assert content_extractor.extract_content(source) == (
+        f'<Document source="{corpus_dir / "sub" / "c.txt"}"/>\nplain text body\n'
+        f"</Document>\n\n"
+        f'<Document source="{corpus_dir / "sub" / "empty.txt"}"/>\n\n</Document>'
+    )
+
+
+def test_index_update_waits_for_concurrent_save(tmp_path, monkeypatch):
+    index = CorpusIndex(tmp_path / "index")
+    stat = os.stat(tmp_path)
+    index.update("old", stat, "old", "old text")
+    write = corpus_extractor.atomic_write_text
+    updated_during_save = []
+
+    def write_while_updating(path, text):
+        if path == index.index_path:
+            # 保存索引期间另一个线程提交新文件
+            thread = threading.Thread(
+                target=index.update, args=("new", stat, "new", "new text")
+            )
+            thread.start()
+            thread.join(timeout=0.2)
+            updated_during_save.append(not thread.is_alive())
+            threads.append(thread)
+        write(path, text)
+
+    threads = []
+    monkeypatch.setattr(corpus_extractor, "atomic_write_text", write_while_updating)
+    index.save()
+    threads[0].join()
+    monkeypatch.setattr(corpus_extractor, "atomic_write_text", write)
+
+    assert updated_during_save == [False]
+    assert index.get_text("new") == "new text"
+    index.save()
+    assert set(CorpusIndex(tmp_path / "index").entries) == {"old", "new"}
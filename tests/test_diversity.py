@@ -0,0 +1,32 @@
+import pytest
+from eenhance.utils.diversity import DiversitySelector
+
+
+def test_rank_prefers_distinct_candidates():
+    candidates = [
+        "deep learning for medical imaging",
+        "deep learning for medical imaging diagnosis",
+        "privacy of patient data",
+        "clinical decision support",
+    ]
+    reference = "deep learning medical imaging, patient data privacy, clinical decision"
+
+    ranked = DiversitySelector(relevance_weight=0.5).rank(candidates, reference)
+
+    assert sorted(ranked) == [0, 1, 2, 3]
+    assert {0, 1} - set(ranked[:2])
+    assert ranked[-1] in (0, 1)
+
+
+def test_relevance_only_ranks_by_similarity_to_reference():
+    candidates = ["weather forecast", "graph neural networks", "neural networks"]
+
+    selector = DiversitySelector(relevance_weight=1.0)
+
+    assert selector.select(candidates, "neural networks", 1) == ["neural networks"]
+    assert selector.rank([], "neural networks") == []
+
+
+def test_invalid_relevance_weight():
+    with pytest.raises(ValueError):
+        DiversitySelector(relevance_weight=1.5)
@@ -0,0 +1,133 @@
+import os
+import pytest
+from eenhance.content.content_parser.content_extractor import ContentExtractor
+from eenhance.content.content_parser.extraction_cache import ExtractionCache
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ExtractionCache(tmp_path, max_size_bytes=10_000)
+    for i in range(3):
+        cache.put(f"url:{i}", "x" * 3000)
+        path = cache._path(f"url:{i}")
+        os.utime(path, (i, i))
+
+    # 访问最旧的条目使其成为最近使用
+    assert cache.get("url:0")["content"] == "x" * 3000
+    cache.put("url:3", "x" * 3000)
+
+    assert cache.get("url:1") is None
+    assert cache.get("url:0") is not None
+    assert cache.get("url:3") is not None
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    extractor = ContentExtractor()
+    extractor.cache = ExtractionCache(tmp_path, max_age=0)
+    return extractor
+
+
+def test_website_is_revalidated_with_conditional_get(http_server, extractor):
+    def page(handler):
+        if handler.headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        return (
+            200,
+            {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'},
+            "<html><body><p>cached page</p></body></html>",
+        )
+
+    http_server.routes["/page"] = page
+    url = http_server.url + "/page"
+
+    assert extractor.extract_content(url) == "cached page"
+    assert extractor.extract_content(url) == "cached page"
+
+    assert "If-None-Match" not in http_server.requests[0][1]
+    assert http_server.requests[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_fresh_entry_skips_network(http_server, extractor):
+    extractor.cache.max_age = 3600
+    http_server.routes["/page"] = (
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        "<html><body><p>fresh page</p></body></html>",
+    )
+    url = http_server.url + "/page"
+
+    assert extractor.extract_content(url) == "fresh page"
+    assert extractor.extract_content(url) == "fresh page"
+    assert len(http_server.requests) == 1
+
+
+def test_pdf_cache_key_tracks_file_changes(tmp_path, extractor):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    calls = []
+    extractor.pdf_extractor.extract_content = lambda path: calls.append(path) or "pdf"
+
+    extractor.extract_content(str(pdf_path))
+    extractor.extract_content(str(pdf_path))
+    assert len(calls) == 1
+
+    pdf_path.write_bytes(b"%PDF-changed")
+    extractor.extract_content(str(pdf_path))
+    assert len(calls) == 2
+
+
+def test_website_cache_key_tracks_extractor_settings(http_server, extractor):
+    extractor.cache.max_age = 3600
+    http_server.routes["/page"] = (
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        "<html><body><p>kept</p><aside>sidebar</aside></body></html>",
+    )
+    url = http_server.url + "/page"
+    website_extractor = extractor.website_extractor
+    website_extractor.main_content = False
+    website_extractor.unwanted_tags = ["aside"]
+
+    assert extractor.extract_content(url) == "kept"
+    assert extractor.extract_content(url) == "kept"
+    assert len(http_server.requests) == 1
+
+    # 清洗设置变化后, 即使条目仍未过期也重新提取
+    website_extractor.unwanted_tags = []
+    assert extractor.extract_content(url) == "kept\nsidebar"
+    assert len(http_server.requests) == 2
+
+
+def test_pdf_cache_key_tracks_extractor_settings(tmp_path, extractor):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    calls = []
+    extractor.pdf_extractor.extract_content = lambda path: calls.append(path) or "pdf"
+
+    extractor.extract_content(str(pdf_path))
+    extractor.pdf_extractor.strip_repeated_lines = (
+        not extractor.pdf_extractor.strip_repeated_lines
+    )
+    extractor.extract_content(str(pdf_path))
+    assert len(calls) == 2
+
+
+def test_cache_scans_directory_only_over_budget(tmp_path, monkeypatch):
+    cache = ExtractionCache(tmp_path, max_size_bytes=10_000)
+    cache.put("url:0", "x" * 3000)
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+
+    # 重复写入同一条目只更新大小差值, 不扫描目录
+    for _ in range(5):
+        cache.put("url:0", "x" * 3000)
+    cache.put("url:1", "x" * 3000)
+    assert scans == []
+    assert cache._total_size == sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+
+    cache.put("url:2", "x" * 3000)
+    cache.put("url:3", "x" * 3000)
+    assert scans == [1]
+    assert cache._total_size <= 10_000
+    assert cache._total_size == sum(p.stat().st_size for p in tmp_path.glob("*.json"))
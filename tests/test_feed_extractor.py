@@ -0,0 +1,166 @@
+import pytest
+from eenhance.content.content_parser.content_extractor import ContentExtractor
+from eenhance.content.content_parser.feed_extractor import (
+    FeedExtractor,
+    FeedStore,
+    parse_feed,
+)
+
+RSS_ITEM = "<item><title>{0}</title><link>{1}/{0}</link><guid>{0}</guid></item>"
+
+
+def rss(base_url, names):
+    items = "".join(RSS_ITEM.format(name, base_url) for name in names)
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss><channel>{items}</channel></rss>'
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    extractor = ContentExtractor()
+    extractor.cache = None
+    feed_extractor = FeedExtractor()
+    feed_extractor.store = FeedStore(tmp_path)
+    extractor._instances["feed"] = feed_extractor
+    return extractor
+
+
+def serve_feed(http_server, names, etag):
+    def feed(handler):
+        if handler.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return (
+            200,
+            {"Content-Type": "application/rss+xml", "ETag": etag},
+            rss(http_server.url, names),
+        )
+
+    http_server.routes["/rss"] = feed
+    for name in names:
+        http_server.routes[f"/{name}"] = (
+            200,
+            {"Content-Type": "text/html"},
+            f"<html><body><p>article {name}</p></body></html>",
+        )
+
+
+def test_feed_yields_only_new_items(http_server, extractor):
+    source = http_server.url + "/rss"
+    serve_feed(http_server, ["a", "b"], '"v1"')
+
+    assert extractor.get_source_type(source) == "feed"
+    first = extractor.extract_feed(source)
+    assert [r["content"] for r in first] == ["article a", "article b"]
+
+    # 订阅源未变化时只有一次 304 请求
+    request_count = len(http_server.requests)
+    assert extractor.extract_feed(source) == []
+    assert len(http_server.requests) == request_count + 1
+    assert http_server.requests[-1][1]["If-None-Match"] == '"v1"'
+
+    serve_feed(http_server, ["c", "a", "b"], '"v2"')
+    assert [r["content"] for r in extractor.extract_feed(source)] == ["article c"]
+
+
+def test_failed_items_are_retried_on_next_poll(http_server, extractor):
+    source = http_server.url + "/rss"
+    serve_feed(http_server, ["a", "b"], '"v1"')
+    del http_server.routes["/b"]
+
+    first = extractor.extract_feed(source)
+    assert first[1]["error"] is not None
+
+    http_server.routes["/b"] = (200, {"Content-Type": "text/html"}, "<p>article b</p>")
+    assert [r["content"] for r in extractor.extract_feed(source)] == ["article b"]
+
+
+def test_parse_atom_and_sitemap_index():
+    atom = """<feed xmlns="http://www.w3.org/2005/Atom"><entry>
+        <id>urn:1</id><title>Post</title><updated>2024-12-01T00:00:00Z</updated>
+        <link rel="edit" href="https://blog.example.com/edit/1"/>
+        <link href="https://blog.example.com/posts/1"/></entry></feed>"""
+    items, sitemaps = parse_feed(atom)
+    assert items == [
+        {
+            "id": "urn:1",
+            "url": "https://blog.example.com/posts/1",
+            "title": "Post",
+            "updated": "2024-12-01T00:00:00Z",
+        }
+    ]
+    assert sitemaps == []
+
+    index = """<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+        <sitemap><loc>https://example.com/sitemap-1.xml</loc></sitemap></sitemapindex>"""
+    assert parse_feed(index) == ([], ["https://example.com/sitemap-1.xml"])
+
+    with pytest.raises(ValueError):
+        parse_feed("<html><body>not a feed</body></html>")
+
+
+@pytest.mark.parametrize(
+    "source, source_type",
+    [
+        ("https://example.com/feed/", "feed"),
+        ("https://example.com/blog/rss.xml", "feed"),
+        ("https://example.com/feed/atom/", "feed"),
+        ("https://example.com/posts.atom", "feed"),
+        ("https://example.com/sitemap_index.xml", "feed"),
+        ("https://www.youtube.com/feeds/videos.xml?channel_id=UC123", "feed"),
+        ("https://jamesclear.com/atomic-habits", "website"),
+        ("https://example.com/how-to-build-a-sitemap-for-seo", "website"),
+        ("https://example.com/rss-reader-review", "website"),
+        ("https://example.com/feedback?from=/feed/", "website"),
+        ("https://www.youtube.com/watch?v=abc", "youtube"),
+    ],
+)
+def test_feed_routing_is_anchored_to_feed_paths(source, source_type):
+    assert ContentExtractor().get_source_type(source) == source_type
+
+
+def sitemap(names):
+    urls = "".join(f"<url><loc>https://example.com/{name}</loc></url>" for name in names)
+    return f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+
+def test_large_sitemap_caps_pending_and_remembers_all_items(http_server, tmp_path):
+    feed_extractor = FeedExtractor()
+    feed_extractor.store = FeedStore(tmp_path, max_seen_items=5)
+    feed_extractor.max_items = 2
+    feed_extractor.max_pending_items = 4
+    source = http_server.url + "/sitemap.xml"
+    names = [f"page-{i}" for i in range(10)]
+    http_server.routes["/sitemap.xml"] = (
+        200,
+        {"Content-Type": "application/xml"},
+        sitemap(names),
+    )
+
+    first = feed_extractor.poll(source)
+    assert [item["id"] for item in first] == [
+        f"https://example.com/{n}" for n in names[:2]
+    ]
+    assert len(feed_extractor.store.get(source)["pending"]) == 4
+    feed_extractor.mark_seen(source, first)
+
+    # 超出上限的条目被记为已见, 即使超过 max_seen_items 也不会在源变化后重新出现
+    http_server.routes["/sitemap.xml"] = (
+        200,
+        {"Content-Type": "application/xml"},
+        sitemap(names + ["page-new"]),
+    )
+    second = feed_extractor.poll(source)
+    assert [item["id"] for item in second] == [
+        f"https://example.com/{n}" for n in names[2:4]
+    ]
+    feed_extractor.mark_seen(source, second)
+    third = feed_extractor.poll(source)
+    assert [item["id"] for item in third] == ["https://example.com/page-new"]
+    feed_extractor.mark_seen(source, third)
+
+    http_server.routes["/sitemap.xml"] = (
+        200,
+        {"Content-Type": "application/xml"},
+        sitemap(["page-new"] + names),
+    )
+    assert feed_extractor.poll(source) == []
+    assert len(feed_extractor.store.get(source)["seen"]) == 11
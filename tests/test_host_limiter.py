@@ -0,0 +1,40 @@
+import time
+from eenhance.content.content_parser.host_limiter import HostPolicy, HostRateLimiter
+
+
+def test_token_bucket_limits_rate_after_burst():
+    limiter = HostRateLimiter(HostPolicy(requests_per_second=20, burst=2))
+
+    start = time.monotonic()
+    for _ in range(4):
+        with limiter.slot("example.com"):
+            pass
+
+    # 前2个请求使用突发容量, 之后每个请求等待 1/20 秒
+    assert time.monotonic() - start >= 0.09
+
+
+def test_backoff_pauses_host_and_grows_exponentially():
+    limiter = HostRateLimiter(backoff_base=0.05, max_backoff=0.15)
+
+    assert limiter.backoff("example.com") == 0.05
+    assert limiter.backoff("example.com") == 0.1
+    assert limiter.backoff("example.com") == 0.15
+    assert limiter.backoff("example.com", retry_after=30) == 0.15
+
+    start = time.monotonic()
+    with limiter.slot("example.com"):
+        pass
+    assert time.monotonic() - start >= 0.1
+
+    limiter.record_success("example.com")
+    assert limiter.backoff("example.com") == 0.05
+
+
+def test_host_policy_applies_to_subdomains():
+    slow = HostPolicy(requests_per_second=1)
+    limiter = HostRateLimiter(host_policies={"juejin.cn": slow})
+
+    assert limiter.policy_for("api.juejin.cn") is slow
+    assert limiter.policy_for("juejin.cn") is slow
+    assert limiter.policy_for("notjuejin.cn") is limiter.default_policy
@@ -0,0 +1,74 @@
+import time
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from eenhance.utils.llm import LLMFactory
+from eenhance.utils.llm_cache import SQLiteResponseCache
+
+
+@pytest.fixture
+def factory(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    factory = LLMFactory()
+    factory.config = {
+        use_case: factory.config.get(use_case) for use_case in ("topic", "research")
+    }
+    factory.config["llm"] = {
+        "scheduler": {"enabled": True},
+        "response_cache": {"enabled": True, "path": str(tmp_path / "responses.sqlite3")},
+    }
+    yield factory
+    factory.close()
+
+
+def test_create_llm_reuses_clients_and_connection_pool(factory):
+    topic = factory.create_llm(use_case="topic", temperature=0.7)
+    assert factory.create_llm(use_case="topic", temperature=0.7) is topic
+
+    research = factory.create_llm(use_case="research", temperature=0)
+    limited = factory.create_llm(use_case="topic", max_tokens=100)
+    assert research is not topic
+    assert limited is not factory.create_llm(use_case="topic", max_tokens=200)
+
+    # 所有实例共享同一个HTTP连接池和调度器, 主题生成的请求优先放行
+    topic_transport = topic.http_client._transport
+    research_transport = research.http_client._transport
+    assert topic_transport.transport is research_transport.transport is factory.transport
+    assert topic_transport.scheduler is research_transport.scheduler
+    assert topic_transport.priority < research_transport.priority
+    # 只由调度器重试被限流的请求
+    assert topic.max_retries == research.max_retries == 0
+
+    # 默认只缓存温度为0的调用
+    assert topic.cache is None
+    assert research.cache is factory.response_cache
+
+    factory.close()
+    assert factory.create_llm(use_case="topic", temperature=0.7) is not topic
+
+
+def test_response_cache_hits_ttl_and_lru(tmp_path):
+    responses = ["一", "二", "三", "四"]
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite3", max_entries=2)
+    llm = FakeListChatModel(responses=responses, cache=cache)
+
+    assert llm.invoke("a").content == "一"
+    assert llm.invoke("a").content == "一"
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    # 消息列表不同即为不同的键
+    assert llm.invoke("b").content == "二"
+    llm.invoke("a")
+    assert llm.invoke("c").content == "三"
+    # 容量为2, 最久未使用的 "b" 被淘汰
+    assert cache.stats()["entries"] == 2
+    assert llm.invoke("b").content == "四"
+
+    # 重新打开后仍然有效, 过期的条目不再命中
+    cache.close()
+    reopened = SQLiteResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60)
+    llm = FakeListChatModel(responses=responses, cache=reopened)
+    assert llm.invoke("b").content == "四"
+    reopened.ttl_seconds = 0
+    time.sleep(0.01)
+    assert llm.invoke("b").content == "一"
+    reopened.close()
@@ -0,0 +1,121 @@
+import json
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+from eenhance.utils.llm_cache import SQLiteResponseCache
+from eenhance.utils.llm_metrics import LLMUsageTracker
+
+
+class _State(TypedDict):
+    answer: str
+
+
+def test_records_usage_per_node_and_exports(tmp_path):
+    tracker = LLMUsageTracker(
+        pricing={"fake": {"input": 1.0, "cached_input": 0.1, "output": 2.0}}
+    )
+    llm = GenericFakeChatModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="答案",
+                    usage_metadata={
+                        "input_tokens": 1000,
+                        "output_tokens": 500,
+                        "total_tokens": 1500,
+                        "input_token_details": {"cache_read": 400},
+                    },
+                )
+            ]
+        ),
+        callbacks=[tracker],
+        metadata={"ls_model_name": "fake"},
+    )
+
+    def answer(state: _State):
+        return {"answer": llm.invoke("问题").content}
+
+    builder = StateGraph(_State)
+    builder.add_node("respond", answer)
+    builder.add_edge(START, "respond")
+    builder.add_edge("respond", END)
+    builder.compile().invoke({"answer": ""}, {"configurable": {"thread_id": "run-1"}})
+
+    [record] = tracker.records
+    assert (record.node, record.thread_id, record.model) == ("respond", "run-1", "fake")
+    assert (record.prompt_tokens, record.completion_tokens, record.cached_tokens) == (
+        1000,
+        500,
+        400,
+    )
+    assert record.cost == (600 * 1.0 + 400 * 0.1 + 500 * 2.0) / 1_000_000
+    assert record.latency >= 0 and record.error is None
+
+    json_path = tracker.export(tmp_path)
+    exported = json.loads(json_path.read_text(encoding="utf-8"))
+    assert exported["summary"][0]["calls"] == 1
+    prometheus = json_path.with_suffix(".prom").read_text(encoding="utf-8")
+    assert (
+        'eenhance_llm_prompt_tokens_total{thread_id="run-1",node="respond",model="fake"} 1000'
+        in prometheus
+    )
+    assert "# TYPE eenhance_llm_latency_seconds_total counter" in prometheus
+    assert "_seconds_sum" not in prometheus
+
+
+def test_records_time_to_first_token_of_streamed_calls():
+    tracker = LLMUsageTracker()
+    llm = GenericFakeChatModel(
+        messages=iter([AIMessage(content="流式 输出 的 答案")]), callbacks=[tracker]
+    )
+
+    assert "".join(chunk.content for chunk in llm.stream("问题")) == "流式 输出 的 答案"
+
+    [record] = tracker.records
+    assert record.node == "unknown"
+    assert record.time_to_first_token is not None
+    assert record.time_to_first_token <= record.latency
+
+
+def test_response_cache_hits_are_counted_without_tokens_or_cost(tmp_path):
+    tracker = LLMUsageTracker(pricing={"fake": {"input": 1.0, "output": 2.0}})
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite3")
+    llm = GenericFakeChatModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="答案",
+                    usage_metadata={
+                        "input_tokens": 1000,
+                        "output_tokens": 500,
+                        "total_tokens": 1500,
+                    },
+                )
+            ]
+        ),
+        cache=cache,
+        callbacks=[tracker],
+        metadata={"ls_model_name": "fake"},
+    )
+
+    assert llm.invoke("问题").content == "答案"
+    assert llm.invoke("问题").content == "答案"
+    cache.close()
+
+    api_call, cache_hit = tracker.records
+    assert not api_call.cache_hit and api_call.prompt_tokens == 1000
+    assert cache_hit.cache_hit
+    assert (cache_hit.prompt_tokens, cache_hit.completion_tokens, cache_hit.cost) == (
+        0,
+        0,
+        0.0,
+    )
+
+    [group] = tracker.summary()
+    assert (group["calls"], group["cache_hits"], group["prompt_tokens"]) == (2, 1, 1000)
+    assert group["cost"] == api_call.cost
+    assert (
+        'eenhance_llm_response_cache_hits_total{thread_id="unknown",node="unknown",'
+        'model="fake"} 1' in tracker.to_prometheus()
+    )
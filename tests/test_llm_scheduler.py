@@ -0,0 +1,72 @@
+import threading
+import time
+import httpx
+from eenhance.utils.llm_scheduler import (
+    PRIORITIES,
+    LLMScheduler,
+    ScheduledTransport,
+)
+
+
+def test_throttled_requests_back_off_and_retry():
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"ok": True}),
+    ]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses[len(requests) - 1]
+
+    scheduler = LLMScheduler(max_in_flight=1, backoff_base=0.01)
+    client = httpx.Client(
+        transport=ScheduledTransport(httpx.MockTransport(handler), scheduler)
+    )
+
+    response = client.post("https://llm.test/chat", json={"messages": []})
+    assert response.json() == {"ok": True}
+    assert len(requests) == 3
+    # 响应读取完毕后释放名额, 计数在成功后重置
+    assert scheduler._in_flight == 0
+    assert scheduler._failures == 0
+
+
+def test_max_in_flight_and_priority_order():
+    scheduler = LLMScheduler(max_in_flight=1)
+    order = []
+
+    scheduler.acquire()
+    threads = [
+        threading.Thread(
+            target=lambda name=name, priority=priority: (
+                scheduler.acquire(priority=priority),
+                order.append(name),
+                scheduler.release(),
+            )
+        )
+        for name, priority in [
+            ("blog", PRIORITIES["background"]),
+            ("topic", PRIORITIES["interactive"]),
+        ]
+    ]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    assert order == []
+
+    scheduler.release()
+    for thread in threads:
+        thread.join(timeout=1)
+    assert order == ["topic", "blog"]
+
+
+def test_tokens_per_minute_budget():
+    scheduler = LLMScheduler(max_in_flight=10, tokens_per_minute=600)
+
+    scheduler.acquire(tokens=590)
+    start = time.monotonic()
+    # 预算每秒补充10个token, 需等待约1秒
+    scheduler.acquire(tokens=20)
+    assert 0.8 < time.monotonic() - start < 2
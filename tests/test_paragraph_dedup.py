@@ -0,0 +1,78 @@
+import pytest
+from eenhance.content.content_parser.paragraph_dedup import ParagraphDeduplicator
+from eenhance.content.content_parser.website_extractor import WebsiteExtractor
+
+PARAGRAPH = (
+    "Large language models are trained on vast corpora of text and can be adapted "
+    "to many downstream tasks with only a handful of examples."
+)
+
+
+def test_fingerprint_is_stable_and_ignores_case_and_whitespace():
+    dedup = ParagraphDeduplicator()
+    assert dedup.fingerprint(PARAGRAPH) == dedup.fingerprint(
+        "  " + PARAGRAPH.upper().replace(" ", "   ") + "\n"
+    )
+
+
+def test_near_duplicate_paragraphs_are_removed():
+    dedup = ParagraphDeduplicator(threshold=0.9)
+    near_duplicate = PARAGRAPH.replace("handful", "hand full")
+    different = (
+        "The weather in the mountains changes quickly, so hikers should always carry "
+        "a rain jacket and enough water for the whole trip."
+    )
+    text = "\n".join([PARAGRAPH, different, near_duplicate])
+
+    assert dedup.deduplicate([text]) == ["\n".join([PARAGRAPH, different])]
+
+
+def test_duplicates_across_texts_are_kept_in_the_first_text_only():
+    dedup = ParagraphDeduplicator()
+    chinese = "大语言模型在海量文本语料上训练, 只需要少量示例就可以适配到很多下游任务中去。"
+    first = "\n".join(["第一篇", chinese])
+    second = "\n".join(["第二篇", chinese, PARAGRAPH])
+
+    assert dedup.deduplicate([first, second]) == [
+        first,
+        "\n".join(["第二篇", PARAGRAPH]),
+    ]
+
+
+def test_short_paragraphs_are_always_kept():
+    dedup = ParagraphDeduplicator(min_chars=30)
+    text = "\n".join(["目录", "目录", PARAGRAPH, "", "目录"])
+    assert dedup.deduplicate([text]) == [text]
+
+
+def test_invalid_threshold_is_rejected():
+    with pytest.raises(ValueError):
+        ParagraphDeduplicator(threshold=0)
+
+
+@pytest.mark.parametrize("parser", ["html.parser", "selectolax"])
+def test_repeated_paragraph_inside_web_page_is_removed(parser):
+    pytest.importorskip(parser.split(".")[0])
+    newsletter = "Subscribe to our weekly newsletter to get the latest AI news first."
+    page = f"""<html><body><article>
+    <p>{PARAGRAPH.replace("downstream tasks", "downstream <a href='#'>tasks</a>")}</p>
+    <div class="promo"><p>{newsletter}</p></div>
+    <p>Second paragraph of the article body.</p>
+    <div class="promo"><p>{newsletter}</p></div>
+    </article></body></html>"""
+    extractor = WebsiteExtractor()
+    extractor.parser = parser
+    extractor.main_content = False
+    text = extractor.extract_text(page)
+    extractor.close()
+
+    # 每个段落各占一行, 行内链接不拆分段落
+    assert text.split("\n") == [
+        PARAGRAPH,
+        newsletter,
+        "Second paragraph of the article body.",
+        newsletter,
+    ]
+    assert ParagraphDeduplicator().deduplicate([text]) == [
+        "\n".join([PARAGRAPH, newsletter, "Second paragraph of the article body."])
+    ]
@@ -0,0 +1,81 @@
+import pymupdf
+import pytest
+from eenhance.content.content_parser.pdf_extractor import PDFExtractor
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "doc.pdf"
+    doc = pymupdf.open()
+    for i in range(12):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i} café resumé")
+        page.insert_text((72, 100), f"Section body {'abcdefghijkl'[i] * (i + 1)}")
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def test_parallel_extraction_matches_serial(pdf_path):
+    extractor = PDFExtractor()
+    extractor.parallel = False
+    serial = extractor.extract_content(pdf_path)
+
+    extractor.parallel = True
+    extractor.parallel_min_pages = 4
+    extractor.max_workers = 3
+
+    assert extractor.extract_content(pdf_path) == serial
+    assert serial.index("body a") < serial.index("body " + "l" * 12)
+    assert "Page" not in serial  # 重复的页眉已被移除
+
+
+@pytest.mark.parametrize("page_count, num_ranges", [(10, 3), (2, 8), (100, 7)])
+def test_split_page_ranges_covers_all_pages(page_count, num_ranges):
+    ranges = PDFExtractor.split_page_ranges(page_count, num_ranges)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == page_count
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert len(ranges) == min(page_count, num_ranges)
+
+
+def test_iter_pages_is_lazy_and_selects_pages(pdf_path):
+    extractor = PDFExtractor()
+
+    pages = extractor.iter_pages(pdf_path, pages=[0, -1, 99])
+    assert next(pages).startswith("Page 0")
+    assert next(pages).startswith("Page 11")
+    assert list(pages) == []
+
+
+def test_extract_content_stops_at_max_chars(pdf_path):
+    extractor = PDFExtractor()
+    extractor.strip_repeated_lines = False
+    full = extractor.extract_content(pdf_path)
+
+    prefix = extractor.extract_content(pdf_path, max_chars=40)
+
+    assert prefix == full[:40]
+    assert extractor.extract_content(pdf_path, pages=range(12)) == full
+
+
+def test_remove_repeated_lines_strips_headers_and_page_numbers():
+    extractor = PDFExtractor()
+    extractor.repeated_min_ratio = 0.5
+    bodies = ["无锁队列", "风险指针", "纪元回收", "性能评估", "内存屏障", "结论"]
+    pages = [
+        f"并发数据结构白皮书\n本节讨论{body}的设计与第{i}个实验。\n{body}\n第 {i} 页"
+        for i, body in enumerate(bodies, 1)
+    ]
+
+    cleaned = extractor.remove_repeated_lines(pages)
+
+    assert cleaned[0] == "本节讨论无锁队列的设计与第1个实验。\n无锁队列"
+    assert all("白皮书" not in page and "页" not in page for page in cleaned)
+
+
+def test_remove_repeated_lines_keeps_short_documents():
+    extractor = PDFExtractor()
+    pages = ["页眉\n内容一", "页眉\n内容二"]
+
+    assert extractor.remove_repeated_lines(pages) == pages
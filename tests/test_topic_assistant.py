@@ -1,5 +1,8 @@
 import pytest
-from eenhance.topic.topic_assistant import graph
+from eenhance.content.content_parser.extraction_cache import ExtractionCache
+from eenhance.topic import topic_assistant
+from eenhance.topic.topic_assistant import TopicListParser, graph
+from langchain_core.messages import AIMessageChunk
 
 
 def test_topic_assistant_workflow():
@@ -67,5 +70,166 @@ def test_topic_assistant_router():
     assert len(events) > 0
 
 
+def test_generate_topics_uses_cache_until_regenerated(tmp_path, monkeypatch):
+    """相同内容复用缓存的主题, 已有主题时重新生成跳过缓存"""
+    calls = []
+
+    def fake_request_topics(content, additional_info, on_topic=None, count=3):
+        calls.append(content)
+        return [f"主题{len(calls)}-{i}" for i in range(3)]
+
+    monkeypatch.setattr(topic_assistant, "request_topics", fake_request_topics)
+    monkeypatch.setattr(
+        topic_assistant, "get_topic_cache", lambda: ExtractionCache(tmp_path)
+    )
+    state = {"out_content": "测试内容", "additional_info": None, "regenerate": True}
+
+    first = topic_assistant.generate_topics(state)
+    second = topic_assistant.generate_topics(state)
+    assert second["topics"] == first["topics"]
+    assert len(calls) == 1
+
+    regenerated = topic_assistant.generate_topics({**state, "topics": first["topics"]})
+    assert regenerated["topics"] != first["topics"]
+    assert len(calls) == 2
+
+    other = topic_assistant.generate_topics({**state, "additional_info": "医疗"})
+    assert len(calls) == 3
+    assert other["topics"] != regenerated["topics"]
+
+
+def test_topic_list_parser_emits_topics_as_they_complete():
+    parser = TopicListParser()
+
+    assert parser.feed("以下是3个研究主题：\n1. AI在医") == []
+    assert parser.feed("疗影像中的应用\n2. “医疗数据") == ["AI在医疗影像中的应用"]
+    assert parser.feed("隐私”, 3. 临床决策") == ["医疗数据隐私"]
+    assert parser.close() == ["临床决策"]
+
+
+class _StreamingLLM:
+    def __init__(self, text):
+        self.text = text
+
+    def stream(self, prompt):
+        for i in range(0, len(self.text), 4):
+            yield AIMessageChunk(content=self.text[i : i + 4])
+
+
+def test_generate_topics_streams_custom_events(monkeypatch):
+    monkeypatch.setattr(topic_assistant, "get_topic_cache", lambda: None)
+    monkeypatch.setattr(topic_assistant, "diversity_config", {"enabled": False})
+    monkeypatch.setattr(
+        topic_assistant.llm_factory,
+        "create_llm",
+        lambda **kwargs: _StreamingLLM("主题一, 主题二, 主题三, 多余的主题"),
+    )
+    thread = {"configurable": {"thread_id": "test_stream"}}
+    input_data = {"out_content": "测试内容", "regenerate": True}
+
+    list(graph.stream(input_data, thread))
+    graph.update_state(thread, input_data, as_node="human_feedback")
+    events = list(graph.stream(None, thread, stream_mode=["custom", "updates"]))
+
+    custom = [chunk for mode, chunk in events if mode == "custom"]
+    assert custom == [
+        {"topic": "主题一", "index": 1},
+        {"topic": "主题二", "index": 2},
+        {"topic": "主题三", "index": 3},
+    ]
+    assert graph.get_state(thread).values["topics"] == ["主题一", "主题二", "主题三"]
+
+
+def test_generate_topics_shows_more_candidates_without_llm_call(monkeypatch):
+    """候选主题按多样性排序, 重新生成时先展示剩余候选"""
+    candidates = [
+        "AI医疗影像诊断",
+        "AI医疗影像诊断方法",
+        "医疗数据隐私保护",
+        "AI医疗影像诊断研究",
+        "临床决策支持系统",
+        "医保费用控制",
+    ]
+    calls = []
+
+    def fake_request_topics(content, additional_info, on_topic=None, count=3):
+        calls.append(count)
+        return candidates
+
+    monkeypatch.setattr(topic_assistant, "request_topics", fake_request_topics)
+    monkeypatch.setattr(topic_assistant, "get_topic_cache", lambda: None)
+    monkeypatch.setattr(
+        topic_assistant,
+        "diversity_config",
+        {"enabled": True, "candidates": 6, "relevance_weight": 0.5},
+    )
+    state = {
+        "out_content": "AI医疗影像诊断, 医疗数据隐私和临床决策支持",
+        "additional_info": None,
+        "regenerate": True,
+    }
+
+    first = topic_assistant.generate_topics(state)
+    assert calls == [6]
+    assert len(first["topics"]) == 3
+    # 近似重复的候选不会同时入选
+    assert len([t for t in first["topics"] if t.startswith("AI医疗影像诊断")]) == 1
+    assert sorted(first["topics"] + first["topic_candidates"]) == sorted(candidates)
+
+    more = topic_assistant.generate_topics({**state, **first})
+    assert calls == [6]
+    assert more["topics"] == first["topic_candidates"][:3]
+    assert more["topic_candidates"] == []
+
+    topic_assistant.generate_topics({**state, **more})
+    assert calls == [6, 6]
+
+
+def test_generate_topics_streams_candidates_when_ranking(monkeypatch):
+    """启用多样性选择时, 候选主题边生成边发出进度, 排序后再发出最终主题"""
+    monkeypatch.setattr(topic_assistant, "get_topic_cache", lambda: None)
+    monkeypatch.setattr(
+        topic_assistant, "diversity_config", {"enabled": True, "candidates": 4}
+    )
+    monkeypatch.setattr(
+        topic_assistant.llm_factory,
+        "create_llm",
+        lambda **kwargs: _StreamingLLM("主题一, 主题二, 主题三, 主题四"),
+    )
+    events = []
+
+    result = topic_assistant.generate_topics(
+        {"out_content": "测试内容", "additional_info": None, "regenerate": True},
+        writer=events.append,
+    )
+
+    assert events[:4] == [
+        {"candidate": topic, "index": i, "total": 4}
+        for i, topic in enumerate(["主题一", "主题二", "主题三", "主题四"], 1)
+    ]
+    assert events[4:] == [
+        {"topic": topic, "index": i} for i, topic in enumerate(result["topics"], 1)
+    ]
+    # 剩余的候选不足一页, 不再提供
+    assert result["topic_candidates"] == []
+
+
+def test_generate_topics_drops_partial_last_page(monkeypatch):
+    candidates = [f"主题{i}" for i in range(7)]
+    monkeypatch.setattr(
+        topic_assistant, "request_topics", lambda *args, **kwargs: candidates
+    )
+    monkeypatch.setattr(topic_assistant, "get_topic_cache", lambda: None)
+    monkeypatch.setattr(
+        topic_assistant, "diversity_config", {"enabled": True, "candidates": 7}
+    )
+    state = {"out_content": "测试内容", "additional_info": None, "regenerate": True}
+
+    first = topic_assistant.generate_topics(state)
+    assert len(first["topic_candidates"]) == 4
+    more = topic_assistant.generate_topics({**state, **first})
+    assert more["topics"] == first["topic_candidates"][:3]
+    assert more["topic_candidates"] == []
+
 if __name__ == "__main__":
     pytest.main(["-v", "test_topic_assistant.py"])
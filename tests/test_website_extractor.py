@@ -0,0 +1,189 @@
+import asyncio
+from pathlib import Path
+import pytest
+from eenhance.content.content_parser.website_extractor import WebsiteExtractor
+
+PAGE = """<html><head><title>标题</title><style>p {color: red}</style></head>
+<body><nav>导航</nav><article><h1>人工智能</h1><p>深度学习模型能够识别图像。</p></article>
+<footer>版权所有</footer><script>var a = 1;</script></body></html>"""
+
+
+@pytest.fixture
+def extractor():
+    extractor = WebsiteExtractor()
+    yield extractor
+    extractor.close()
+
+
+def test_extract_content_removes_unwanted_tags(http_server, extractor):
+    http_server.routes["/page"] = (200, {"Content-Type": "text/html; charset=utf-8"}, PAGE)
+
+    content = extractor.extract_content(http_server.url + "/page")
+
+    assert content == "标题\n人工智能\n深度学习模型能够识别图像。"
+
+
+def test_extract_many_keeps_input_order_and_isolates_errors(http_server, extractor):
+    for i in range(5):
+        http_server.routes[f"/{i}"] = (
+            200,
+            {"Content-Type": "text/html"},
+            f"<html><body><p>page {i}</p></body></html>",
+        )
+    urls = [f"{http_server.url}/{i}" for i in range(5)]
+    urls.insert(2, http_server.url + "/missing")
+
+    results = extractor.extract_many(urls, max_workers=4)
+
+    assert [r["url"] for r in results] == urls
+    assert results[2]["content"] == ""
+    assert "404" in results[2]["error"]
+    assert [r["content"] for r in results if r["error"] is None] == [
+        f"page {i}" for i in range(5)
+    ]
+
+
+def test_session_reuses_connections(http_server, extractor):
+    http_server.routes["/page"] = (200, {"Content-Type": "text/html; charset=utf-8"}, PAGE)
+
+    extractor.extract_many([http_server.url + "/page"] * 3, max_workers=1)
+
+    _, headers = http_server.requests[-1]
+    assert "gzip" in headers["Accept-Encoding"]
+    assert headers["Connection"] == "keep-alive"
+    # 三个请求都经由同一个连接
+    assert len(http_server.clients) == 3
+    assert len(set(http_server.clients)) == 1
+
+
+@pytest.mark.parametrize("backend", ["lxml", "selectolax"])
+def test_parser_backends_match_html_parser(extractor, backend):
+    pytest.importorskip(backend)
+    page = (Path(__file__).parent / "data" / "html" / "article.html").read_text(
+        encoding="utf-8"
+    )
+
+    expected = extractor.extract_text(page)
+    extractor.parser = backend
+
+    assert extractor.extract_text(page) == expected
+    assert "首页" not in expected  # nav 已被移除
+    assert "版权所有" not in expected  # footer 已被移除
+
+
+def test_unknown_parser_backend_is_rejected():
+    with pytest.raises(ValueError):
+        WebsiteExtractor._resolve_parser("html5lib")
+
+
+def test_stream_aborts_oversized_body(http_server, extractor):
+    extractor.stream = True
+    extractor.max_content_bytes = 1024
+    http_server.routes["/big"] = (200, {"Content-Type": "text/html"}, "a" * 4096)
+
+    with pytest.raises(Exception, match="exceeds 1024 bytes"):
+        extractor.extract_content(http_server.url + "/big")
+
+
+def test_stream_rejects_disallowed_content_type(http_server, extractor):
+    extractor.stream = True
+    http_server.routes["/file.zip"] = (
+        200,
+        {"Content-Type": "application/zip"},
+        b"PK\x03\x04",
+    )
+
+    with pytest.raises(Exception, match="Unsupported content type"):
+        extractor.extract_content(http_server.url + "/file.zip")
+
+
+def test_stream_uses_meta_charset(http_server, extractor):
+    extractor.stream = True
+    page = '<html><head><meta charset="gbk"></head><body><p>中文内容</p></body></html>'
+    http_server.routes["/gbk"] = (200, {"Content-Type": "text/html"}, page.encode("gbk"))
+
+    assert extractor.extract_content(http_server.url + "/gbk") == "中文内容"
+
+
+def test_aextract_content_matches_sync(http_server, extractor):
+    http_server.routes["/page"] = (
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        PAGE,
+    )
+    url = http_server.url + "/page"
+
+    async def run():
+        try:
+            return await extractor.aextract_content(url)
+        finally:
+            await extractor.aclose()
+
+    assert asyncio.run(run()) == extractor.extract_content(url)
+
+
+def test_async_client_is_closed_with_its_event_loop(http_server, extractor):
+    http_server.routes["/page"] = (
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        PAGE,
+    )
+    url = http_server.url + "/page"
+    clients = []
+
+    async def run():
+        content = await extractor.aextract_content(url)
+        clients.append(await extractor._get_async_client())
+        return content
+
+    # 每次 asyncio.run 使用新的事件循环, 不调用 aclose 也不会遗留客户端
+    assert asyncio.run(run()) == asyncio.run(run())
+    assert clients[0] is not clients[1]
+    assert all(client.is_closed for client in clients)
+
+
+def test_throttled_response_is_retried_after_retry_after(http_server, extractor):
+    attempts = []
+
+    def page(handler):
+        attempts.append(handler.path)
+        if len(attempts) == 1:
+            return 429, {"Retry-After": "0"}, b""
+        return 200, {"Content-Type": "text/html; charset=utf-8"}, PAGE
+
+    http_server.routes["/page"] = page
+
+    content = extractor.extract_content(http_server.url + "/page")
+
+    assert content == "标题\n人工智能\n深度学习模型能够识别图像。"
+    assert len(attempts) == 2
+
+
+def test_throttled_response_fails_after_max_retries(http_server, extractor):
+    http_server.routes["/busy"] = (503, {"Retry-After": "0"}, b"")
+    extractor.max_retries = 1
+
+    with pytest.raises(Exception, match="503"):
+        extractor.extract_content(http_server.url + "/busy")
+
+    assert len(http_server.requests) == 2
+
+
+@pytest.mark.parametrize(
+    "fixture, kept, dropped",
+    [
+        ("article.html", ["无锁编程的基本原理", "4. 结论"], ["李四", "推荐阅读"]),
+        ("news.html", ["推理成本一年下降九成", "责任编辑"], ["热门排行", "京ICP备"]),
+    ],
+)
+def test_main_content_keeps_only_article_block(extractor, fixture, kept, dropped):
+    page = (Path(__file__).parent / "data" / "html" / fixture).read_text(
+        encoding="utf-8"
+    )
+    extractor.main_content = False
+    full = extractor.extract_text(page)
+    extractor.main_content = True
+    main = extractor.extract_text(page)
+
+    assert all(text in main for text in kept)
+    assert all(text in full and text not in main for text in dropped)
@@ -0,0 +1,130 @@
+import json
+import logging
+import pytest
+from eenhance.content.content_parser import youtube_transcriber
+from eenhance.content.content_parser.extraction_cache import ExtractionCache
+from eenhance.content.content_parser.youtube_transcriber import YouTubeTranscriber
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=42",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+        "youtu.be/dQw4w9WgXcQ?si=abc",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "https://www.youtube.com/live/dQw4w9WgXcQ?feature=share",
+        "dQw4w9WgXcQ",
+    ],
+)
+def test_extract_video_id(url):
+    assert YouTubeTranscriber.extract_video_id(url) == "dQw4w9WgXcQ"
+
+
+def test_extract_video_id_rejects_invalid_url():
+    with pytest.raises(ValueError):
+        YouTubeTranscriber.extract_video_id("https://www.youtube.com/feed/trending")
+
+
+@pytest.fixture
+def transcriber(tmp_path, monkeypatch):
+    calls = []
+
+    def get_transcript(video_id, languages):
+        calls.append((video_id, tuple(languages)))
+        if video_id == "unavailable":
+            raise RuntimeError("Transcripts are disabled")
+        return [{"text": f"hello {video_id}"}, {"text": "[Music]"}]
+
+    monkeypatch.setattr(
+        youtube_transcriber.YouTubeTranscriptApi, "get_transcript", get_transcript
+    )
+    transcriber = YouTubeTranscriber()
+    transcriber.cache = ExtractionCache(tmp_path)
+    transcriber.calls = calls
+    return transcriber
+
+
+def test_transcript_is_cached_by_video_and_language(transcriber):
+    url = "https://youtu.be/dQw4w9WgXcQ"
+
+    assert transcriber.extract_transcript(url) == "hello dQw4w9WgXcQ"
+    assert transcriber.extract_transcript(url) == "hello dQw4w9WgXcQ"
+    transcriber.extract_transcript(url, languages=["zh-Hans"])
+
+    assert transcriber.calls == [
+        ("dQw4w9WgXcQ", ("en",)),
+        ("dQw4w9WgXcQ", ("zh-Hans",)),
+    ]
+
+
+def test_extract_many_keeps_order_and_isolates_errors(transcriber):
+    ids = ["aaaaaaaaaaa", "unavailable", "bbbbbbbbbbb"]
+
+    results = transcriber.extract_many(ids, max_workers=3)
+
+    assert [r["url"] for r in results] == ids
+    assert results[0]["content"] == "hello aaaaaaaaaaa"
+    assert "disabled" in results[1]["error"]
+    assert results[2]["error"] is None
+
+
+def test_resolve_playlist_follows_continuations(
+    http_server, transcriber, monkeypatch, caplog
+):
+    monkeypatch.setattr(
+        youtube_transcriber, "PLAYLIST_PAGE_URL", http_server.url + "/playlist"
+    )
+    monkeypatch.setattr(
+        youtube_transcriber, "PLAYLIST_BROWSE_URL", http_server.url + "/browse"
+    )
+    http_server.routes["/playlist?list=PL1&hl=en"] = (
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        '<script>ytcfg.set({"INNERTUBE_API_KEY":"key1",'
+        '"INNERTUBE_CONTEXT_CLIENT_VERSION":"2.1"});'
+        'var ytInitialData = {"contents":[{"videoId":"aaaaaaaaaaa"},'
+        '{"videoId":"bbbbbbbbbbb"},{"videoId":"aaaaaaaaaaa"},'
+        '{"continuationCommand":{"token":"page2"}}]};</script>',
+    )
+    pages = {
+        "page2": {
+            "items": [
+                {"videoId": "ccccccccccc"},
+                {"continuationCommand": {"token": "page3"}},
+            ]
+        },
+        "page3": {"items": [{"videoId": "ddddddddddd"}]},
+    }
+
+    def browse(handler):
+        payload = json.loads(handler.body)
+        assert payload["context"]["client"]["clientVersion"] == "2.1"
+        return (
+            200,
+            {"Content-Type": "application/json"},
+            json.dumps(pages[payload["continuation"]], indent=2),
+        )
+
+    http_server.routes["/browse?key=key1"] = browse
+
+    url = "https://www.youtube.com/playlist?list=PL1"
+    assert transcriber.resolve_playlist(url) == [
+        "aaaaaaaaaaa",
+        "bbbbbbbbbbb",
+        "ccccccccccc",
+        "ddddddddddd",
+    ]
+    assert len(http_server.requests) == 3
+
+    # 超过分页上限时截断并记录警告
+    transcriber.max_playlist_pages = 1
+    with caplog.at_level(logging.WARNING, logger=youtube_transcriber.__name__):
+        assert transcriber.resolve_playlist(url) == [
+            "aaaaaaaaaaa",
+            "bbbbbbbbbbb",
+            "ccccccccccc",
+        ]
+    assert "truncated" in caplog.text